@@ -8,6 +8,7 @@ a = Analysis(
     binaries=[],
     datas=[
         ('style.css', '.'),
+        ('terminal.js', '.'),
         ('sistema.db', '.'),
     ],
     hiddenimports=[
@@ -22,6 +23,13 @@ a = Analysis(
         'PIL.ImageDraw',
         'PIL.ImageFont',
         'fpdf',
+        # Páginas administrativas importadas sob demanda (admin.MODULOS_PAGINAS)
+        'cadastro_fun',
+        'importacao_fun',
+        'listagem',
+        'relatorio_requisicoes',
+        'cadastro',
+        'desempenho',
     ],
     hookspath=[],
     hooksconfig={},
@@ -6,55 +6,48 @@ Gerencia o painel administrativo, autenticação e navegação.
 import streamlit as st
 import time
 import sqlite3
-import pandas as pd
-import relatorio_requisicoes
-import listagem
-import cadastro_fun
-import cadastro
+import importlib
 from auth import autenticar_admin
+from datetime import date
+from database import contar_funcionarios_por_setor, contar_requisicoes_por_dia, contar_requisicoes_por_hora
 from functools import wraps
 
 # Constantes para páginas
 DASHBOARD = "dashboard"
 CADASTRO_FUNCIONARIO = "cadastro_fun"
+IMPORTACAO_FUNCIONARIOS = "importacao_fun"
 LISTAGEM_CRACHAS = "listagem"
 RELATORIO_REQUISICOES = "requisicoes"
 CADASTRO_USUARIO = "cadastro"
+DESEMPENHO = "desempenho"
 LOGIN = "login"
 
 # Estrutura de menu para facilitar manutenção
 MENU_ITEMS = [
     {"titulo": "📊 Dashboard", "pagina": DASHBOARD, "nivel": 1},
     {"titulo": "🆕 Cadastro de Crachá", "pagina": CADASTRO_FUNCIONARIO, "nivel": 1},
+    {"titulo": "📥 Importar Funcionários", "pagina": IMPORTACAO_FUNCIONARIOS, "nivel": 1},
     {"titulo": "📋 Listagem de Crachás", "pagina": LISTAGEM_CRACHAS, "nivel": 1},
     {"titulo": "📑 Relatório de Requisições", "pagina": RELATORIO_REQUISICOES, "nivel": 1},
     {"titulo": "👤 Cadastrar Usuário", "pagina": CADASTRO_USUARIO, "nivel": 2},  # Nível mais alto para administradores
+    {"titulo": "📈 Desempenho", "pagina": DESEMPENHO, "nivel": 2},
     {"titulo": "🚪 Logout", "pagina": None, "nivel": 1},  # Caso especial tratado separadamente
 ]
 
+# Módulo e nível mínimo de cada página; os módulos (e bibliotecas como
+# pandas e fpdf) só são importados no primeiro acesso à página
+MODULOS_PAGINAS = {
+    CADASTRO_FUNCIONARIO: ("cadastro_fun", 1),
+    IMPORTACAO_FUNCIONARIOS: ("importacao_fun", 1),
+    LISTAGEM_CRACHAS: ("listagem", 1),
+    RELATORIO_REQUISICOES: ("relatorio_requisicoes", 1),
+    CADASTRO_USUARIO: ("cadastro", 2),
+    DESEMPENHO: ("desempenho", 2),
+}
+
 # Tempo limite de sessão em segundos (30 minutos)
 TIMEOUT_SESSAO = 30 * 60
 
-def inicializar_indices():
-    """Cria índices para melhorar o desempenho das consultas"""
-    try:
-        conn = sqlite3.connect("sistema.db")
-        cursor = conn.cursor()
-        
-        # Índice para busca rápida de funcionários por código
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_funcionarios_codigo ON FUNCIONARIOS(codigo)")
-        
-        # Índice para busca rápida de requisições por código de funcionário
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_requisicoes_codigo ON REQUISICOES(codigo_funcionario)")
-        
-        # Índice para busca rápida de requisições por data
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_requisicoes_data ON REQUISICOES(data)")
-        
-        conn.commit()
-        conn.close()
-    except Exception as e:
-        st.error(f"Erro ao inicializar índices: {str(e)}")
-
 def configurar_tema():
     """Configura o tema da interface administrativa"""
     # Configuração de tema em CSS
@@ -97,9 +90,6 @@ def inicializar_estado():
         
     if "last_activity" not in st.session_state:
         st.session_state["last_activity"] = time.time()
-        
-    if "pagina_atual" not in st.session_state:
-        st.session_state["pagina_atual"] = 1
 
 def verificar_timeout():
     """Verifica se a sessão expirou por inatividade
@@ -159,88 +149,24 @@ def carregar_estatisticas():
     """Carrega estatísticas com cache para melhorar desempenho
     
     Returns:
-        tuple: (funcionarios_df, req_df) ou (None, None) em caso de erro
+        tuple: (funcionarios_df, req_df, hora_df) ou (None, None, None) em caso de erro
     """
     try:
-        conn = sqlite3.connect("sistema.db")
+        import pandas as pd
         
         # Estatísticas de funcionários
-        funcionarios_df = pd.read_sql("SELECT COUNT(*) as total, setor FROM FUNCIONARIOS GROUP BY setor", conn)
+        funcionarios_df = pd.DataFrame(contar_funcionarios_por_setor(), columns=["total", "setor"])
         
-        # Estatísticas de requisições
-        req_df = pd.read_sql("""
-            SELECT COUNT(*) as total, 
-                   strftime('%Y-%m-%d', data) as data 
-            FROM REQUISICOES 
-            GROUP BY strftime('%Y-%m-%d', data)
-            ORDER BY data DESC
-            LIMIT 7
-        """, conn)
+        # Estatísticas de requisições dos últimos 7 dias com movimento
+        req_df = pd.DataFrame(contar_requisicoes_por_dia(7), columns=["total", "data"])
         
-        conn.close()
-        return funcionarios_df, req_df
+        # Requisições de hoje por hora
+        hoje = date.today()
+        hora_df = pd.DataFrame(contar_requisicoes_por_hora(hoje, hoje), columns=["total", "hora"])
+        return funcionarios_df, req_df, hora_df
     except Exception as e:
         st.error(f"Erro ao carregar estatísticas: {str(e)}")
-        return None, None
-
-def listar_com_paginacao(query, params=None, items_por_pagina=10):
-    """Lista registros com paginação
-    
-    Args:
-        query (str): Consulta SQL base
-        params (tuple, optional): Parâmetros para a consulta
-        items_por_pagina (int, optional): Itens por página
-        
-    Returns:
-        pandas.DataFrame: DataFrame com os resultados da página atual
-    """
-    try:
-        conn = sqlite3.connect("sistema.db")
-        
-        # Consulta de contagem
-        count_query = f"SELECT COUNT(*) FROM ({query})"
-        if params:
-            total = pd.read_sql(count_query, conn, params=params).iloc[0, 0]
-        else:
-            total = pd.read_sql(count_query, conn).iloc[0, 0]
-        
-        # Consulta paginada
-        pagina = st.session_state["pagina_atual"]
-        offset = (pagina - 1) * items_por_pagina
-        query_paginada = f"{query} LIMIT {items_por_pagina} OFFSET {offset}"
-        
-        if params:
-            df = pd.read_sql(query_paginada, conn, params=params)
-        else:
-            df = pd.read_sql(query_paginada, conn)
-        
-        conn.close()
-        
-        # Exibir dados
-        st.dataframe(df, use_container_width=True)
-        
-        # Exibir controles de paginação
-        total_paginas = max(1, (total + items_por_pagina - 1) // items_por_pagina)
-        
-        col1, col2, col3 = st.columns([1, 3, 1])
-        
-        with col1:
-            if st.button("⬅️ Anterior", disabled=pagina <= 1) and pagina > 1:
-                st.session_state["pagina_atual"] -= 1
-                st.rerun()
-        
-        with col2:
-            st.markdown(f"**Página {pagina} de {total_paginas}** (Total: {total} registros)")
-        
-        with col3:
-            if st.button("Próxima ➡️", disabled=pagina >= total_paginas) and pagina < total_paginas:
-                st.session_state["pagina_atual"] += 1
-                st.rerun()
-        
-        return df
-    except Exception as e:
-        st.error(f"Erro ao listar registros: {str(e)}")
-        return pd.DataFrame()
+        return None, None, None
 
 def criar_menu_sidebar():
     """Cria menu na barra lateral para navegação mais eficiente"""
@@ -276,7 +202,7 @@ def exibir_dashboard():
     st.markdown("### Bem-vindo à área administrativa!")
     st.markdown("Utilize o menu lateral para navegar pelo sistema.")
     
-    funcionarios_df, req_df = carregar_estatisticas()
+    funcionarios_df, req_df, hora_df = carregar_estatisticas()
     
     if funcionarios_df is not None and req_df is not None:
         col1, col2 = st.columns(2)
@@ -293,6 +219,13 @@ def exibir_dashboard():
                 req_df = req_df.sort_values('data')
                 st.line_chart(req_df.set_index('data'))
             st.dataframe(req_df, use_container_width=True)
+        
+        st.subheader("Requisições de Hoje por Hora")
+        if not hora_df.empty:
+            hora_df["hora"] = hora_df["hora"].dt.strftime("%H:00")
+            st.bar_chart(hora_df.set_index('hora'))
+        else:
+            st.info("Nenhuma requisição registrada hoje.")
     else:
         st.info("Nenhum dado disponível para exibição.")
 
@@ -300,37 +233,19 @@ def exibir_conteudo():
     """Exibe o conteúdo da página selecionada"""
     pagina_atual = st.session_state["admin_page"]
     
-    # Utilizamos o if/elif mutuamente exclusivo para garantir que apenas uma página é exibida
     if pagina_atual == DASHBOARD:
         exibir_dashboard()
+        return
     
-    elif pagina_atual == LISTAGEM_CRACHAS:
-        # Verificar permissão
-        if not verificar_permissao(1):
-            st.warning("Você não tem permissão para acessar esta página.")
-            return
-        listagem.app()
-    
-    elif pagina_atual == RELATORIO_REQUISICOES:
-        # Verificar permissão
-        if not verificar_permissao(1):
-            st.warning("Você não tem permissão para acessar esta página.")
-            return
-        relatorio_requisicoes.app()
+    if pagina_atual not in MODULOS_PAGINAS:
+        return
     
-    elif pagina_atual == CADASTRO_FUNCIONARIO:
-        # Verificar permissão
-        if not verificar_permissao(1):
-            st.warning("Você não tem permissão para acessar esta página.")
-            return
-        cadastro_fun.app()
-    
-    elif pagina_atual == CADASTRO_USUARIO:
-        # Verificar permissão
-        if not verificar_permissao(2):
-            st.warning("Você não tem permissão para acessar esta página.")
-            return
-        cadastro.app()
+    modulo, nivel_minimo = MODULOS_PAGINAS[pagina_atual]
+    # Verificar permissão
+    if not verificar_permissao(nivel_minimo):
+        st.warning("Você não tem permissão para acessar esta página.")
+        return
+    importlib.import_module(modulo).app()
 
 def exibir_login():
     """Exibe o formulário de login"""
@@ -379,7 +294,6 @@ def app():
     # Inicializações
     inicializar_estado()
     configurar_tema()
-    inicializar_indices()
     
     # Solução: usar st.empty() para criar um espaço que pode ser limpo e substituído
     # Isso garante que apenas uma interface seja mostrada por vez
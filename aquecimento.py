@@ -0,0 +1,153 @@
+"""
+Módulo de aquecimento da aplicação após a inicialização do serviço.
+
+Antes de o Streamlit aceitar conexões, abre e ajusta o banco de dados,
+percorre os índices mais usados e carrega o cache de crachás. Em segundo
+plano, importa as telas administrativas e carrega as fontes do crachá.
+O andamento é informado pela sonda de prontidão (GET /pronto), que
+responde 200 quando todas as etapas terminaram e 503 enquanto isso.
+"""
+
+import importlib
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Porta da sonda de prontidão; pode ser trocada pela variável de ambiente PORTA_SONDA
+PORTA_SONDA = int(os.environ.get("PORTA_SONDA", 8503))
+
+_etapas = {}
+_lock = threading.Lock()
+
+def _definir_etapa(nome, **dados):
+    with _lock:
+        _etapas.setdefault(nome, {"status": "pendente"}).update(dados)
+
+def executar_etapa(nome, funcao):
+    """Executa uma etapa do aquecimento registrando status e duração.
+
+    Falhas não interrompem a inicialização: a etapa fica marcada como
+    "falhou" e o recurso correspondente é carregado no primeiro uso.
+
+    Args:
+        nome (str): Nome da etapa exibido na sonda.
+        funcao (callable): Função sem argumentos que executa a etapa.
+
+    Returns:
+        bool: True se a etapa foi concluída, False em caso de erro.
+    """
+    _definir_etapa(nome, status="executando")
+    inicio = time.perf_counter()
+    try:
+        funcao()
+        concluida = True
+    except Exception as e:
+        _definir_etapa(nome, erro=str(e))
+        concluida = False
+    _definir_etapa(
+        nome,
+        status="concluida" if concluida else "falhou",
+        duracao_ms=round((time.perf_counter() - inicio) * 1000, 1),
+    )
+    return concluida
+
+def _aquecer_banco():
+    from database import aquecer_banco
+    aquecer_banco()
+
+def _carregar_crachas():
+    from database import obter_cache_crachas
+    obter_cache_crachas().carregar()
+
+def _importar_telas():
+    import admin
+    for modulo, _ in admin.MODULOS_PAGINAS.values():
+        importlib.import_module(modulo)
+
+def _carregar_fontes():
+    # Biblioteca do código de barras e fontes usadas por utils.gerar_cracha()
+    import barcode.writer
+    from utils import carregar_fontes_cracha
+    carregar_fontes_cracha()
+
+# Etapas executadas antes de aceitar conexões, na ordem
+ETAPAS_INICIAIS = (
+    ("banco", _aquecer_banco),
+    ("crachas", _carregar_crachas),
+)
+
+# Etapas executadas em segundo plano, depois que o servidor já aceita conexões
+ETAPAS_SEGUNDO_PLANO = (
+    ("telas_administrativas", _importar_telas),
+    ("fontes_cracha", _carregar_fontes),
+)
+
+def aquecer():
+    """Executa as etapas iniciais e dispara as de segundo plano.
+
+    Returns:
+        threading.Thread: Thread das etapas de segundo plano.
+    """
+    for nome, _ in ETAPAS_INICIAIS + ETAPAS_SEGUNDO_PLANO:
+        _definir_etapa(nome)
+    for nome, funcao in ETAPAS_INICIAIS:
+        executar_etapa(nome, funcao)
+
+    def segundo_plano():
+        for nome, funcao in ETAPAS_SEGUNDO_PLANO:
+            executar_etapa(nome, funcao)
+
+    thread = threading.Thread(target=segundo_plano, name="aquecimento", daemon=True)
+    thread.start()
+    return thread
+
+def estado_aquecimento():
+    """Retorna o andamento do aquecimento.
+
+    Returns:
+        dict: {"pronto": bool, "etapas": {nome: {"status", "duracao_ms", ...}}};
+            pronto fica True quando nenhuma etapa está pendente ou executando.
+    """
+    with _lock:
+        etapas = {nome: dict(dados) for nome, dados in _etapas.items()}
+    pronto = bool(etapas) and all(dados["status"] in ("concluida", "falhou") for dados in etapas.values())
+    return {"pronto": pronto, "etapas": etapas}
+
+class SondaHandler(BaseHTTPRequestHandler):
+    """Responde à sonda de prontidão com o estado do aquecimento em JSON."""
+
+    def log_message(self, formato, *args):
+        pass
+
+    def do_GET(self):
+        if self.path not in ("/", "/pronto"):
+            self.send_error(404)
+            return
+        estado = estado_aquecimento()
+        conteudo = json.dumps(estado, ensure_ascii=False).encode("utf-8")
+        self.send_response(200 if estado["pronto"] else 503)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(conteudo)))
+        self.end_headers()
+        self.wfile.write(conteudo)
+
+def iniciar_sonda(porta=PORTA_SONDA, host="127.0.0.1"):
+    """Inicia a sonda de prontidão em uma thread própria.
+
+    Args:
+        porta (int, optional): Porta da sonda.
+        host (str, optional): Endereço de escuta.
+
+    Returns:
+        ThreadingHTTPServer: Servidor da sonda, ou None se a porta estiver ocupada.
+    """
+    try:
+        servidor = ThreadingHTTPServer((host, porta), SondaHandler)
+    except OSError as e:
+        print(f"Aviso: sonda de prontidão não iniciada na porta {porta}: {e}")
+        return None
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, name="sonda-prontidao", daemon=True).start()
+    return servidor
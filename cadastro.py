@@ -1,11 +1,7 @@
 import streamlit as st
-import sqlite3
-import os
+from utils import hash_senha
+from database import buscar_administrador, cadastrar_administrador
 
-# No início do seu arquivo, logo após imports e set_page_config
-if os.path.exists("style.css"):
-    with open("style.css") as css:
-        st.markdown(f"<style>{css.read()}</style>", unsafe_allow_html=True)
 def app():
     
 
@@ -22,21 +18,15 @@ def app():
             st.error("As senhas não conferem!")
         else:
             try:
-                conn = sqlite3.connect("sistema.db")
-                cursor = conn.cursor()
-                
-                cursor.execute("SELECT * FROM ADMINISTRADORES WHERE usuario = ?", (usuario,))
-                if cursor.fetchone():
+                if buscar_administrador(usuario):
                     st.error("Usuário já cadastrado!")
-                else:
-                    cursor.execute("INSERT INTO ADMINISTRADORES (usuario, senha) VALUES (?, ?)", (usuario, senha))
-                    conn.commit()
+                elif cadastrar_administrador(usuario, hash_senha(senha)):
                     st.success("Usuário cadastrado com sucesso! 🎉")
+                else:
+                    st.error("Erro ao cadastrar usuário.")
                     
             except Exception as e:
                 st.error("Erro ao cadastrar usuário: " + str(e))
-            finally:
-                conn.close()
 
 if __name__ == "__main__":
     app()
@@ -3,19 +3,14 @@ Módulo de cadastro de funcionários e geração de crachás.
 """
 
 import streamlit as st
-import os
 from utils import download_cracha, validar_cpf, carregar_estilo_css
 from database import cadastrar_funcionario
 
-# Carregar CSS se existir
-if os.path.exists("style.css"):
-    with open("style.css") as css:
-        st.markdown(f"<style>{css.read()}</style>", unsafe_allow_html=True)
-
 def app():
     """
     Inicializa a interface de cadastro de funcionários e geração de crachás.
     """
+    carregar_estilo_css()
     st.markdown("<h1 style='text-align: center;'>Cadastro de Funcionários</h1>", unsafe_allow_html=True)
 
     # Lista de setores disponíveis
@@ -1,145 +1,1514 @@
 """
 Módulo centralizado para todas as operações de banco de dados.
-Fornece funções para acesso e manipulação de dados no SQLite.
+Fornece funções para acesso e manipulação de dados no SQLite; todas as
+consultas do sistema ficam aqui e usam o armazenamento ativo (arquivo ou
+memória, veja configurar_armazenamento()) ou o informado no argumento
+`armazenamento`.
 """
 
+import itertools
+import json
+import os
+import pathlib
+import queue
 import sqlite3
-from datetime import datetime
+import threading
+import time
+from concurrent.futures import Future
+from datetime import date, datetime, timedelta
 
-def conectar_banco():
-    """Conecta ao banco de dados SQLite.
+import instrumentacao
+from instrumentacao import instrumentar
+from migracoes import migrar
+
+# Caminho do banco de dados compartilhado por todos os módulos (":memory:" para
+# um banco em memória); pode ser trocado pela variável de ambiente SISTEMA_DB
+CAMINHO_BANCO = os.environ.get("SISTEMA_DB", "sistema.db")
+
+# Quantidade máxima de conexões ociosas mantidas no pool
+TAMANHO_POOL = 8
+
+# Tempo máximo (ms) que uma conexão espera por um lock antes de falhar
+TIMEOUT_OCUPADO_MS = 5000
+
+# Ajustes aplicados uma única vez, quando a conexão é criada
+PRAGMAS_CONEXAO = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    f"PRAGMA busy_timeout={TIMEOUT_OCUPADO_MS}",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA temp_store=MEMORY",
+)
+
+# Ajustes das conexões somente leitura dos relatórios (o modo WAL já vem do arquivo)
+PRAGMAS_LEITURA = (
+    f"PRAGMA busy_timeout={TIMEOUT_OCUPADO_MS}",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA query_only=1",
+)
+
+# Quantidade máxima de requisições gravadas em uma mesma transação
+TAMANHO_MAXIMO_LOTE = 200
+
+# Resultado de registrar_requisicao() quando o lote não foi confirmado a tempo
+# e a requisição ainda pode ser gravada
+REGISTRO_PENDENTE = (None, None)
+
+# Quantidade de linhas lidas por vez (fetchmany) nas consultas em fluxo
+TAMANHO_LOTE = 500
+
+# Quantidade de linhas por página nas listagens paginadas
+TAMANHO_PAGINA = 50
+
+# Colunas das linhas retornadas por iterar_relatorio(), por tipo de relatório
+COLUNAS_RELATORIO = {
+    "analitico": ["nome", "codigo_funcionario", "setor", "codigo_requisicao", "data"],
+    "sintetico": ["nome", "codigo_funcionario", "setor", "total_requisicoes"],
+}
+
+# Quantidade de dígitos do código de barras dos itens
+DIGITOS_CODIGO_ITEM = 12
+
+# Intervalo mínimo (s) entre verificações de alterações feitas por outros processos
+INTERVALO_VERIFICACAO_CACHE = 2.0
+
+# Tabelas percorridas (com seus índices) no aquecimento após a inicialização
+TABELAS_AQUECIMENTO = ("FUNCIONARIOS", "REQUISICOES", "REQUISICOES_POR_DIA", "REQUISICOES_POR_HORA")
+
+class CursorInstrumentado(sqlite3.Cursor):
+    """Cursor que mede cada comando e registra os lentos com o plano de execução.
+    
+    Em uma consulta que retorna linhas, o tempo de fetchone(), fetchmany() e
+    fetchall() é somado ao do execute(), pois o SQLite produz as linhas sob
+    demanda; a soma é avaliada quando o resultado se esgota, quando o cursor
+    executa outro comando ou quando é fechado. A iteração direta sobre o
+    cursor (for linha in cursor) não é medida.
+    """
+
+    # [sql, params_plano, duracao_ms] da consulta cujas linhas ainda estão sendo lidas
+    _leitura = None
+
+    def _registrar(self, sql, params_plano, duracao_ms):
+        try:
+            plano = [linha[-1] for linha in sqlite3.Cursor(self.connection).execute(
+                f"EXPLAIN QUERY PLAN {sql}", params_plano)]
+        except sqlite3.Error:
+            plano = []
+        instrumentacao.registrar_consulta_lenta(sql, params_plano, duracao_ms, plano)
+
+    def _concluir_leitura(self):
+        leitura, self._leitura = self._leitura, None
+        if leitura is not None and leitura[2] >= instrumentacao.LIMITE_CONSULTA_LENTA_MS:
+            self._registrar(*leitura)
+
+    def _medir(self, executar, sql, params, params_plano):
+        self._concluir_leitura()
+        inicio = time.perf_counter()
+        resultado = executar(sql, params)
+        duracao_ms = (time.perf_counter() - inicio) * 1000
+        if duracao_ms >= instrumentacao.LIMITE_CONSULTA_LENTA_MS:
+            self._registrar(sql, params_plano, duracao_ms)
+        elif self.description is not None:
+            self._leitura = [sql, params_plano, duracao_ms]
+        return resultado
+
+    def _medir_leitura(self, ler, esgotou, *args):
+        if self._leitura is None:
+            return ler(*args)
+        inicio = time.perf_counter()
+        linhas = ler(*args)
+        self._leitura[2] += (time.perf_counter() - inicio) * 1000
+        if esgotou(linhas):
+            self._concluir_leitura()
+        return linhas
+
+    def execute(self, sql, params=()):
+        return self._medir(super().execute, sql, params, params)
+
+    def executemany(self, sql, seq_params):
+        seq_params = seq_params if isinstance(seq_params, (list, tuple)) else list(seq_params)
+        return self._medir(super().executemany, sql, seq_params, seq_params[0] if seq_params else ())
+
+    def fetchone(self):
+        return self._medir_leitura(super().fetchone, lambda linha: linha is None)
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        return self._medir_leitura(super().fetchmany, lambda linhas: len(linhas) < size, size)
+
+    def fetchall(self):
+        return self._medir_leitura(super().fetchall, lambda linhas: True)
+
+    def close(self):
+        self._concluir_leitura()
+        super().close()
+
+class ConexaoPool(sqlite3.Connection):
+    """Conexão SQLite que volta para o pool ao ser fechada.
+    
+    O método close() mantém a interface de sqlite3.Connection, de modo que
+    o código existente (conn.close(), pd.read_sql) continua funcionando.
+    Os cursores são instrumentados (veja CursorInstrumentado).
+    """
+
+    pool = None
+
+    def cursor(self, factory=CursorInstrumentado):
+        return super().cursor(factory)
+
+    def execute(self, sql, params=()):
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql, seq_params):
+        return self.cursor().executemany(sql, seq_params)
+
+    def close(self):
+        """Devolve a conexão ao pool ou a fecha se não pertencer a um."""
+        if self.pool is not None:
+            self.pool.devolver(self)
+        else:
+            super().close()
+
+    def fechar(self):
+        """Fecha definitivamente a conexão."""
+        self.pool = None
+        super().close()
+
+class PoolConexoes:
+    """Pool limitado de conexões SQLite pré-configuradas.
+    
+    Conexões são criadas sob demanda e reaproveitadas entre chamadas e
+    threads; no máximo `tamanho` conexões ociosas ficam guardadas.
+    """
+
+    def __init__(self, destino, pragmas=PRAGMAS_CONEXAO, uri=False, tamanho=TAMANHO_POOL):
+        self.destino = destino
+        self.pragmas = pragmas
+        self.uri = uri
+        self._ociosas = queue.LifoQueue(maxsize=tamanho)
+
+    def _criar_conexao(self):
+        conn = sqlite3.connect(
+            self.destino,
+            timeout=TIMEOUT_OCUPADO_MS / 1000,
+            check_same_thread=False,
+            factory=ConexaoPool,
+            uri=self.uri,
+        )
+        for pragma in self.pragmas:
+            conn.execute(pragma)
+        conn.pool = self
+        return conn
+
+    def criar_conexao_dedicada(self):
+        """Cria uma conexão configurada que não pertence ao pool.
+        
+        Returns:
+            ConexaoPool: Conexão que é fechada de fato ao chamar close().
+        """
+        conn = self._criar_conexao()
+        conn.pool = None
+        return conn
+
+    def obter(self):
+        """Retorna uma conexão ociosa do pool ou cria uma nova.
+        
+        Returns:
+            ConexaoPool: Conexão pronta para uso.
+        """
+        try:
+            return self._ociosas.get_nowait()
+        except queue.Empty:
+            return self._criar_conexao()
+
+    def devolver(self, conn):
+        """Devolve uma conexão ao pool, descartando transações pendentes.
+        
+        Args:
+            conn (ConexaoPool): Conexão obtida por obter().
+        """
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            self._ociosas.put_nowait(conn)
+        except (queue.Full, sqlite3.Error):
+            conn.fechar()
+
+    def preencher(self, quantidade):
+        """Abre conexões até haver `quantidade` conexões ociosas no pool.
+        
+        Args:
+            quantidade (int): Quantidade desejada de conexões ociosas.
+        """
+        conexoes = [self.obter() for _ in range(quantidade)]
+        for conn in conexoes:
+            self.devolver(conn)
+
+    def fechar_todas(self):
+        """Fecha todas as conexões ociosas do pool."""
+        while True:
+            try:
+                self._ociosas.get_nowait().fechar()
+            except queue.Empty:
+                break
+
+class PoolExclusivo(PoolConexoes):
+    """Pool de uma única conexão, entregue a um usuário por vez.
+    
+    obter() espera até TIMEOUT_OCUPADO_MS pela devolução da conexão em uso,
+    como o busy timeout faria em um banco em arquivo, e então falha com
+    sqlite3.OperationalError.
+    """
+
+    def __init__(self, destino, pragmas=PRAGMAS_CONEXAO, uri=False):
+        super().__init__(destino, pragmas, uri, tamanho=1)
+        self._em_uso = threading.Lock()
+        self._emprestada = None
+
+    def obter(self):
+        if not self._em_uso.acquire(timeout=TIMEOUT_OCUPADO_MS / 1000):
+            raise sqlite3.OperationalError("database is locked")
+        try:
+            self._emprestada = super().obter()
+        except BaseException:
+            self._em_uso.release()
+            raise
+        return self._emprestada
+
+    def devolver(self, conn):
+        try:
+            super().devolver(conn)
+        finally:
+            # close() repetido não libera a conexão emprestada a outro usuário
+            if conn is self._emprestada:
+                self._emprestada = None
+                self._em_uso.release()
+
+    def preencher(self, quantidade):
+        super().preencher(min(quantidade, 1))
+
+class ArmazenamentoSQLite:
+    """Armazenamento das tabelas do sistema em um arquivo SQLite.
+    
+    Mantém um pool de conexões de escrita, um pool somente leitura
+    (`file:...?mode=ro`) para relatórios e o cache de crachás do banco.
+    Na primeira conexão aplica as migrações pendentes do esquema (veja
+    migracoes.py).
+    """
+
+    def __init__(self, caminho=CAMINHO_BANCO, tamanho_pool=TAMANHO_POOL):
+        self.caminho = caminho
+        self.tamanho_pool = tamanho_pool
+        self._pool = None
+        self._pool_leitura = None
+        self._lock = threading.Lock()
+        self.cache_crachas = CacheCrachas(self)
+
+    def _criar_pool(self):
+        return PoolConexoes(self.caminho, tamanho=self.tamanho_pool)
+
+    def _criar_pool_leitura(self):
+        # as_uri() codifica caracteres como "?" e "#" e torna o caminho absoluto
+        uri = pathlib.Path(self.caminho).resolve().as_uri() + "?mode=ro"
+        return PoolConexoes(uri, PRAGMAS_LEITURA, uri=True,
+                            tamanho=self.tamanho_pool)
+
+    def obter_pool(self):
+        """Retorna o pool de escrita, criando-o e migrando o banco na primeira chamada.
+        
+        Returns:
+            PoolConexoes: Pool de conexões de escrita.
+        """
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    pool = self._criar_pool()
+                    conn = pool.obter()
+                    try:
+                        migrar(conn)
+                    finally:
+                        conn.close()
+                    self._pool = pool
+        return self._pool
+
+    def obter_pool_leitura(self):
+        """Retorna o pool somente leitura.
+        
+        O pool de escrita é criado antes, garantindo o esquema migrado e o
+        arquivo em modo WAL, no qual leitores não bloqueiam a gravação.
+        
+        Returns:
+            PoolConexoes: Pool de conexões somente leitura.
+        """
+        if self._pool_leitura is None:
+            self.obter_pool()
+            with self._lock:
+                if self._pool_leitura is None:
+                    self._pool_leitura = self._criar_pool_leitura()
+        return self._pool_leitura
+
+    def conectar(self):
+        """Obtém uma conexão de escrita; close() a devolve ao pool."""
+        return self.obter_pool().obter()
+
+    def conectar_leitura(self):
+        """Obtém uma conexão somente leitura; close() a devolve ao pool."""
+        return self.obter_pool_leitura().obter()
+
+    def fechar(self):
+        """Fecha as conexões ociosas dos pools e descarta o cache de crachás."""
+        with self._lock:
+            for pool in (self._pool, self._pool_leitura):
+                if pool is not None:
+                    pool.fechar_todas()
+            self._pool = self._pool_leitura = None
+        self.cache_crachas.reiniciar()
+
+class ArmazenamentoMemoria(ArmazenamentoSQLite):
+    """Armazenamento em memória, útil para testes e benchmarks.
+    
+    As conexões compartilham o mesmo banco pelo URI
+    `file:<nome>?mode=memory&cache=shared`; uma conexão reservada o mantém
+    vivo até fechar(). No cache compartilhado os bloqueios são por tabela
+    e não respeitam o busy timeout, por isso as leituras usam
+    read_uncommitted e as gravações passam por uma única conexão
+    (PoolExclusivo): quem chama conectar() com a conexão em uso espera a
+    devolução, em vez de falhar com SQLITE_LOCKED.
+    """
+
+    _contador = itertools.count()
+
+    def __init__(self, tamanho_pool=TAMANHO_POOL):
+        super().__init__(":memory:", tamanho_pool)
+        self.uri = f"file:memoria_{id(self)}_{next(self._contador)}?mode=memory&cache=shared"
+        self._reserva = None
+
+    def _criar_pool(self):
+        pool = PoolExclusivo(self.uri, uri=True)
+        self._reserva = pool.criar_conexao_dedicada()
+        return pool
+
+    def _criar_pool_leitura(self):
+        return PoolConexoes(self.uri, PRAGMAS_LEITURA + ("PRAGMA read_uncommitted=1",), uri=True,
+                            tamanho=self.tamanho_pool)
+
+    def fechar(self):
+        """Fecha as conexões e descarta o banco em memória."""
+        super().fechar()
+        if self._reserva is not None:
+            self._reserva.fechar()
+            self._reserva = None
+
+def criar_armazenamento(caminho=CAMINHO_BANCO):
+    """Cria o armazenamento adequado ao caminho informado.
+    
+    Args:
+        caminho (str, optional): Arquivo do banco ou ":memory:".
+        
+    Returns:
+        ArmazenamentoSQLite: Armazenamento em arquivo ou em memória.
+    """
+    if caminho == ":memory:":
+        return ArmazenamentoMemoria()
+    return ArmazenamentoSQLite(caminho)
+
+_armazenamento = None
+_pool_lock = threading.Lock()
+
+def obter_armazenamento():
+    """Retorna o armazenamento usado pelas funções deste módulo.
+    
+    Na primeira chamada cria um ArmazenamentoSQLite em CAMINHO_BANCO.
+    
+    Returns:
+        ArmazenamentoSQLite: Armazenamento ativo do processo.
+    """
+    global _armazenamento
+    if _armazenamento is None:
+        with _pool_lock:
+            if _armazenamento is None:
+                _armazenamento = criar_armazenamento(CAMINHO_BANCO)
+    return _armazenamento
+
+def configurar_armazenamento(armazenamento):
+    """Troca o armazenamento ativo, usado pelas funções deste módulo.
+    
+    As funções de consulta também aceitam o argumento `armazenamento`, para
+    usar outro banco sem trocar o ativo.
+    
+    Args:
+        armazenamento (ArmazenamentoSQLite | str): Armazenamento já criado ou
+            caminho do banco (":memory:" para um banco em memória).
+        
+    Returns:
+        ArmazenamentoSQLite: Novo armazenamento ativo.
+    """
+    global _armazenamento
+    if isinstance(armazenamento, str):
+        armazenamento = criar_armazenamento(armazenamento)
+    with _pool_lock:
+        anterior, _armazenamento = _armazenamento, armazenamento
+    if anterior is not None and anterior is not armazenamento:
+        anterior.fechar()
+    return armazenamento
+
+def obter_pool():
+    """Retorna o pool de conexões de escrita do armazenamento ativo.
+    
+    Returns:
+        PoolConexoes: Pool compartilhado de conexões.
+    """
+    return obter_armazenamento().obter_pool()
+
+def obter_pool_leitura():
+    """Retorna o pool de conexões somente leitura do armazenamento ativo.
+    
+    Returns:
+        PoolConexoes: Pool compartilhado de conexões somente leitura.
+    """
+    return obter_armazenamento().obter_pool_leitura()
+
+def _versao_funcionarios(conn):
+    """Lê o contador de alterações de FUNCIONARIOS em VERSOES_TABELAS."""
+    return conn.execute("SELECT versao FROM VERSOES_TABELAS WHERE tabela = 'FUNCIONARIOS'").fetchone()[0]
+
+class CacheCrachas:
+    """Cache em memória do mapa código do crachá -> (nome, setor).
+    
+    Cada armazenamento tem o seu (ArmazenamentoSQLite.cache_crachas). É
+    carregado de uma vez e atualizado incrementalmente pelas funções de
+    cadastro e exclusão deste módulo, que informam a versão de FUNCIONARIOS
+    antes e depois da própria gravação. Alterações feitas por outros
+    processos são detectadas pelo contador de FUNCIONARIOS em
+    VERSOES_TABELAS, mantido por gatilhos (migração 8), no máximo a cada
+    INTERVALO_VERIFICACAO_CACHE segundos; gravações em outras tabelas não
+    recarregam o cache.
+    """
+
+    def __init__(self, armazenamento, intervalo=INTERVALO_VERIFICACAO_CACHE):
+        self.armazenamento = armazenamento
+        self.intervalo = intervalo
+        self._funcionarios = None
+        self._versao = None
+        self._ultima_verificacao = 0.0
+        self._lock = threading.Lock()
+
+    def carregar(self):
+        """Recarrega todos os funcionários do banco de dados."""
+        with self._lock:
+            conn = self.armazenamento.conectar_leitura()
+            try:
+                # Versão e funcionários lidos no mesmo instantâneo
+                with conn:
+                    conn.execute("BEGIN")
+                    self._versao = _versao_funcionarios(conn)
+                    cursor = conn.execute("SELECT codigo, nome, setor FROM FUNCIONARIOS")
+                    self._funcionarios = {codigo: (nome, setor) for codigo, nome, setor in cursor}
+            finally:
+                conn.close()
+            self._ultima_verificacao = time.monotonic()
+
+    def _verificar_alteracoes(self):
+        agora = time.monotonic()
+        if agora - self._ultima_verificacao < self.intervalo:
+            return
+        with self._lock:
+            self._ultima_verificacao = agora
+            conn = self.armazenamento.conectar_leitura()
+            try:
+                alterado = _versao_funcionarios(conn) != self._versao
+            finally:
+                conn.close()
+        if alterado:
+            self.carregar()
+
+    def buscar(self, codigo):
+        """Busca um funcionário pelo código do crachá.
+        
+        Args:
+            codigo (str): Código do crachá.
+            
+        Returns:
+            tuple: (nome, setor) ou None se não encontrado.
+        """
+        if self._funcionarios is None:
+            self.carregar()
+        else:
+            self._verificar_alteracoes()
+        return self._funcionarios.get(codigo)
+
+    def _acompanhar_versao(self, versoes):
+        # Se o cache estava na versão anterior à gravação, a alteração já
+        # aplicada o deixa na nova versão e a próxima verificação não recarrega
+        if versoes is not None and self._versao == versoes[0]:
+            self._versao = versoes[1]
+
+    def atualizar(self, funcionarios, versoes=None):
+        """Inclui ou atualiza funcionários no cache.
+        
+        Args:
+            funcionarios (iterable): Tuplas (codigo, nome, setor).
+            versoes (tuple, optional): Versões (anterior, nova) de FUNCIONARIOS,
+                lidas na transação que fez a gravação.
+        """
+        with self._lock:
+            if self._funcionarios is not None:
+                for codigo, nome, setor in funcionarios:
+                    self._funcionarios[codigo] = (nome, setor)
+                self._acompanhar_versao(versoes)
+
+    def remover(self, codigos, versoes=None):
+        """Remove funcionários do cache pelos códigos dos crachás.
+        
+        Args:
+            codigos (iterable): Códigos dos crachás.
+            versoes (tuple, optional): Versões (anterior, nova) de FUNCIONARIOS,
+                lidas na transação que fez a exclusão.
+        """
+        with self._lock:
+            if self._funcionarios is not None:
+                for codigo in codigos:
+                    self._funcionarios.pop(codigo, None)
+                self._acompanhar_versao(versoes)
+
+    def reiniciar(self):
+        """Descarta o cache; a próxima busca recarrega do banco."""
+        with self._lock:
+            self._funcionarios = None
+            self._versao = None
+
+def obter_cache_crachas(armazenamento=None):
+    """Retorna o cache de crachás de um armazenamento.
+    
+    Args:
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
+        
+    Returns:
+        CacheCrachas: Cache de funcionários por código do crachá.
+    """
+    return (armazenamento or obter_armazenamento()).cache_crachas
+
+def conectar_banco(armazenamento=None):
+    """Obtém uma conexão do pool compartilhado do banco de dados SQLite.
+    
+    A conexão já vem configurada (WAL, synchronous=NORMAL, busy timeout,
+    mmap e cache). Chamar close() devolve a conexão ao pool.
     
+    Args:
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
+        
     Returns:
         sqlite3.Connection: Conexão com o banco de dados.
     """
-    return sqlite3.connect("sistema.db")
+    return (armazenamento or obter_armazenamento()).conectar()
+
+def conectar_leitura(armazenamento=None):
+    """Obtém uma conexão somente leitura para relatórios e dashboard.
+    
+    Cada consulta lê um instantâneo consistente do banco; para que várias
+    consultas vejam o mesmo instantâneo, execute-as dentro de um BEGIN.
+    As conexões vêm de um pool próprio, separado do usado pela gravação
+    das requisições. Chamar close() devolve a conexão ao pool.
+    
+    Args:
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
+        
+    Returns:
+        sqlite3.Connection: Conexão somente leitura com o banco de dados.
+    """
+    return (armazenamento or obter_armazenamento()).conectar_leitura()
+
+@instrumentar
+def aquecer_banco(conexoes=4, armazenamento=None):
+    """Prepara o banco para as primeiras requisições após a inicialização.
+    
+    Abre conexões nos pools de escrita e de leitura, atualiza as estatísticas
+    do planejador (PRAGMA optimize) e percorre as tabelas e índices de
+    TABELAS_AQUECIMENTO, trazendo suas páginas para o cache do sistema.
+    
+    Args:
+        conexoes (int, optional): Conexões abertas em cada pool.
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
+        
+    Returns:
+        int: Quantidade de tabelas e índices percorridos.
+    """
+    armazenamento = armazenamento or obter_armazenamento()
+    armazenamento.obter_pool().preencher(conexoes)
+    armazenamento.obter_pool_leitura().preencher(conexoes)
+    
+    conn = conectar_banco(armazenamento)
+    try:
+        conn.execute("PRAGMA optimize")
+    except sqlite3.Error:
+        pass
+    finally:
+        conn.close()
+    
+    percorridos = 0
+    conn = conectar_leitura(armazenamento)
+    try:
+        marcadores = ", ".join("?" * len(TABELAS_AQUECIMENTO))
+        estruturas = conn.execute(f"""
+            SELECT type, name, tbl_name FROM sqlite_master
+            WHERE type IN ('table', 'index') AND sql IS NOT NULL AND tbl_name IN ({marcadores})
+        """, TABELAS_AQUECIMENTO).fetchall()
+        for tipo, nome, tabela in estruturas:
+            # COUNT(*) lê todas as folhas da b-tree escolhida
+            origem = f'"{tabela}" NOT INDEXED' if tipo == "table" else f'"{tabela}" INDEXED BY "{nome}"'
+            try:
+                conn.execute(f"SELECT COUNT(*) FROM {origem}").fetchone()
+                percorridos += 1
+            except sqlite3.Error:
+                continue
+    except sqlite3.Error:
+        pass
+    finally:
+        conn.close()
+    return percorridos
 
 # --- Funções de Autenticação ---
 
-def buscar_administrador(usuario):
+@instrumentar
+def buscar_administrador(usuario, armazenamento=None):
     """Busca um administrador pelo nome de usuário.
     
     Args:
         usuario (str): Nome de usuário do administrador.
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
         
     Returns:
         tuple: Tupla contendo (usuario, senha_hash) ou None se não encontrado.
     """
-    conn = conectar_banco()
-    cursor = conn.cursor()
-    cursor.execute("SELECT usuario, senha FROM ADMINISTRADORES WHERE usuario = ?", (usuario,))
-    resultado = cursor.fetchone()
-    conn.close()
+    conn = conectar_banco(armazenamento)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT usuario, senha FROM ADMINISTRADORES WHERE usuario = ?", (usuario,))
+        resultado = cursor.fetchone()
+    finally:
+        conn.close()
     return resultado  # retorna (usuario, senha) ou None
 
-def autenticar_funcionario(codigo):
+@instrumentar
+def autenticar_funcionario(codigo, armazenamento=None):
     """Autentica um funcionário pelo código do crachá.
     
+    Consulta o cache de crachás em memória, sem acesso ao banco no caso comum.
+    
     Args:
         codigo (str): Código do crachá do funcionário.
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
         
     Returns:
         str: Nome do funcionário ou None se não encontrado.
     """
-    conn = conectar_banco()
-    cursor = conn.cursor()
-    cursor.execute("SELECT nome FROM FUNCIONARIOS WHERE codigo = ?", (codigo,))
-    resultado = cursor.fetchone()
-    conn.close()
+    resultado = obter_cache_crachas(armazenamento).buscar(codigo)
     return resultado[0] if resultado else None
 
 # --- Funções de Requisição ---
 
-def requisicao_ja_registrada(codigo_funcionario, codigo_requisicao):
+def para_epoch(valor):
+    """Converte uma data/hora local em segundos desde a época (epoch).
+    
+    Args:
+        valor (datetime | date | str): Data e hora local; textos no formato
+            "%Y-%m-%d %H:%M:%S" ou YYYY-MM-DD.
+        
+    Returns:
+        int: Segundos desde 1970-01-01 UTC.
+    """
+    if isinstance(valor, str):
+        valor = datetime.fromisoformat(valor)
+    elif not isinstance(valor, datetime):
+        valor = datetime(valor.year, valor.month, valor.day)
+    return int(valor.timestamp())
+
+def de_epoch(valor):
+    """Converte segundos desde a época (epoch) em data/hora local.
+    
+    Args:
+        valor (int): Segundos desde 1970-01-01 UTC ou None.
+        
+    Returns:
+        datetime: Data e hora local ou None.
+    """
+    return datetime.fromtimestamp(valor) if valor is not None else None
+
+def codigo_item_para_inteiro(codigo_requisicao):
+    """Converte o código de barras do item (texto numérico) no inteiro armazenado.
+    
+    Args:
+        codigo_requisicao (str): Código do item com até 18 dígitos.
+        
+    Returns:
+        int: Código como inteiro.
+        
+    Raises:
+        ValueError: Se o código não for numérico.
+    """
+    codigo = str(codigo_requisicao)
+    if not codigo.isdigit() or len(codigo) > 18:
+        raise ValueError(f"Código de item inválido: {codigo}")
+    return int(codigo)
+
+def codigo_item_valido(codigo_requisicao):
+    """Verifica se o código do item é um UPC-A válido.
+    
+    Args:
+        codigo_requisicao (str): Código de barras lido.
+        
+    Returns:
+        bool: True se tem 12 dígitos e o dígito verificador confere.
+    """
+    codigo = str(codigo_requisicao)
+    if len(codigo) != DIGITOS_CODIGO_ITEM or not codigo.isdigit():
+        return False
+    digitos = [int(digito) for digito in codigo]
+    soma = 3 * sum(digitos[0:11:2]) + sum(digitos[1:11:2])
+    return (10 - soma % 10) % 10 == digitos[11]
+
+def formatar_codigo_item(valor):
+    """Formata o código do item armazenado como texto de 12 dígitos.
+    
+    Args:
+        valor (int): Código do item armazenado.
+        
+    Returns:
+        str: Código com zeros à esquerda (UPC-A tem 12 dígitos).
+    """
+    return f"{valor:0{DIGITOS_CODIGO_ITEM}d}"
+
+def intervalo_datas(data_inicio, data_fim):
+    """Converte um período de dias inteiros em limites semiabertos.
+    
+    As consultas usam `data >= inicio AND data < fim` sobre a coluna sem
+    funções aplicadas, o que permite usar o índice idx_requisicoes_data.
+    
+    Args:
+        data_inicio (date | str): Primeiro dia do período (YYYY-MM-DD).
+        data_fim (date | str): Último dia do período, inclusive (YYYY-MM-DD).
+        
+    Returns:
+        tuple: (inicio, fim) em segundos desde a época, com fim exclusivo.
+    """
+    if isinstance(data_inicio, str):
+        data_inicio = date.fromisoformat(data_inicio[:10])
+    if isinstance(data_fim, str):
+        data_fim = date.fromisoformat(data_fim[:10])
+    return para_epoch(data_inicio), para_epoch(data_fim + timedelta(days=1))
+
+@instrumentar
+def requisicao_ja_registrada(codigo_funcionario, codigo_requisicao, armazenamento=None):
     """Verifica se uma requisição já foi registrada por um funcionário.
     
     Args:
         codigo_funcionario (str): Código do funcionário.
         codigo_requisicao (str): Código da requisição.
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
         
     Returns:
-        tuple: (já_registrado, tempo_passado, data_registro)
+        tuple: (já_registrado, tempo_passado, data_registro), com
+            data_registro como datetime.
     """
-    conn = conectar_banco()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT data FROM REQUISICOES 
-        WHERE codigo_funcionario = ? AND codigo_requisicao = ?
-        ORDER BY data DESC LIMIT 1
-    """, (codigo_funcionario, codigo_requisicao))
-    resultado = cursor.fetchone()
-    conn.close()
+    try:
+        codigo_item = codigo_item_para_inteiro(codigo_requisicao)
+    except ValueError:
+        return False, None, None
+    
+    conn = conectar_banco(armazenamento)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT r.data FROM REQUISICOES r
+            JOIN FUNCIONARIOS f ON f.id = r.funcionario_id
+            WHERE f.codigo = ? AND r.codigo_requisicao = ?
+        """, (codigo_funcionario, codigo_item))
+        resultado = cursor.fetchone()
+    finally:
+        conn.close()
 
     if resultado:
-        data_registro = resultado[0]
-        dt_registro = datetime.strptime(data_registro, "%Y-%m-%d %H:%M:%S")
-        tempo_passado = datetime.now() - dt_registro
+        data_registro = de_epoch(resultado[0])
+        tempo_passado = datetime.now() - data_registro
         return True, tempo_passado, data_registro
     return False, None, None
 
-def salvar_requisicao(codigo_funcionario, codigo_requisicao, data_hora_atual):
+@instrumentar
+def salvar_requisicao(codigo_funcionario, codigo_requisicao, data_hora_atual, armazenamento=None):
     """Registra uma nova requisição no banco de dados.
     
     Args:
         codigo_funcionario (str): Código do funcionário.
         codigo_requisicao (str): Código da requisição.
-        data_hora_atual (str): Data e hora atuais no formato "%Y-%m-%d %H:%M:%S".
+        data_hora_atual (datetime | str): Data e hora atuais (texto no formato
+            "%Y-%m-%d %H:%M:%S").
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
         
     Returns:
         bool: True se a operação foi bem-sucedida.
     """
     try:
-        conn = conectar_banco()
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO REQUISICOES (codigo_funcionario, codigo_requisicao, data)
-            VALUES (?, ?, ?)
-        """, (codigo_funcionario, codigo_requisicao, data_hora_atual))
-        conn.commit()
-        conn.close()
-        return True
+        conn = conectar_banco(armazenamento)
+        try:
+            with conn:
+                cursor = conn.execute("""
+                    INSERT INTO REQUISICOES (funcionario_id, codigo_requisicao, data)
+                    SELECT id, ?, ? FROM FUNCIONARIOS WHERE codigo = ?
+                """, (codigo_item_para_inteiro(codigo_requisicao), para_epoch(data_hora_atual), codigo_funcionario))
+                return cursor.rowcount == 1
+        finally:
+            conn.close()
     except Exception:
         return False
 
-def listar_requisicoes(data_inicio=None, data_fim=None, codigo_funcionario=None):
+def _inserir_requisicao(conn, codigo_funcionario, codigo_requisicao, data_hora_atual):
+    """Insere uma requisição na transação corrente ou retorna a já existente.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com transação aberta.
+        codigo_funcionario (str): Código do funcionário.
+        codigo_requisicao (str): Código da requisição.
+        data_hora_atual (datetime | str): Data e hora da leitura.
+        
+    Returns:
+        tuple: (registrado, data_registro); veja registrar_requisicao().
+    """
+    epoch = para_epoch(data_hora_atual)
+    codigo_item = codigo_item_para_inteiro(codigo_requisicao)
+    cursor = conn.execute("""
+        INSERT INTO REQUISICOES (funcionario_id, codigo_requisicao, data)
+        SELECT id, ?, ? FROM FUNCIONARIOS WHERE codigo = ?
+        ON CONFLICT (funcionario_id, codigo_requisicao) DO NOTHING
+    """, (codigo_item, epoch, codigo_funcionario))
+    if cursor.rowcount == 1:
+        return True, de_epoch(epoch)
+    resultado = conn.execute("""
+        SELECT r.data FROM REQUISICOES r
+        JOIN FUNCIONARIOS f ON f.id = r.funcionario_id
+        WHERE f.codigo = ? AND r.codigo_requisicao = ?
+    """, (codigo_funcionario, codigo_item)).fetchone()
+    return False, de_epoch(resultado[0]) if resultado else None
+
+class GravadorRequisicoes:
+    """Grava requisições em segundo plano, agrupando-as em transações.
+    
+    As leituras são enfileiradas e uma única thread as grava em lotes. O
+    gravador não espera o lote encher: cada lote leva o que já está na
+    fila (até `tamanho_maximo` itens) e é confirmado imediatamente, de modo
+    que as leituras só esperam enquanto o commit anterior está em
+    andamento e os lotes crescem apenas sob carga. Cada chamada recebe um
+    Future que só é concluído depois do commit do lote; enquanto a leitura
+    está na fila, cancelar o Future a retira do lote.
+    
+    Atende apenas o serviço de leitura (servico_leitura.py), que recebe
+    leituras avulsas de vários terminais. O terminal Streamlit acumula os
+    itens da sessão e os grava de uma vez com registrar_requisicoes().
+    """
+
+    def __init__(self, tamanho_maximo=TAMANHO_MAXIMO_LOTE, armazenamento=None):
+        self.tamanho_maximo = tamanho_maximo
+        self.armazenamento = armazenamento
+        self._fila = queue.Queue()
+        self._thread = None
+
+    def iniciar(self):
+        """Inicia a thread gravadora, se ainda não estiver em execução."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._executar, name="GravadorRequisicoes", daemon=True)
+            self._thread.start()
+
+    def parar(self):
+        """Grava o que estiver na fila e encerra a thread gravadora."""
+        if self._thread is not None:
+            self._fila.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def enfileirar(self, codigo_funcionario, codigo_requisicao, data_hora_atual):
+        """Enfileira uma requisição para gravação.
+        
+        Args:
+            codigo_funcionario (str): Código do funcionário.
+            codigo_requisicao (str): Código da requisição.
+            data_hora_atual (datetime | str): Data e hora da leitura.
+            
+        Returns:
+            concurrent.futures.Future: Resolvido com (registrado, data_registro)
+                após o commit do lote.
+        """
+        confirmacao = Future()
+        self._fila.put((codigo_funcionario, codigo_requisicao, data_hora_atual, confirmacao))
+        return confirmacao
+
+    def _coletar_lote(self, primeiro):
+        # Leituras canceladas enquanto estavam na fila não entram no lote
+        lote = [primeiro] if primeiro[-1].set_running_or_notify_cancel() else []
+        while len(lote) < self.tamanho_maximo:
+            try:
+                item = self._fila.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._fila.put(None)
+                break
+            if item[-1].set_running_or_notify_cancel():
+                lote.append(item)
+        return lote
+
+    def _gravar_lote(self, lote):
+        try:
+            conn = conectar_banco(self.armazenamento)
+            try:
+                with conn:
+                    conn.execute("BEGIN IMMEDIATE")
+                    resultados = []
+                    for codigo_funcionario, codigo_requisicao, data_hora_atual, _ in lote:
+                        try:
+                            resultados.append(_inserir_requisicao(conn, codigo_funcionario, codigo_requisicao, data_hora_atual))
+                        except ValueError:
+                            resultados.append((False, None))
+            finally:
+                conn.close()
+        except Exception:
+            resultados = [(False, None)] * len(lote)
+        
+        for (*_, confirmacao), resultado in zip(lote, resultados):
+            confirmacao.set_result(resultado)
+
+    def _executar(self):
+        while True:
+            item = self._fila.get()
+            if item is None:
+                break
+            lote = self._coletar_lote(item)
+            if not lote:
+                continue
+            # Uma falha inesperada encerra apenas o lote, não a thread gravadora
+            try:
+                self._gravar_lote(lote)
+            except Exception as e:
+                for *_, confirmacao in lote:
+                    if not confirmacao.done():
+                        confirmacao.set_exception(e)
+
+_gravador = None
+
+def ativar_gravacao_em_lote(tamanho_maximo=TAMANHO_MAXIMO_LOTE, armazenamento=None):
+    """Ativa a gravação em segundo plano para registrar_requisicao().
+    
+    Usada pelo serviço de leitura (servico_leitura.py); o terminal Streamlit
+    não passa por ela. Pode ser chamada várias vezes; apenas a primeira cria
+    o gravador.
+    
+    Args:
+        tamanho_maximo (int, optional): Quantidade máxima de leituras por lote.
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento gravado;
+            por padrão, o ativo no momento de cada lote.
+        
+    Returns:
+        GravadorRequisicoes: Gravador ativo do processo.
+    """
+    global _gravador
+    with _pool_lock:
+        if _gravador is None:
+            _gravador = GravadorRequisicoes(tamanho_maximo, armazenamento)
+            _gravador.iniciar()
+    return _gravador
+
+def desativar_gravacao_em_lote():
+    """Grava as requisições pendentes e volta à gravação imediata."""
+    global _gravador
+    with _pool_lock:
+        gravador, _gravador = _gravador, None
+    if gravador is not None:
+        gravador.parar()
+
+def gravador_ativo(armazenamento=None):
+    """Retorna o gravador em lote que atende um armazenamento, se houver.
+    
+    Args:
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento gravado;
+            por padrão, o ativo.
+        
+    Returns:
+        GravadorRequisicoes | None: Gravador ativo, ou None se a gravação em
+            lote está desativada ou o gravador atende outro armazenamento.
+    """
+    gravador = _gravador
+    if gravador is not None and armazenamento in (None, gravador.armazenamento):
+        return gravador
+    return None
+
+def resultado_nao_confirmado(confirmacao):
+    """Resolve uma leitura da gravação em lote cuja espera terminou sem resultado.
+    
+    Args:
+        confirmacao (concurrent.futures.Future): Future retornado por
+            GravadorRequisicoes.enfileirar().
+        
+    Returns:
+        tuple: (False, None) se a leitura foi retirada da fila ou o lote
+            falhou; REGISTRO_PENDENTE se o lote ainda está sendo gravado.
+    """
+    if confirmacao.cancel() or confirmacao.done():
+        return False, None
+    return REGISTRO_PENDENTE
+
+@instrumentar
+def registrar_requisicao(codigo_funcionario, codigo_requisicao, data_hora_atual, armazenamento=None):
+    """Registra uma requisição ou retorna o registro já existente.
+    
+    A verificação de duplicidade e a inserção acontecem em uma única
+    transação, apoiadas na chave primária (funcionario_id, codigo_requisicao),
+    o que evita que dois terminais registrem o mesmo item ao mesmo tempo.
+    Com a gravação em lote ativa (ativar_gravacao_em_lote), a leitura entra
+    na fila do gravador e a função só retorna após o commit do lote. Se o
+    lote não for confirmado a tempo, a leitura é retirada da fila; se já
+    estiver sendo gravada, retorna REGISTRO_PENDENTE.
+    
+    Args:
+        codigo_funcionario (str): Código do funcionário.
+        codigo_requisicao (str): Código da requisição.
+        data_hora_atual (datetime | str): Data e hora atuais (texto no formato
+            "%Y-%m-%d %H:%M:%S").
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
+        
+    Returns:
+        tuple: (registrado, data_registro). registrado é True quando a
+            requisição foi inserida agora; quando já existia, é False e
+            data_registro (datetime) traz a data do registro anterior. Em caso
+            de erro retorna (False, None), inclusive para crachás não cadastrados.
+            REGISTRO_PENDENTE (registrado None) indica que o commit ainda não
+            foi confirmado e a requisição pode ou não ter sido gravada.
+    """
+    gravador = gravador_ativo(armazenamento)
+    if gravador is not None:
+        confirmacao = gravador.enfileirar(codigo_funcionario, codigo_requisicao, data_hora_atual)
+        try:
+            return confirmacao.result(timeout=TIMEOUT_OCUPADO_MS / 1000 + 1)
+        except Exception:
+            return resultado_nao_confirmado(confirmacao)
+    
+    try:
+        conn = conectar_banco(armazenamento)
+        try:
+            with conn:
+                return _inserir_requisicao(conn, codigo_funcionario, codigo_requisicao, data_hora_atual)
+        finally:
+            conn.close()
+    except Exception:
+        return False, None
+
+@instrumentar
+def registrar_requisicoes(codigo_funcionario, codigos_requisicao, data_hora_atual, armazenamento=None):
+    """Registra vários itens de um mesmo funcionário em uma única transação.
+    
+    Usada pela sessão de leitura do terminal: os itens lidos após um único
+    crachá são gravados juntos ao final da sessão. Códigos repetidos na
+    lista são gravados uma só vez.
+    
+    Args:
+        codigo_funcionario (str): Código do funcionário.
+        codigos_requisicao (list): Códigos dos itens lidos.
+        data_hora_atual (datetime | str): Data e hora do registro.
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
+        
+    Returns:
+        dict: Mapa {codigo_requisicao: (registrado, data_registro)}, com o
+            mesmo significado de registrar_requisicao(). Em caso de erro na
+            transação todos os itens retornam (False, None).
+    """
+    codigos = list(dict.fromkeys(codigos_requisicao))
+    if not codigos:
+        return {}
+    
+    try:
+        conn = conectar_banco(armazenamento)
+        try:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                resultado = {}
+                for codigo_requisicao in codigos:
+                    try:
+                        resultado[codigo_requisicao] = _inserir_requisicao(
+                            conn, codigo_funcionario, codigo_requisicao, data_hora_atual)
+                    except ValueError:
+                        resultado[codigo_requisicao] = (False, None)
+                return resultado
+        finally:
+            conn.close()
+    except Exception:
+        return {codigo_requisicao: (False, None) for codigo_requisicao in codigos}
+
+def iterar_lotes(cursor, tamanho_lote=TAMANHO_LOTE):
+    """Percorre o resultado de um cursor em lotes, sem materializá-lo inteiro.
+    
+    Args:
+        cursor (sqlite3.Cursor): Cursor com a consulta já executada.
+        tamanho_lote (int, optional): Linhas lidas a cada fetchmany().
+        
+    Yields:
+        tuple: Cada linha do resultado.
+    """
+    while True:
+        linhas = cursor.fetchmany(tamanho_lote)
+        if not linhas:
+            break
+        yield from linhas
+
+def _filtrar_requisicoes(data_inicio=None, data_fim=None, codigo_funcionario=None, setor=None, apos=None):
+    """Monta a cláusula WHERE das consultas paginadas de requisições.
+    
+    Args:
+        data_inicio (str, optional): Data inicial para filtragem.
+        data_fim (str, optional): Data final para filtragem.
+        codigo_funcionario (str, optional): Código do funcionário para filtragem.
+        setor (str, optional): Setor do funcionário para filtragem.
+        apos (tuple, optional): Chave (data, funcionario_id, codigo_requisicao)
+            da última linha da página anterior.
+        
+    Returns:
+        tuple: (where, params)
+    """
+    condicoes = []
+    params = []
+    if data_inicio and data_fim:
+        inicio, fim = intervalo_datas(data_inicio, data_fim)
+        condicoes.append("r.data >= ?")
+        params.append(inicio)
+        # Com a chave da página anterior o limite superior já está implícito, e a
+        # busca no índice começa na chave em vez de no fim do período
+        if not apos:
+            condicoes.append("r.data < ?")
+            params.append(fim)
+    if codigo_funcionario:
+        condicoes.append("f.codigo = ?")
+        params.append(codigo_funcionario)
+    if setor:
+        condicoes.append("f.setor = ?")
+        params.append(setor)
+    if apos:
+        condicoes.append("(r.data, r.funcionario_id, r.codigo_requisicao) < (?, ?, ?)")
+        params.extend(apos)
+    where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+    return where, params
+
+@instrumentar
+def paginar_requisicoes(data_inicio=None, data_fim=None, codigo_funcionario=None, setor=None,
+                        apos=None, tamanho_pagina=TAMANHO_PAGINA, armazenamento=None):
+    """Lê uma página de requisições, da mais recente para a mais antiga.
+    
+    A paginação é por chave (keyset): em vez de OFFSET, a consulta continua a
+    partir da chave da última linha da página anterior, percorrendo o índice
+    de datas. Qualquer página custa o mesmo que a primeira.
+    
+    Args:
+        data_inicio (str, optional): Data inicial para filtragem.
+        data_fim (str, optional): Data final para filtragem.
+        codigo_funcionario (str, optional): Código do funcionário para filtragem.
+        setor (str, optional): Setor do funcionário para filtragem.
+        apos (tuple, optional): Chave retornada pela página anterior.
+        tamanho_pagina (int, optional): Quantidade máxima de linhas.
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
+        
+    Returns:
+        tuple: (linhas, proxima), onde linhas é uma lista de tuplas
+            (nome, codigo_funcionario, setor, codigo_requisicao, data) com data
+            como datetime, e proxima é a chave da página seguinte ou None.
+    """
+    where, params = _filtrar_requisicoes(data_inicio, data_fim, codigo_funcionario, setor, apos)
+    conn = conectar_leitura(armazenamento)
+    try:
+        cursor = conn.execute(f"""
+            SELECT f.nome, f.codigo, f.setor, r.codigo_requisicao, r.data, r.funcionario_id
+            FROM REQUISICOES r
+            JOIN FUNCIONARIOS f ON f.id = r.funcionario_id
+            {where}
+            ORDER BY r.data DESC, r.funcionario_id DESC, r.codigo_requisicao DESC
+            LIMIT ?
+        """, (*params, tamanho_pagina + 1))
+        resultado = cursor.fetchall()
+    finally:
+        conn.close()
+    
+    # A linha a mais só indica se existe página seguinte
+    ha_proxima = len(resultado) > tamanho_pagina
+    resultado = resultado[:tamanho_pagina]
+    linhas = [
+        (nome, codigo, setor_funcionario, formatar_codigo_item(codigo_requisicao), de_epoch(data))
+        for nome, codigo, setor_funcionario, codigo_requisicao, data, _ in resultado
+    ]
+    proxima = None
+    if ha_proxima:
+        _, _, _, codigo_requisicao, data, funcionario_id = resultado[-1]
+        proxima = (data, funcionario_id, codigo_requisicao)
+    return linhas, proxima
+
+@instrumentar
+def iterar_requisicoes(data_inicio=None, data_fim=None, codigo_funcionario=None, tamanho_lote=TAMANHO_LOTE,
+                       armazenamento=None):
+    """Percorre requisições com filtros opcionais, uma página por vez.
+    
+    Cada lote é uma consulta paginada por chave (paginar_requisicoes()), de
+    modo que a memória usada não depende do tamanho do período e nenhuma
+    conexão fica presa enquanto o chamador processa as linhas.
+    
+    Args:
+        data_inicio (str, optional): Data inicial para filtragem.
+        data_fim (str, optional): Data final para filtragem.
+        codigo_funcionario (str, optional): Código do funcionário para filtragem.
+        tamanho_lote (int, optional): Linhas lidas por consulta.
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
+        
+    Yields:
+        tuple: (codigo_funcionario, codigo_requisicao, data) com data como datetime.
+    """
+    apos = None
+    while True:
+        linhas, apos = paginar_requisicoes(data_inicio, data_fim, codigo_funcionario,
+                                           apos=apos, tamanho_pagina=tamanho_lote,
+                                           armazenamento=armazenamento)
+        for _, codigo, _, codigo_requisicao, data in linhas:
+            yield codigo, codigo_requisicao, data
+        if apos is None:
+            break
+
+@instrumentar
+def listar_requisicoes(data_inicio=None, data_fim=None, codigo_funcionario=None, armazenamento=None):
     """Lista requisições com filtros opcionais.
     
     Args:
         data_inicio (str, optional): Data inicial para filtragem.
         data_fim (str, optional): Data final para filtragem.
         codigo_funcionario (str, optional): Código do funcionário para filtragem.
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
         
     Returns:
-        list: Lista de tuplas com as requisições encontradas.
+        list: Lista de tuplas (codigo_funcionario, codigo_requisicao, data)
+            com data como datetime, da mais recente para a mais antiga.
     """
-    conn = conectar_banco()
-    cursor = conn.cursor()
+    return list(iterar_requisicoes(data_inicio, data_fim, codigo_funcionario, armazenamento=armazenamento))
+
+@instrumentar
+def contar_requisicoes_por_dia(dias=7, armazenamento=None):
+    """Conta as requisições dos dias mais recentes que tiveram movimento.
     
-    if data_inicio and data_fim and codigo_funcionario:
-        cursor.execute("""
-            SELECT codigo_funcionario, codigo_requisicao, data FROM REQUISICOES
-            WHERE codigo_funcionario = ? AND date(data) BETWEEN date(?) AND date(?)
-            ORDER BY data DESC
-        """, (codigo_funcionario, data_inicio, data_fim))
-    elif data_inicio and data_fim:
+    Lê a tabela de resumo REQUISICOES_POR_DIA na ordem da chave primária,
+    parando após `dias` dias, sem percorrer o histórico de requisições.
+    
+    Args:
+        dias (int, optional): Quantidade de dias com movimento a retornar.
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
+        
+    Returns:
+        list: Lista de tuplas (total, data) em ordem decrescente de data,
+            com data no formato YYYY-MM-DD.
+    """
+    conn = conectar_leitura(armazenamento)
+    try:
+        cursor = conn.cursor()
         cursor.execute("""
-            SELECT codigo_funcionario, codigo_requisicao, data FROM REQUISICOES
-            WHERE date(data) BETWEEN date(?) AND date(?)
-            ORDER BY data DESC
-        """, (data_inicio, data_fim))
-    else:
+            SELECT SUM(total) AS total, date(dia, 'unixepoch', 'localtime') AS data
+            FROM REQUISICOES_POR_DIA
+            GROUP BY dia
+            ORDER BY dia DESC
+            LIMIT ?
+        """, (dias,))
+        return cursor.fetchall()
+    finally:
+        conn.close()
+
+@instrumentar
+def contar_requisicoes_por_hora(data_inicio, data_fim, armazenamento=None):
+    """Conta as requisições de cada hora de um período.
+    
+    Args:
+        data_inicio (date | str): Primeiro dia do período (YYYY-MM-DD).
+        data_fim (date | str): Último dia do período, inclusive (YYYY-MM-DD).
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
+        
+    Returns:
+        list: Lista de tuplas (total, hora) em ordem crescente de hora, com
+            hora como datetime.
+    """
+    inicio, fim = intervalo_datas(data_inicio, data_fim)
+    conn = conectar_leitura(armazenamento)
+    try:
+        cursor = conn.cursor()
         cursor.execute("""
-            SELECT codigo_funcionario, codigo_requisicao, data FROM REQUISICOES
-            ORDER BY data DESC
-        """)
+            SELECT SUM(total), hora
+            FROM REQUISICOES_POR_HORA
+            WHERE hora >= ? AND hora < ?
+            GROUP BY hora
+            ORDER BY hora
+        """, (inicio, fim))
+        return [(total, de_epoch(hora)) for total, hora in cursor.fetchall()]
+    finally:
+        conn.close()
+
+# --- Funções de Relatório ---
+
+def _consulta_relatorio(data_inicio, data_fim, setor, tipo_relatorio):
+    """Monta a consulta SQL do relatório conforme os filtros informados.
+    
+    Args:
+        data_inicio (str): Data inicial no formato YYYY-MM-DD.
+        data_fim (str): Data final no formato YYYY-MM-DD.
+        setor (str): Setor para filtrar ou None para todos.
+        tipo_relatorio (str): "analitico" ou "sintetico".
+        
+    Returns:
+        tuple: (query, params)
+    """
+    inicio, fim = intervalo_datas(data_inicio, data_fim)
+    
+    if tipo_relatorio == "analitico":
+        # Relatório analítico - mostra todas as requisições detalhadas
+        if setor:
+            query = """
+                SELECT f.nome, f.codigo AS codigo_funcionario, f.setor, 
+                       printf('%012d', r.codigo_requisicao) AS codigo_requisicao, r.data
+                FROM REQUISICOES r
+                JOIN FUNCIONARIOS f ON r.funcionario_id = f.id
+                WHERE f.setor = ? AND r.data >= ? AND r.data < ?
+                ORDER BY f.nome, r.data DESC
+            """
+            return query, (setor, inicio, fim)
+        query = """
+            SELECT f.nome, f.codigo AS codigo_funcionario, f.setor, 
+                   printf('%012d', r.codigo_requisicao) AS codigo_requisicao, r.data
+            FROM REQUISICOES r
+            JOIN FUNCIONARIOS f ON r.funcionario_id = f.id
+            WHERE r.data >= ? AND r.data < ?
+            ORDER BY f.nome, r.data DESC
+        """
+        return query, (inicio, fim)
+    
+    # Relatório sintético - soma o resumo diário por funcionário
+    if setor:
+        query = """
+            SELECT f.nome, f.codigo AS codigo_funcionario, f.setor, 
+                   COALESCE(SUM(d.total), 0) AS total_requisicoes
+            FROM FUNCIONARIOS f
+            LEFT JOIN REQUISICOES_POR_DIA d ON f.id = d.funcionario_id
+                AND d.dia >= ? AND d.dia < ?
+            WHERE f.setor = ?
+            GROUP BY f.id
+            ORDER BY f.nome
+        """
+        return query, (inicio, fim, setor)
+    query = """
+        SELECT f.nome, f.codigo AS codigo_funcionario, f.setor, 
+               COALESCE(SUM(d.total), 0) AS total_requisicoes
+        FROM FUNCIONARIOS f
+        LEFT JOIN REQUISICOES_POR_DIA d ON f.id = d.funcionario_id
+            AND d.dia >= ? AND d.dia < ?
+        GROUP BY f.id
+        ORDER BY f.nome
+    """
+    return query, (inicio, fim)
+
+@instrumentar
+def iterar_relatorio(data_inicio, data_fim, setor=None, tipo_relatorio="analitico", tamanho_lote=TAMANHO_LOTE,
+                     armazenamento=None):
+    """Percorre as linhas do relatório de requisições em lotes.
+    
+    Args:
+        data_inicio (str): Data inicial no formato YYYY-MM-DD.
+        data_fim (str): Data final no formato YYYY-MM-DD.
+        setor (str, optional): Setor para filtrar ou None para todos.
+        tipo_relatorio (str, optional): "analitico" ou "sintetico".
+        tamanho_lote (int, optional): Linhas lidas a cada fetchmany().
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
+        
+    Yields:
+        list: Lotes de até `tamanho_lote` tuplas com as colunas de
+            COLUNAS_RELATORIO[tipo_relatorio]; a data vem como datetime.
+    """
+    query, params = _consulta_relatorio(data_inicio, data_fim, setor, tipo_relatorio)
+    conn = conectar_leitura(armazenamento)
+    try:
+        cursor = conn.execute(query, params)
+        while True:
+            lote = cursor.fetchmany(tamanho_lote)
+            if not lote:
+                break
+            if tipo_relatorio == "analitico":
+                lote = [(*linha[:4], de_epoch(linha[4])) for linha in lote]
+            yield lote
+    finally:
+        conn.close()
+
+@instrumentar
+def resumir_requisicoes(data_inicio, data_fim, setor=None, armazenamento=None):
+    """Calcula os totais do relatório analítico a partir do resumo diário.
+    
+    Args:
+        data_inicio (str): Data inicial no formato YYYY-MM-DD.
+        data_fim (str): Data final no formato YYYY-MM-DD.
+        setor (str, optional): Setor para filtrar ou None para todos.
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
+        
+    Returns:
+        tuple: (total_requisicoes, total_funcionarios)
+    """
+    inicio, fim = intervalo_datas(data_inicio, data_fim)
+    query = """
+        SELECT COALESCE(SUM(d.total), 0), COUNT(DISTINCT d.funcionario_id)
+        FROM REQUISICOES_POR_DIA d
+        JOIN FUNCIONARIOS f ON d.funcionario_id = f.id
+        WHERE d.dia >= ? AND d.dia < ?
+    """
+    params = (inicio, fim)
+    if setor:
+        query += " AND f.setor = ?"
+        params += (setor,)
+    
+    conn = conectar_leitura(armazenamento)
+    try:
+        return conn.execute(query, params).fetchone()
+    finally:
+        conn.close()
+
+@instrumentar
+def listar_setores(armazenamento=None):
+    """Lista os setores com funcionários cadastrados.
+    
+    Args:
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
+        
+    Returns:
+        list: Lista de setores em ordem alfabética.
+    """
+    conn = conectar_leitura(armazenamento)
+    try:
+        return [setor for setor, in conn.execute("SELECT DISTINCT setor FROM FUNCIONARIOS ORDER BY setor")]
+    finally:
+        conn.close()
+
+@instrumentar
+def contar_funcionarios_por_setor(armazenamento=None):
+    """Conta os funcionários cadastrados em cada setor.
     
-    requisicoes = cursor.fetchall()
-    conn.close()
-    return requisicoes
+    Args:
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
+        
+    Returns:
+        list: Lista de tuplas (total, setor).
+    """
+    conn = conectar_leitura(armazenamento)
+    try:
+        return conn.execute("SELECT COUNT(*) AS total, setor FROM FUNCIONARIOS GROUP BY setor").fetchall()
+    finally:
+        conn.close()
 
 # --- Funções de Funcionários ---
 
-def cadastrar_funcionario(nome, cpf, setor, codigo=None):
+@instrumentar
+def cadastrar_funcionario(nome, cpf, setor, codigo=None, armazenamento=None):
     """Cadastra um novo funcionário no banco de dados.
     
     Args:
@@ -147,6 +1516,7 @@ def cadastrar_funcionario(nome, cpf, setor, codigo=None):
         cpf (str): CPF do funcionário.
         setor (str): Setor do funcionário.
         codigo (str, optional): Código do crachá, se não especificado usa o CPF.
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
         
     Returns:
         tuple: (sucesso, mensagem)
@@ -155,45 +1525,178 @@ def cadastrar_funcionario(nome, cpf, setor, codigo=None):
         codigo = cpf
         
     try:
-        conn = conectar_banco()
-        cursor = conn.cursor()
-        cursor.execute("INSERT INTO FUNCIONARIOS (nome, cpf, setor, codigo) VALUES (?, ?, ?, ?)",
-                       (nome, cpf, setor, codigo))
-        conn.commit()
-        conn.close()
+        conn = conectar_banco(armazenamento)
+        try:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                versao_anterior = _versao_funcionarios(conn)
+                conn.execute("INSERT INTO FUNCIONARIOS (nome, cpf, setor, codigo) VALUES (?, ?, ?, ?)",
+                             (nome, cpf, setor, codigo))
+                versoes = (versao_anterior, _versao_funcionarios(conn))
+        finally:
+            conn.close()
+        obter_cache_crachas(armazenamento).atualizar([(codigo, nome, setor)], versoes)
         return True, f"Funcionário {nome} cadastrado com sucesso!"
     except sqlite3.IntegrityError:
         return False, "CPF ou Código já cadastrados!"
     except Exception as e:
         return False, f"Erro ao cadastrar: {str(e)}"
 
-def listar_funcionarios():
+@instrumentar
+def importar_funcionarios(funcionarios, armazenamento=None):
+    """Cadastra vários funcionários em uma única transação.
+    
+    Linhas cujo CPF ou código já existam no banco (ou se repitam no próprio
+    lote) são reportadas como conflito sem interromper as demais, que são
+    inseridas com um único executemany.
+    
+    Args:
+        funcionarios (list): Lista de tuplas (nome, cpf, setor, codigo); se o
+            código for vazio ou None, usa o CPF.
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
+        
+    Returns:
+        tuple: (inseridos, conflitos), onde conflitos é uma lista de tuplas
+            (indice, mensagem) com o índice da linha na lista recebida.
+    """
+    registros = [
+        (nome, cpf, setor, codigo or cpf)
+        for nome, cpf, setor, codigo in funcionarios
+    ]
+    if not registros:
+        return 0, []
+    
+    conn = conectar_banco(armazenamento)
+    try:
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            versao_anterior = _versao_funcionarios(conn)
+            cpfs = json.dumps([registro[1] for registro in registros])
+            codigos = json.dumps([registro[3] for registro in registros])
+            cpfs_existentes = {row[0] for row in conn.execute(
+                "SELECT cpf FROM FUNCIONARIOS WHERE cpf IN (SELECT value FROM json_each(?))", (cpfs,))}
+            codigos_existentes = {row[0] for row in conn.execute(
+                "SELECT codigo FROM FUNCIONARIOS WHERE codigo IN (SELECT value FROM json_each(?))", (codigos,))}
+            
+            validos = []
+            conflitos = []
+            for indice, (nome, cpf, setor, codigo) in enumerate(registros):
+                if cpf in cpfs_existentes:
+                    conflitos.append((indice, f"CPF {cpf} já cadastrado"))
+                elif codigo in codigos_existentes:
+                    conflitos.append((indice, f"Código {codigo} já cadastrado"))
+                else:
+                    cpfs_existentes.add(cpf)
+                    codigos_existentes.add(codigo)
+                    validos.append((nome, cpf, setor, codigo))
+            
+            conn.executemany(
+                "INSERT INTO FUNCIONARIOS (nome, cpf, setor, codigo) VALUES (?, ?, ?, ?)",
+                validos,
+            )
+            versoes = (versao_anterior, _versao_funcionarios(conn))
+    finally:
+        conn.close()
+    
+    obter_cache_crachas(armazenamento).atualizar(
+        ((codigo, nome, setor) for nome, _, setor, codigo in validos), versoes)
+    return len(validos), conflitos
+
+@instrumentar
+def iterar_funcionarios(tamanho_lote=TAMANHO_LOTE, armazenamento=None):
+    """Percorre os funcionários cadastrados, lendo em lotes.
+    
+    Args:
+        tamanho_lote (int, optional): Linhas lidas a cada fetchmany().
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
+        
+    Yields:
+        tuple: (id, nome, cpf, setor, codigo) de cada funcionário.
+    """
+    conn = conectar_leitura(armazenamento)
+    try:
+        cursor = conn.execute("SELECT id, nome, cpf, setor, codigo FROM FUNCIONARIOS")
+        yield from iterar_lotes(cursor, tamanho_lote)
+    finally:
+        conn.close()
+
+@instrumentar
+def listar_funcionarios(armazenamento=None):
     """Lista todos os funcionários cadastrados.
     
+    Args:
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
+        
     Returns:
         list: Lista de tuplas com os dados dos funcionários.
     """
-    conn = conectar_banco()
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, nome, cpf, setor, codigo FROM FUNCIONARIOS")
-    funcionarios = cursor.fetchall()
-    conn.close()
-    return funcionarios
+    return list(iterar_funcionarios(armazenamento=armazenamento))
+
+@instrumentar
+def paginar_funcionarios(apos=None, tamanho_pagina=TAMANHO_PAGINA, armazenamento=None):
+    """Lê uma página de funcionários em ordem de ID, paginando por chave.
+    
+    Args:
+        apos (int, optional): ID do último funcionário da página anterior.
+        tamanho_pagina (int, optional): Quantidade máxima de linhas.
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
+        
+    Returns:
+        tuple: (linhas, proxima), onde linhas é uma lista de tuplas
+            (id, nome, cpf, setor, codigo) e proxima é o ID a partir do qual
+            começa a página seguinte ou None.
+    """
+    conn = conectar_leitura(armazenamento)
+    try:
+        cursor = conn.execute("""
+            SELECT id, nome, cpf, setor, codigo FROM FUNCIONARIOS
+            WHERE id > ?
+            ORDER BY id
+            LIMIT ?
+        """, (apos or 0, tamanho_pagina + 1))
+        linhas = cursor.fetchall()
+    finally:
+        conn.close()
+    # A linha a mais só indica se existe página seguinte
+    if len(linhas) > tamanho_pagina:
+        linhas = linhas[:tamanho_pagina]
+        return linhas, linhas[-1][0]
+    return linhas, None
+
+@instrumentar
+def contar_funcionarios(armazenamento=None):
+    """Conta os funcionários cadastrados.
+    
+    Args:
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
+        
+    Returns:
+        int: Quantidade de funcionários.
+    """
+    conn = conectar_leitura(armazenamento)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM FUNCIONARIOS").fetchone()[0]
+    finally:
+        conn.close()
 
-def obter_funcionario(funcionario_id):
+@instrumentar
+def obter_funcionario(funcionario_id, armazenamento=None):
     """Obtém os dados de um funcionário pelo ID.
     
     Args:
         funcionario_id (int): ID do funcionário.
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
         
     Returns:
         dict: Dicionário com os dados do funcionário ou None se não encontrado.
     """
-    conn = conectar_banco()
-    cursor = conn.cursor()
-    cursor.execute("SELECT nome, cpf, setor, codigo FROM FUNCIONARIOS WHERE id = ?", (funcionario_id,))
-    result = cursor.fetchone()
-    conn.close()
+    conn = conectar_banco(armazenamento)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT nome, cpf, setor, codigo FROM FUNCIONARIOS WHERE id = ?", (funcionario_id,))
+        result = cursor.fetchone()
+    finally:
+        conn.close()
     
     if result:
         return {
@@ -204,31 +1707,92 @@ def obter_funcionario(funcionario_id):
         }
     return None
 
-def excluir_funcionario(funcionario_id):
+@instrumentar
+def excluir_funcionario(funcionario_id, armazenamento=None):
     """Exclui um funcionário pelo ID.
     
+    As requisições do funcionário são arquivadas em REQUISICOES_ARQUIVO.
+    
     Args:
         funcionario_id (int): ID do funcionário.
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
         
     Returns:
         bool: True se a exclusão foi bem-sucedida.
     """
     try:
-        conn = conectar_banco()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM FUNCIONARIOS WHERE id = ?", (funcionario_id,))
-        sucesso = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
-        return sucesso
+        return excluir_funcionarios_em_lote([funcionario_id], armazenamento=armazenamento)[int(funcionario_id)]
     except Exception:
         return False
 
-def excluir_funcionarios(ids_funcionarios):
+@instrumentar
+def excluir_funcionarios_em_lote(ids_funcionarios, requisicoes="arquivar", armazenamento=None):
+    """Exclui vários funcionários em uma única transação.
+    
+    A seleção é enviada ao SQLite como um único parâmetro JSON, de modo que
+    cada etapa é um só comando, independentemente da quantidade de IDs.
+    
+    Args:
+        ids_funcionarios (list): Lista de IDs de funcionários.
+        requisicoes (str, optional): O que fazer com as requisições dos
+            funcionários excluídos: "arquivar" (copia para
+            REQUISICOES_ARQUIVO, com código e nome, e remove) ou "excluir".
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
+        
+    Returns:
+        dict: Mapa {id: bool} indicando se cada funcionário foi excluído.
+    """
+    if requisicoes not in ("arquivar", "excluir"):
+        raise ValueError(f"Opção de requisições inválida: {requisicoes}")
+    
+    ids = [int(funcionario_id) for funcionario_id in ids_funcionarios]
+    resultado = {funcionario_id: False for funcionario_id in ids}
+    if not ids:
+        return resultado
+    
+    selecao = json.dumps(ids)
+    conn = conectar_banco(armazenamento)
+    try:
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            versao_anterior = _versao_funcionarios(conn)
+            if requisicoes == "arquivar":
+                conn.execute("""
+                    INSERT INTO REQUISICOES_ARQUIVO
+                        (codigo_funcionario, nome, setor, codigo_requisicao, data, data_arquivamento)
+                    SELECT f.codigo, f.nome, f.setor, printf('%012d', r.codigo_requisicao), r.data,
+                           CAST(strftime('%s', 'now') AS INTEGER)
+                    FROM REQUISICOES r
+                    JOIN FUNCIONARIOS f ON r.funcionario_id = f.id
+                    WHERE f.id IN (SELECT value FROM json_each(?))
+                """, (selecao,))
+            conn.execute("""
+                DELETE FROM REQUISICOES
+                WHERE funcionario_id IN (SELECT value FROM json_each(?))
+            """, (selecao,))
+            excluidos = conn.execute("""
+                DELETE FROM FUNCIONARIOS
+                WHERE id IN (SELECT value FROM json_each(?))
+                RETURNING id, codigo
+            """, (selecao,)).fetchall()
+            versoes = (versao_anterior, _versao_funcionarios(conn))
+    finally:
+        conn.close()
+    
+    for funcionario_id, _ in excluidos:
+        resultado[funcionario_id] = True
+    obter_cache_crachas(armazenamento).remover((codigo for _, codigo in excluidos), versoes)
+    return resultado
+
+@instrumentar
+def excluir_funcionarios(ids_funcionarios, requisicoes="arquivar", armazenamento=None):
     """Exclui múltiplos funcionários pelos IDs.
     
     Args:
         ids_funcionarios (list): Lista de IDs de funcionários.
+        requisicoes (str, optional): "arquivar" ou "excluir"; veja
+            excluir_funcionarios_em_lote().
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
         
     Returns:
         int: Número de funcionários excluídos.
@@ -237,41 +1801,66 @@ def excluir_funcionarios(ids_funcionarios):
         return 0
         
     try:
-        conn = conectar_banco()
-        cursor = conn.cursor()
-        contador = 0
-        
-        for funcionario_id in ids_funcionarios:
-            cursor.execute("DELETE FROM FUNCIONARIOS WHERE id = ?", (funcionario_id,))
-            contador += cursor.rowcount
-            
-        conn.commit()
-        conn.close()
-        return contador
+        return sum(excluir_funcionarios_em_lote(ids_funcionarios, requisicoes, armazenamento).values())
     except Exception:
         return 0
 
 # --- Funções de Administração ---
 
-def cadastrar_administrador(usuario, senha_hash):
+@instrumentar
+def cadastrar_administrador(usuario, senha_hash, armazenamento=None):
     """Cadastra um novo administrador no sistema.
     
     Args:
         usuario (str): Nome de usuário.
         senha_hash (str): Hash da senha já criptografada.
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
         
     Returns:
         bool: True se o cadastro foi bem-sucedido.
     """
     try:
-        conn = conectar_banco()
-        cursor = conn.cursor()
-        cursor.execute("INSERT INTO ADMINISTRADORES (usuario, senha) VALUES (?, ?)",
-                    (usuario, senha_hash))
-        conn.commit()
-        conn.close()
+        conn = conectar_banco(armazenamento)
+        try:
+            with conn:
+                conn.execute("INSERT INTO ADMINISTRADORES (usuario, senha) VALUES (?, ?)",
+                             (usuario, senha_hash))
+        finally:
+            conn.close()
         return True
     except sqlite3.IntegrityError:
         return False
     except Exception:
-        return False
\ No newline at end of file
+        return False
+
+@instrumentar
+def listar_administradores(armazenamento=None):
+    """Lista os administradores cadastrados.
+    
+    Args:
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
+        
+    Returns:
+        list: Lista de tuplas (usuario, senha_hash).
+    """
+    conn = conectar_banco(armazenamento)
+    try:
+        return conn.execute("SELECT usuario, senha FROM ADMINISTRADORES").fetchall()
+    finally:
+        conn.close()
+
+@instrumentar
+def atualizar_senhas_administradores(senhas, armazenamento=None):
+    """Atualiza as senhas de vários administradores em uma única transação.
+    
+    Args:
+        senhas (list): Lista de tuplas (usuario, senha_hash).
+        armazenamento (ArmazenamentoSQLite, optional): Armazenamento usado; por padrão, o ativo.
+    """
+    conn = conectar_banco(armazenamento)
+    try:
+        with conn:
+            conn.executemany("UPDATE ADMINISTRADORES SET senha = ? WHERE usuario = ?",
+                             [(senha_hash, usuario) for usuario, senha_hash in senhas])
+    finally:
+        conn.close()
\ No newline at end of file
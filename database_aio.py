@@ -0,0 +1,114 @@
+"""
+Fachada assíncrona (asyncio) das funções de acesso ao banco de dados.
+
+As funções de database.py são executadas em executores dedicados: um único
+executor de escrita, que serializa as gravações como o SQLite exige, e um
+executor de leitura com LEITORES_AIO threads. Assim, qualquer quantidade de
+clientes concorrentes é atendida com um número fixo de threads.
+
+Uso:
+    import database_aio
+    registrado, data_registro = await database_aio.registrar_requisicao(codigo, item, agora)
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import database
+
+# Quantidade de threads do executor de leitura
+LEITORES_AIO = 4
+
+# Executor de escrita com uma única thread: gravações nunca disputam o lock entre si
+_executor_escrita = ThreadPoolExecutor(max_workers=1, thread_name_prefix="aio-escrita")
+
+# Executor de leitura; em modo WAL as leituras correm em paralelo com a escrita
+_executor_leitura = ThreadPoolExecutor(max_workers=LEITORES_AIO, thread_name_prefix="aio-leitura")
+
+async def _ler(funcao, *args, **kwargs):
+    """Executa uma função de leitura no executor de leitura."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor_leitura, partial(funcao, *args, **kwargs))
+
+async def _escrever(funcao, *args, **kwargs):
+    """Executa uma função de gravação no executor de escrita."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor_escrita, partial(funcao, *args, **kwargs))
+
+async def autenticar_funcionario(codigo, armazenamento=None):
+    """Versão assíncrona de database.autenticar_funcionario()."""
+    return await _ler(database.autenticar_funcionario, codigo, armazenamento)
+
+async def requisicao_ja_registrada(codigo_funcionario, codigo_requisicao, armazenamento=None):
+    """Versão assíncrona de database.requisicao_ja_registrada()."""
+    return await _ler(database.requisicao_ja_registrada, codigo_funcionario, codigo_requisicao, armazenamento)
+
+async def salvar_requisicao(codigo_funcionario, codigo_requisicao, data_hora_atual, armazenamento=None):
+    """Versão assíncrona de database.salvar_requisicao()."""
+    return await _escrever(database.salvar_requisicao, codigo_funcionario, codigo_requisicao, data_hora_atual,
+                           armazenamento)
+
+async def registrar_requisicao(codigo_funcionario, codigo_requisicao, data_hora_atual, armazenamento=None):
+    """Versão assíncrona de database.registrar_requisicao().
+
+    Com a gravação em lote ativa, a leitura entra direto na fila do gravador
+    e a corrotina aguarda o commit do lote sem ocupar nenhuma thread.
+
+    Returns:
+        tuple: (registrado, data_registro); veja database.registrar_requisicao().
+    """
+    gravador = database.gravador_ativo(armazenamento)
+    if gravador is None:
+        return await _escrever(database.registrar_requisicao, codigo_funcionario, codigo_requisicao, data_hora_atual,
+                               armazenamento)
+    confirmacao = gravador.enfileirar(codigo_funcionario, codigo_requisicao, data_hora_atual)
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(confirmacao),
+                                      timeout=database.TIMEOUT_OCUPADO_MS / 1000 + 1)
+    except Exception:
+        return database.resultado_nao_confirmado(confirmacao)
+
+async def registrar_requisicoes(codigo_funcionario, codigos_requisicao, data_hora_atual, armazenamento=None):
+    """Versão assíncrona de database.registrar_requisicoes()."""
+    return await _escrever(database.registrar_requisicoes, codigo_funcionario, codigos_requisicao, data_hora_atual,
+                           armazenamento)
+
+async def listar_requisicoes(data_inicio=None, data_fim=None, codigo_funcionario=None, armazenamento=None):
+    """Versão assíncrona de database.listar_requisicoes()."""
+    return await _ler(database.listar_requisicoes, data_inicio, data_fim, codigo_funcionario, armazenamento)
+
+async def paginar_requisicoes(data_inicio=None, data_fim=None, codigo_funcionario=None, setor=None,
+                              apos=None, tamanho_pagina=database.TAMANHO_PAGINA, armazenamento=None):
+    """Versão assíncrona de database.paginar_requisicoes()."""
+    return await _ler(database.paginar_requisicoes, data_inicio, data_fim, codigo_funcionario,
+                      setor, apos, tamanho_pagina, armazenamento)
+
+async def contar_requisicoes_por_dia(dias=7, armazenamento=None):
+    """Versão assíncrona de database.contar_requisicoes_por_dia()."""
+    return await _ler(database.contar_requisicoes_por_dia, dias, armazenamento)
+
+async def contar_requisicoes_por_hora(data_inicio, data_fim, armazenamento=None):
+    """Versão assíncrona de database.contar_requisicoes_por_hora()."""
+    return await _ler(database.contar_requisicoes_por_hora, data_inicio, data_fim, armazenamento)
+
+def _listar_relatorio(data_inicio, data_fim, setor, tipo_relatorio, armazenamento):
+    lotes = database.iterar_relatorio(data_inicio, data_fim, setor, tipo_relatorio, armazenamento=armazenamento)
+    return [linha for lote in lotes for linha in lote]
+
+async def carregar_relatorio(data_inicio, data_fim, setor=None, tipo_relatorio="analitico", armazenamento=None):
+    """Carrega todas as linhas de database.iterar_relatorio().
+
+    Returns:
+        list: Tuplas com as colunas de database.COLUNAS_RELATORIO[tipo_relatorio].
+    """
+    return await _ler(_listar_relatorio, data_inicio, data_fim, setor, tipo_relatorio, armazenamento)
+
+async def resumir_requisicoes(data_inicio, data_fim, setor=None, armazenamento=None):
+    """Versão assíncrona de database.resumir_requisicoes()."""
+    return await _ler(database.resumir_requisicoes, data_inicio, data_fim, setor, armazenamento)
+
+def encerrar():
+    """Aguarda as operações pendentes e encerra os executores."""
+    _executor_escrita.shutdown(wait=True)
+    _executor_leitura.shutdown(wait=True)
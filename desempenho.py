@@ -0,0 +1,51 @@
+"""
+Módulo da página de desempenho do banco de dados.
+Exibe as estatísticas de chamadas das funções de acesso a dados e as
+consultas lentas registradas desde o início do processo.
+"""
+
+import streamlit as st
+import pandas as pd
+import instrumentacao
+
+def app():
+    """
+    Inicializa a página de desempenho do banco de dados.
+    """
+    st.markdown("<h1 style='text-align: center;'>📈 Desempenho do Banco de Dados</h1>", unsafe_allow_html=True)
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        limite = st.number_input(
+            "Registrar como lentas as consultas acima de (ms):",
+            min_value=1.0,
+            value=float(instrumentacao.LIMITE_CONSULTA_LENTA_MS),
+            step=50.0,
+        )
+        if limite != instrumentacao.LIMITE_CONSULTA_LENTA_MS:
+            instrumentacao.definir_limite_consulta_lenta(limite)
+    with col2:
+        if st.button("🔄 Atualizar", use_container_width=True):
+            st.rerun()
+        if st.button("🧹 Zerar Estatísticas", use_container_width=True):
+            instrumentacao.zerar()
+            st.rerun()
+
+    st.subheader("Chamadas por Função")
+    estatisticas = instrumentacao.estatisticas()
+    if estatisticas:
+        st.dataframe(pd.DataFrame(estatisticas), use_container_width=True, hide_index=True)
+    else:
+        st.info("Nenhuma chamada registrada até o momento.")
+
+    st.subheader("Consultas Lentas")
+    consultas = instrumentacao.consultas_lentas()
+    if consultas:
+        st.dataframe(pd.DataFrame(consultas), use_container_width=True, hide_index=True)
+        st.caption(f"As consultas lentas também são gravadas em {instrumentacao.ARQUIVO_CONSULTAS_LENTAS}.")
+    else:
+        st.info("Nenhuma consulta lenta registrada.")
+
+# Garantia que o script seja executado corretamente
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,167 @@
+"""
+Módulo de importação em lote de funcionários a partir de planilhas CSV ou XLSX.
+"""
+
+import csv
+import io
+import streamlit as st
+from utils import validar_cpf
+from database import importar_funcionarios
+
+# Colunas esperadas no cabeçalho da planilha (a coluna "codigo" é opcional)
+COLUNAS_OBRIGATORIAS = ("nome", "cpf", "setor")
+
+# Dígitos do CPF, que também é o código padrão do crachá
+DIGITOS_CPF = 11
+
+def _normalizar_celula(valor):
+    """Converte o valor de uma célula em texto sem espaços nas bordas."""
+    if valor is None:
+        return ""
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)
+    return str(valor).strip()
+
+def _normalizar_numero(valor):
+    """Restaura zeros à esquerda perdidos quando a planilha trata o CPF ou o código como número."""
+    texto = _normalizar_celula(valor)
+    numerico = isinstance(valor, (int, float))
+    # CSV exportado de uma coluna numérica traz o valor como "1234567890.0"
+    if texto.endswith(".0") and texto[:-2].isdigit():
+        texto, numerico = texto[:-2], True
+    return texto.zfill(DIGITOS_CPF) if numerico and texto.isdigit() else texto
+
+def _linhas_csv(arquivo):
+    """Lê as linhas de um CSV sem carregar o arquivo inteiro em memória."""
+    texto = io.TextIOWrapper(arquivo, encoding="utf-8-sig", newline="")
+    amostra = texto.read(2048)
+    texto.seek(0)
+    try:
+        dialeto = csv.Sniffer().sniff(amostra, delimiters=",;\t")
+    except csv.Error:
+        dialeto = csv.excel
+    yield from csv.reader(texto, dialeto)
+
+def _linhas_xlsx(arquivo):
+    """Lê as linhas da primeira aba de um XLSX em modo somente leitura."""
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError("Para importar arquivos XLSX instale o pacote openpyxl.")
+
+    planilha = load_workbook(arquivo, read_only=True, data_only=True)
+    try:
+        yield from planilha.worksheets[0].iter_rows(values_only=True)
+    finally:
+        planilha.close()
+
+def ler_planilha(arquivo, nome_arquivo):
+    """
+    Lê uma planilha de funcionários linha a linha.
+
+    Args:
+        arquivo (file): Arquivo binário aberto (ou UploadedFile do Streamlit).
+        nome_arquivo (str): Nome do arquivo, usado para identificar o formato.
+
+    Yields:
+        tuple: (numero_linha, nome, cpf, setor, codigo) para cada linha de dados.
+
+    Raises:
+        ValueError: Se o formato não for suportado ou faltarem colunas.
+    """
+    if nome_arquivo.lower().endswith(".csv"):
+        linhas = _linhas_csv(arquivo)
+    elif nome_arquivo.lower().endswith(".xlsx"):
+        linhas = _linhas_xlsx(arquivo)
+    else:
+        raise ValueError("Formato não suportado. Envie um arquivo CSV ou XLSX.")
+
+    cabecalho = [_normalizar_celula(coluna).lower() for coluna in next(linhas, [])]
+    faltando = [coluna for coluna in COLUNAS_OBRIGATORIAS if coluna not in cabecalho]
+    if faltando:
+        raise ValueError(f"Colunas obrigatórias ausentes: {', '.join(faltando)}")
+
+    posicoes = {coluna: cabecalho.index(coluna) for coluna in cabecalho}
+    posicao_codigo = posicoes.get("codigo")
+
+    for numero_linha, linha in enumerate(linhas, start=2):
+        linha = list(linha)
+        if not any(_normalizar_celula(valor) for valor in linha):
+            continue
+        linha += [None] * (len(cabecalho) - len(linha))
+        codigo = _normalizar_numero(linha[posicao_codigo]) if posicao_codigo is not None else ""
+        yield (
+            numero_linha,
+            _normalizar_celula(linha[posicoes["nome"]]),
+            _normalizar_numero(linha[posicoes["cpf"]]),
+            _normalizar_celula(linha[posicoes["setor"]]),
+            codigo,
+        )
+
+def importar_planilha(arquivo, nome_arquivo):
+    """
+    Valida e importa os funcionários de uma planilha.
+
+    Linhas inválidas ou em conflito são reportadas sem interromper a
+    importação das demais, que são gravadas em uma única transação.
+
+    Args:
+        arquivo (file): Arquivo binário aberto (ou UploadedFile do Streamlit).
+        nome_arquivo (str): Nome do arquivo, usado para identificar o formato.
+
+    Returns:
+        tuple: (inseridos, erros), onde erros é uma lista de tuplas
+            (numero_linha, mensagem).
+    """
+    validos = []
+    numeros_linha = []
+    erros = []
+
+    for numero_linha, nome, cpf, setor, codigo in ler_planilha(arquivo, nome_arquivo):
+        if not nome or not setor:
+            erros.append((numero_linha, "Nome e setor são obrigatórios"))
+        elif not validar_cpf(cpf):
+            erros.append((numero_linha, f"CPF inválido: {cpf}"))
+        else:
+            validos.append((nome, cpf, setor, codigo or None))
+            numeros_linha.append(numero_linha)
+
+    inseridos, conflitos = importar_funcionarios(validos)
+    erros.extend((numeros_linha[indice], mensagem) for indice, mensagem in conflitos)
+    erros.sort()
+    return inseridos, erros
+
+def app():
+    """
+    Inicializa a interface de importação de funcionários.
+    """
+    st.markdown("<h1 style='text-align: center;'>Importação de Funcionários</h1>", unsafe_allow_html=True)
+    st.write(
+        "Envie uma planilha **CSV** ou **XLSX** com as colunas **nome**, **cpf** e **setor** "
+        "(a coluna **codigo** é opcional; quando ausente, o CPF é usado como código do crachá)."
+    )
+
+    arquivo = st.file_uploader("Planilha de funcionários", type=["csv", "xlsx"])
+
+    if arquivo is not None and st.button("📥 Importar Funcionários"):
+        try:
+            with st.spinner("Importando funcionários..."):
+                inseridos, erros = importar_planilha(arquivo, arquivo.name)
+        except ValueError as e:
+            st.error(f"❌ {e}")
+            return
+        except Exception as e:
+            st.error(f"❌ Erro ao importar planilha: {e}")
+            return
+
+        st.success(f"✅ {inseridos} funcionário(s) importado(s) com sucesso!")
+        if erros:
+            st.warning(f"⚠️ {len(erros)} linha(s) não importada(s):")
+            st.dataframe(
+                [{"Linha": numero_linha, "Motivo": mensagem} for numero_linha, mensagem in erros],
+                use_container_width=True,
+            )
+
+# Garantia que o script seja executado corretamente
+if __name__ == "__main__":
+    app()
@@ -29,6 +29,7 @@ copy "IniciarServico.bat" "%INSTALL_DIR%"
 copy "PararServico.bat" "%INSTALL_DIR%"
 copy "sistema.db" "%INSTALL_DIR%"
 copy "style.css" "%INSTALL_DIR%"
+copy "terminal.js" "%INSTALL_DIR%"
 
 REM Instalar como serviço usando NSSM
 echo Instalando o serviço...
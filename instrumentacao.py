@@ -0,0 +1,202 @@
+"""
+Módulo de instrumentação do acesso ao banco de dados.
+Registra a quantidade de chamadas e a latência de cada função e mantém um
+log das consultas SQL lentas com o plano de execução (EXPLAIN QUERY PLAN).
+"""
+
+import functools
+import inspect
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+# Limites superiores (ms) das faixas do histograma de latência
+FAIXAS_LATENCIA_MS = (1, 5, 10, 50, 100, 500, 1000, float("inf"))
+
+# Consultas acima deste tempo (ms) vão para o log de consultas lentas;
+# pode ser trocado pela variável de ambiente LIMITE_CONSULTA_LENTA_MS
+LIMITE_CONSULTA_LENTA_MS = float(os.environ.get("LIMITE_CONSULTA_LENTA_MS", 200))
+
+# Arquivo do log de consultas lentas
+ARQUIVO_CONSULTAS_LENTAS = "consultas_lentas.log"
+
+# Quantidade de consultas lentas mantidas em memória para a página de desempenho
+MAXIMO_CONSULTAS_LENTAS = 100
+
+class EstatisticaFuncao:
+    """Contagem de chamadas e histograma de latência de uma função."""
+
+    __slots__ = ("chamadas", "total_ms", "maximo_ms", "faixas")
+
+    def __init__(self):
+        self.chamadas = 0
+        self.total_ms = 0.0
+        self.maximo_ms = 0.0
+        self.faixas = [0] * len(FAIXAS_LATENCIA_MS)
+
+    def registrar(self, duracao_ms):
+        self.chamadas += 1
+        self.total_ms += duracao_ms
+        self.maximo_ms = max(self.maximo_ms, duracao_ms)
+        for indice, limite in enumerate(FAIXAS_LATENCIA_MS):
+            if duracao_ms <= limite:
+                self.faixas[indice] += 1
+                break
+
+    def percentil(self, fracao):
+        """Retorna o limite da faixa que contém o percentil informado (ms)."""
+        alvo = fracao * self.chamadas
+        acumulado = 0
+        for limite, quantidade in zip(FAIXAS_LATENCIA_MS, self.faixas):
+            acumulado += quantidade
+            if acumulado >= alvo:
+                return min(limite, self.maximo_ms)
+        return self.maximo_ms
+
+_estatisticas = {}
+_consultas_lentas = deque(maxlen=MAXIMO_CONSULTAS_LENTAS)
+_lock = threading.Lock()
+
+def registrar_chamada(nome, duracao_ms):
+    """Registra a duração de uma chamada de função.
+
+    Args:
+        nome (str): Nome qualificado da função.
+        duracao_ms (float): Duração da chamada em milissegundos.
+    """
+    with _lock:
+        estatistica = _estatisticas.get(nome)
+        if estatistica is None:
+            estatistica = _estatisticas[nome] = EstatisticaFuncao()
+        estatistica.registrar(duracao_ms)
+
+def instrumentar(funcao):
+    """Decorator que mede as chamadas de uma função de acesso a dados.
+
+    Em funções geradoras é medido apenas o tempo gasto dentro do gerador,
+    somado entre os lotes, sem contar o processamento de quem o consome.
+    """
+    nome = f"{funcao.__module__}.{funcao.__name__}"
+
+    if inspect.isgeneratorfunction(funcao):
+        @functools.wraps(funcao)
+        def gerador(*args, **kwargs):
+            duracao = 0.0
+            iterador = funcao(*args, **kwargs)
+            try:
+                while True:
+                    inicio = time.perf_counter()
+                    try:
+                        item = next(iterador)
+                    except StopIteration:
+                        break
+                    finally:
+                        duracao += time.perf_counter() - inicio
+                    yield item
+            finally:
+                iterador.close()
+                registrar_chamada(nome, duracao * 1000)
+        return gerador
+
+    @functools.wraps(funcao)
+    def wrapper(*args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return funcao(*args, **kwargs)
+        finally:
+            registrar_chamada(nome, (time.perf_counter() - inicio) * 1000)
+    return wrapper
+
+def formato_parametros(params):
+    """Descreve os parâmetros de uma consulta sem expor os valores.
+
+    Args:
+        params (tuple | list | dict): Parâmetros da consulta.
+
+    Returns:
+        str: Tipos dos parâmetros, por exemplo "(int, int, str[4])".
+    """
+    def descrever(valor):
+        nome = type(valor).__name__
+        return f"{nome}[{len(valor)}]" if isinstance(valor, (str, bytes)) else nome
+
+    if isinstance(params, dict):
+        return "{" + ", ".join(f"{chave}: {descrever(valor)}" for chave, valor in params.items()) + "}"
+    return "(" + ", ".join(descrever(valor) for valor in params) + ")"
+
+def registrar_consulta_lenta(sql, params, duracao_ms, plano):
+    """Guarda uma consulta lenta em memória e no arquivo de log.
+
+    Args:
+        sql (str): Comando SQL executado.
+        params (tuple | list | dict): Parâmetros do comando.
+        duracao_ms (float): Tempo de execução em milissegundos.
+        plano (list): Linhas de EXPLAIN QUERY PLAN (detalhes).
+    """
+    registro = {
+        "data": datetime.now().replace(microsecond=0),
+        "duracao_ms": round(duracao_ms, 1),
+        "sql": " ".join(sql.split()),
+        "parametros": formato_parametros(params),
+        "plano": " | ".join(plano),
+    }
+    with _lock:
+        _consultas_lentas.append(registro)
+        try:
+            with open(ARQUIVO_CONSULTAS_LENTAS, "a", encoding="utf-8") as arquivo:
+                arquivo.write(
+                    f"{registro['data']} - {registro['duracao_ms']} ms - {registro['sql']}\n"
+                    f"    parâmetros: {registro['parametros']}\n"
+                    f"    plano: {registro['plano']}\n"
+                )
+        except OSError:
+            pass
+
+def definir_limite_consulta_lenta(limite_ms):
+    """Altera o tempo (ms) a partir do qual uma consulta é registrada como lenta.
+
+    Args:
+        limite_ms (float): Novo limite em milissegundos.
+    """
+    global LIMITE_CONSULTA_LENTA_MS
+    LIMITE_CONSULTA_LENTA_MS = float(limite_ms)
+
+def estatisticas():
+    """Retorna as estatísticas de todas as funções instrumentadas.
+
+    Returns:
+        list: Lista de dicionários, da função com maior tempo total para a menor.
+    """
+    with _lock:
+        itens = list(_estatisticas.items())
+        resultado = [
+            {
+                "funcao": nome,
+                "chamadas": estatistica.chamadas,
+                "total_ms": round(estatistica.total_ms, 1),
+                "media_ms": round(estatistica.total_ms / estatistica.chamadas, 2),
+                "p95_ms": round(estatistica.percentil(0.95), 2),
+                "maximo_ms": round(estatistica.maximo_ms, 2),
+                **{f"<= {limite:g} ms": quantidade
+                   for limite, quantidade in zip(FAIXAS_LATENCIA_MS, estatistica.faixas)},
+            }
+            for nome, estatistica in itens
+        ]
+    return sorted(resultado, key=lambda item: item["total_ms"], reverse=True)
+
+def consultas_lentas():
+    """Retorna as consultas lentas mais recentes, da mais nova para a mais antiga.
+
+    Returns:
+        list: Lista de dicionários com data, duracao_ms, sql, parametros e plano.
+    """
+    with _lock:
+        return list(reversed(_consultas_lentas))
+
+def zerar():
+    """Descarta as estatísticas e as consultas lentas em memória."""
+    with _lock:
+        _estatisticas.clear()
+        _consultas_lentas.clear()
@@ -0,0 +1,166 @@
+"""
+Medição da latência de gravação do terminal durante a geração de relatórios.
+
+Cria um banco temporário com requisições sintéticas e mede o tempo de
+registrar_requisicao() com o banco ocioso e enquanto um relatório analítico
+de todo o período é gerado pelo mesmo caminho da interface: os lotes de
+database.iterar_relatorio(), com uma pausa por lote simulando a montagem do
+PDF, ou, com --relatorio pdf, relatorio_requisicoes.gerar_pdf_analitico()
+(requer as dependências da interface). Falha se o p99 durante o relatório
+passar de `--limite` vezes o p99 com o banco ocioso.
+
+Uso:
+    python latencia_gravacao.py
+    python latencia_gravacao.py --requisicoes 300000 --leituras 5000 --limite 1.5
+    python latencia_gravacao.py --relatorio pdf
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import database
+
+# Razão máxima entre o p99 de uma gravação durante o relatório e com o banco ocioso
+LIMITE_RAZAO_P99 = 2.0
+
+# Leituras medidas em cada etapa; o p99 de 2000 amostras é a 20ª pior
+LEITURAS = 2000
+
+# Quantidade de funcionários e de requisições do banco sintético
+FUNCIONARIOS = 200
+REQUISICOES = 300_000
+
+# Intervalo (s) entre duas leituras simuladas do terminal
+INTERVALO_LEITURAS = 0.002
+
+# Tempo (s) gasto por lote do relatório, simulando a montagem do PDF
+TEMPO_POR_LOTE = 0.001
+
+# Período do relatório, que cobre todas as requisições do banco sintético
+DATA_INICIO = "2000-01-01"
+DATA_FIM = "2100-12-31"
+
+def popular_banco(funcionarios=FUNCIONARIOS, requisicoes=REQUISICOES):
+    """Insere funcionários e requisições sintéticos no armazenamento ativo.
+
+    Args:
+        funcionarios (int, optional): Quantidade de funcionários.
+        requisicoes (int, optional): Quantidade de requisições, uma por minuto
+            a partir de 01/01/2025.
+    """
+    inicio = database.para_epoch(datetime(2025, 1, 1))
+    conn = database.conectar_banco()
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT INTO FUNCIONARIOS (nome, cpf, setor, codigo) VALUES (?, ?, ?, ?)",
+                [(f"Funcionário {i}", f"{i:011d}", f"Setor {i % 5}", f"C{i}") for i in range(funcionarios)],
+            )
+            conn.executemany(
+                "INSERT INTO REQUISICOES (funcionario_id, codigo_requisicao, data) VALUES (?, ?, ?)",
+                ((1 + i % funcionarios, i, inicio + i * 60) for i in range(requisicoes)),
+            )
+    finally:
+        conn.close()
+
+def medir_gravacoes(leituras, funcionarios=FUNCIONARIOS):
+    """Registra leituras aleatórias e mede a latência de cada uma.
+
+    Args:
+        leituras (int): Quantidade de leituras registradas.
+        funcionarios (int, optional): Quantidade de funcionários do banco.
+
+    Returns:
+        list: Latências em ms, em ordem crescente.
+    """
+    latencias = []
+    for _ in range(leituras):
+        codigo_item = f"{random.randrange(10 ** 11, 10 ** 12)}"
+        inicio = time.perf_counter()
+        database.registrar_requisicao(f"C{random.randrange(funcionarios)}", codigo_item,
+                                      datetime.now().replace(microsecond=0))
+        latencias.append((time.perf_counter() - inicio) * 1000)
+        time.sleep(INTERVALO_LEITURAS)
+    return sorted(latencias)
+
+def _ate_parar(lotes, parar):
+    """Repassa os lotes de um gerador até `parar` ser sinalizado, fechando-o em seguida."""
+    with contextlib.closing(lotes):
+        for lote in lotes:
+            if parar.is_set():
+                return
+            yield lote
+
+def gerar_relatorio(parar, pdf=False, funcionarios=FUNCIONARIOS):
+    """Gera o relatório analítico de todo o período, repetidamente, até `parar` ser sinalizado.
+
+    Args:
+        parar (threading.Event): Sinal de encerramento.
+        pdf (bool, optional): Monta o PDF com relatorio_requisicoes em vez de
+            simular a montagem com uma pausa por lote.
+        funcionarios (int, optional): Quantidade de funcionários do banco.
+    """
+    while not parar.is_set():
+        if pdf:
+            import relatorio_requisicoes
+            lotes = relatorio_requisicoes.iterar_requisicoes(DATA_INICIO, DATA_FIM)
+            relatorio_requisicoes.gerar_pdf_analitico(_ate_parar(lotes, parar), DATA_INICIO, DATA_FIM, None,
+                                                      funcionarios, 0)
+        else:
+            for _ in _ate_parar(database.iterar_relatorio(DATA_INICIO, DATA_FIM), parar):
+                time.sleep(TEMPO_POR_LOTE)
+
+def resumir(latencias):
+    """Calcula mediana, p99 e máximo de uma lista ordenada de latências."""
+    return statistics.median(latencias), latencias[int(len(latencias) * 0.99)], latencias[-1]
+
+def main(argv=None):
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Mede a latência de gravação durante a geração de relatórios.")
+    parser.add_argument("--requisicoes", type=int, default=REQUISICOES,
+                        help=f"Requisições no banco sintético (padrão: {REQUISICOES})")
+    parser.add_argument("--leituras", type=int, default=LEITURAS,
+                        help=f"Leituras medidas em cada etapa (padrão: {LEITURAS})")
+    parser.add_argument("--relatorio", choices=("lotes", "pdf"), default="lotes",
+                        help="Lotes de iterar_relatorio() ou o PDF analítico completo (padrão: lotes)")
+    parser.add_argument("--limite", type=float, default=LIMITE_RAZAO_P99,
+                        help=f"Razão máxima entre o p99 durante o relatório e o ocioso (padrão: {LIMITE_RAZAO_P99})")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        database.configurar_armazenamento(os.path.join(diretorio, "latencia.db"))
+        try:
+            popular_banco(requisicoes=args.requisicoes)
+            ocioso = resumir(medir_gravacoes(args.leituras))
+
+            parar = threading.Event()
+            relatorio = threading.Thread(target=gerar_relatorio, args=(parar, args.relatorio == "pdf"), daemon=True)
+            relatorio.start()
+            time.sleep(0.3)
+            try:
+                durante = resumir(medir_gravacoes(args.leituras))
+            finally:
+                parar.set()
+                relatorio.join()
+        finally:
+            database.configurar_armazenamento(database.CAMINHO_BANCO)
+
+    for etapa, (mediana, p99, maximo) in (("Banco ocioso", ocioso), (f"Relatório ({args.relatorio})", durante)):
+        print(f"{etapa:<22} p50 {mediana:6.2f} ms  p99 {p99:6.2f} ms  máx. {maximo:6.2f} ms")
+    razao = durante[1] / ocioso[1]
+    if razao > args.limite:
+        print(f"FALHA: p99 durante o relatório {razao:.2f}x o ocioso, acima do limite de {args.limite:.1f}x")
+        return 1
+    print(f"OK: p99 durante o relatório {razao:.2f}x o ocioso, dentro do limite de {args.limite:.1f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,46 +4,72 @@ Permite visualizar, filtrar e excluir funcionários, além de gerar crachás.
 """
 
 import streamlit as st
-import pandas as pd
-import os
 
 from utils import download_cracha, carregar_estilo_css
+from paginacao import paginar, reiniciar_paginacao
 from database import (
-    conectar_banco,
-    listar_funcionarios,
-    excluir_funcionarios as db_excluir_funcionarios,
+    contar_funcionarios,
+    paginar_funcionarios,
+    excluir_funcionarios_em_lote as db_excluir_funcionarios_em_lote,
     obter_funcionario as db_obter_funcionario
 )
 
-# Carregar CSS externo se disponível
-if os.path.exists("style.css"):
-    with open("style.css") as f:
-        st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+# Colunas da listagem de funcionários
+COLUNAS_FUNCIONARIOS = ["id", "nome", "cpf", "setor", "codigo"]
 
 def carregar_funcionarios():
     """
-    Carrega a lista de funcionários do banco de dados como DataFrame.
+    Carrega a página atual da lista de funcionários como DataFrame.
     
     Returns:
-        pandas.DataFrame: DataFrame contendo os dados dos funcionários.
+        pandas.DataFrame: DataFrame contendo os dados dos funcionários da página.
     """
-    conn = conectar_banco()
-    df = pd.read_sql("SELECT id, nome, cpf, setor, codigo FROM FUNCIONARIOS", conn)
-    conn.close()
-    return df
+    return paginar("funcionarios", paginar_funcionarios, COLUNAS_FUNCIONARIOS,
+                   contar=contar_funcionarios)
 
-def excluir_funcionarios(ids_selecionados):
+# Opções de tratamento das requisições dos funcionários excluídos
+OPCOES_REQUISICOES = {
+    "Arquivar requisições": "arquivar",
+    "Excluir requisições": "excluir",
+}
+
+def excluir_funcionarios(ids_selecionados, requisicoes="arquivar"):
     """
-    Exclui múltiplos funcionários e exibe mensagem de sucesso.
+    Exclui múltiplos funcionários em lote e recarrega a listagem.
+    
+    O resultado é guardado no estado da sessão e exibido na execução
+    seguinte (veja exibir_mensagens_exclusao()), pois st.rerun() descarta o
+    que foi exibido na execução atual.
     
     Args:
         ids_selecionados (list): Lista de IDs dos funcionários a serem excluídos.
+        requisicoes (str, optional): "arquivar" ou "excluir".
     """
     if ids_selecionados:
-        contagem = db_excluir_funcionarios(ids_selecionados)
-        st.success(f"✅ {contagem} funcionário(s) removido(s) com sucesso!")
+        try:
+            resultado = db_excluir_funcionarios_em_lote(ids_selecionados, requisicoes)
+        except Exception as e:
+            st.error(f"❌ Erro ao excluir funcionários: {e}")
+            return
+        contagem = sum(resultado.values())
+        mensagens = [("sucesso", f"✅ {contagem} funcionário(s) removido(s) com sucesso!")]
+        nao_excluidos = [str(funcionario_id) for funcionario_id, ok in resultado.items() if not ok]
+        if nao_excluidos:
+            mensagens.append(("aviso", f"⚠️ IDs não encontrados: {', '.join(nao_excluidos)}"))
+        st.session_state["mensagens_exclusao"] = mensagens
+        reiniciar_paginacao("funcionarios")
         st.rerun()
 
+def exibir_mensagens_exclusao():
+    """
+    Exibe, uma única vez, o resultado da última exclusão em lote.
+    """
+    for tipo, mensagem in st.session_state.pop("mensagens_exclusao", []):
+        if tipo == "sucesso":
+            st.success(mensagem)
+        else:
+            st.warning(mensagem)
+
 def obter_funcionario(funcionario_id):
     """
     Obtém os dados de um funcionário pelo ID.
@@ -60,6 +86,8 @@ def app():
     """
     Carrega a página de listagem de crachás com todas as funcionalidades.
     """
+    carregar_estilo_css()
+    
     # Inicialização de estados de sessão
     if "exibindo_cracha" not in st.session_state:
         st.session_state["exibindo_cracha"] = False
@@ -104,6 +132,8 @@ def exibir_lista_funcionarios():
     """
     Exibe a lista de funcionários com opções para gerenciar e imprimir crachás.
     """
+    exibir_mensagens_exclusao()
+    
     # Botão de atualização
     st.markdown("<div class='button-container'>", unsafe_allow_html=True)
     col1, col2 = st.columns([3, 1])
@@ -111,6 +141,7 @@ def exibir_lista_funcionarios():
         st.markdown("")  # Espaço vazio para alinhamento
     with col2:
         if st.button("🔄 Atualizar Lista", use_container_width=True):
+            reiniciar_paginacao("funcionarios")
             st.rerun()
     st.markdown("</div>", unsafe_allow_html=True)
 
@@ -159,12 +190,19 @@ def exibir_tab_gerenciar(df):
     # Filtrar os IDs dos funcionários selecionados para exclusão
     ids_selecionados = tabela_editavel.loc[tabela_editavel["Selecionar"], "id"].tolist()
 
+    # Destino das requisições dos funcionários excluídos
+    opcao_requisicoes = st.radio(
+        "Requisições dos funcionários excluídos:",
+        list(OPCOES_REQUISICOES),
+        horizontal=True,
+    )
+
     # Centralizando o botão de exclusão
     col1, col2, col3 = st.columns([3, 2, 3])
     with col2:
         if ids_selecionados:
             if st.button("❌ Excluir Selecionados", use_container_width=True):
-                excluir_funcionarios(ids_selecionados)
+                excluir_funcionarios(ids_selecionados, OPCOES_REQUISICOES[opcao_requisicoes])
 
 def exibir_tab_imprimir(df):
     """
@@ -1,26 +1,36 @@
 import streamlit as st
-import sqlite3
 from datetime import datetime
+import html
 import time
-import os
-import json
 import streamlit.components.v1 as components
+from streamlit.errors import StreamlitAPIException
 
 # Importações centralizadas
+from recursos import aplicar_recursos
 from database import (
     autenticar_funcionario,
-    requisicao_ja_registrada,
-    salvar_requisicao
+    codigo_item_valido,
+    registrar_requisicoes,
+    requisicao_ja_registrada
 )
 
+# Tempo (s) de exibição das mensagens após cada leitura
+TEMPO_MENSAGEM = 3
+TEMPO_MENSAGEM_DUPLICADA = 10
+
+# Tempo (s) sem leituras após o qual a sessão de itens é finalizada automaticamente
+TEMPO_SESSAO_OCIOSA = 20
+
+# Cores (fundo, texto, borda) das mensagens por tipo
+CORES_FEEDBACK = {
+    "sucesso": ("#d4edda", "#155724", "#c3e6cb"),
+    "aviso": ("#fff3cd", "#856404", "#ffeeba"),
+    "erro": ("#f8d7da", "#721c24", "#f5c6cb"),
+}
+
 # Configuração da página
 st.set_page_config(page_title="Sistema de Controle", layout="centered")
 
-# Carregar CSS se disponível
-if os.path.exists("style.css"):
-    with open("style.css") as css:
-        st.markdown(f"<style>{css.read()}</style>", unsafe_allow_html=True)
-
 # --- Inicialização das variáveis de sessão ---
 if "page" not in st.session_state:
     st.session_state["page"] = "login"  # Valores possíveis: "login", "requisicao", "admin"
@@ -31,164 +41,154 @@ if "etapa" not in st.session_state:
 if "js_counter" not in st.session_state:
     st.session_state["js_counter"] = 0
 
-# Incrementar contador para garantir a execução do JavaScript
-st.session_state["js_counter"] += 1
+# Reexecução parcial da tela de leitura (st.experimental_fragment nas versões
+# anteriores do Streamlit; sem suporte, a função roda como parte do script)
+fragmento = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda funcao: funcao)
+
+def reexecutar_leitura():
+    """Reexecuta apenas a tela de leitura, ou o script inteiro quando não é possível."""
+    try:
+        st.rerun(scope="fragment")
+    except (TypeError, StreamlitAPIException):
+        # Streamlit sem `scope` ou chamada durante uma execução completa do script
+        st.rerun()
 
 def resetar_input():
     """Incrementa a chave de input para limpar os campos de texto."""
     st.session_state["input_key"] += 1
 
-def exibir_contagem_regressiva(segundos=10):
-    """Exibe uma contagem regressiva antes de encerrar a sessão.
+def iniciar_sessao_itens(nome, codigo_funcionario):
+    """Inicia a sessão de leitura de itens após a identificação pelo crachá.
+    
+    Os itens lidos ficam apenas em st.session_state até finalizar_sessao_itens(),
+    que os grava em uma única transação. Em troca, uma sessão interrompida
+    (página recarregada, aba fechada ou servidor reiniciado) perde os itens
+    ainda não gravados; por isso a tela mostra sempre quantos estão pendentes
+    e a sessão é finalizada após TEMPO_SESSAO_OCIOSA segundos sem leituras.
     
     Args:
-        segundos (int): Quantidade de segundos para contar.
+        nome (str): Nome do funcionário.
+        codigo_funcionario (str): Código do crachá.
     """
-    countdown_placeholder = st.empty()
-    for i in range(segundos, 0, -1):
-        countdown_placeholder.warning(f"Encerrando sessão em {i} segundos...")
-        time.sleep(1)
-
-# Script JavaScript para proteção do botão Deploy e foco automático
-def injetar_js_protetor():
-    counter = st.session_state["js_counter"]
-    etapa_atual = st.session_state["etapa"]
-    js_code = f"""
-    <script>
-    // Função executada quando a página carrega
-    (function() {{
-        console.log("Inicializando proteção do botão Deploy (counter: {counter})");
+    st.session_state["usuario"] = nome
+    st.session_state["codigo_funcionario"] = codigo_funcionario
+    st.session_state["itens_sessao"] = []
+    st.session_state["ultima_leitura"] = time.time()
+    st.session_state["etapa"] = "requisicao"
+
+def finalizar_sessao_itens():
+    """Grava os itens da sessão em uma única transação e volta ao crachá."""
+    itens = st.session_state.get("itens_sessao", [])
+    if itens:
+        data_hora_atual = datetime.now().replace(microsecond=0)
+        resultado = registrar_requisicoes(st.session_state["codigo_funcionario"], itens, data_hora_atual)
+        registrados = [codigo for codigo, (registrado, _) in resultado.items() if registrado]
+        duplicados = [(codigo, data_registro) for codigo, (registrado, data_registro) in resultado.items()
+                      if not registrado and data_registro]
+        falhas = len(resultado) - len(registrados) - len(duplicados)
         
-        // 1. Proteger o botão Deploy
-        function protectDeployButton() {{
-            // Encontrar o botão Deploy (usa o seletor de um botão que contenha "Deploy" no texto ou esteja no cabeçalho)
-            const deployButton = window.parent.document.querySelector('button[data-baseweb="button"]');
-            if (deployButton) {{
-                console.log("Botão Deploy encontrado, aplicando proteção");
-                
-                // Criar um bloqueador de eventos para o botão
-                const blockHandler = function(event) {{
-                    // Se o evento não foi gerado por um clique humano direto
-                    if (!event.isTrusted) {{
-                        console.log("Bloqueando clique automático no botão Deploy");
-                        event.preventDefault();
-                        event.stopPropagation();
-                        event.stopImmediatePropagation();
-                        return false;
-                    }}
-                }};
-                
-                // Adicionar o bloqueador em fase de captura
-                deployButton.addEventListener('click', blockHandler, true);
-                
-                // Podemos também desabilitar temporariamente o botão durante a leitura
-                const originalPointerEvents = deployButton.style.pointerEvents;
-                
-                // Monitorar teclas para detectar leitura de código de barras
-                let barcodeBuffer = '';
-                let lastKeyTime = 0;
-                const MAX_DELAY = 100;  // ms entre teclas
-                
-                window.parent.document.addEventListener('keydown', function(event) {{
-                    const currentTime = new Date().getTime();
-                    
-                    // Se é parte de uma leitura rápida (típico de scanner)
-                    if (event.key.length === 1 && /[\\d]/.test(event.key)) {{
-                        if (currentTime - lastKeyTime > MAX_DELAY) {{
-                            // Nova leitura iniciando, desabilitar botão temporariamente
-                            deployButton.style.pointerEvents = 'none';
-                            barcodeBuffer = '';
-                        }}
-                        barcodeBuffer += event.key;
-                        lastKeyTime = currentTime;
-                    }}
-                    else if (event.key === 'Enter' && barcodeBuffer.length > 0) {{
-                        // Fim da leitura, processar e restaurar botão após um delay
-                        setTimeout(function() {{
-                            deployButton.style.pointerEvents = originalPointerEvents;
-                        }}, 500);
-                        
-                        // Se causou problemas com o botão Deploy, parar propagação do Enter
-                        if (event.target.tagName === 'INPUT') {{
-                            event.stopPropagation();
-                        }}
-                    }}
-                }}, true);
-                
-                return true;
-            }}
-            return false;
-        }}
+        linhas = []
+        if registrados:
+            linhas.append(f"✅ {len(registrados)} requisição(ões) registrada(s) com sucesso!\n🕒 {data_hora_atual}")
+        for codigo, data_registro in duplicados:
+            linhas.append(f"🚫 Item {codigo} já bipado em {data_registro:%Y-%m-%d %H:%M:%S}.")
+        if falhas:
+            linhas.append(f"❌ {falhas} item(ns) não registrado(s). Tente novamente.")
         
-        // 2. Focar no campo de entrada apropriado com base na etapa atual
-        function focusInput() {{
-            // Determinar qual campo focar com base na etapa atual
-            const etapa = '{etapa_atual}';
-            let inputSelector = '';
-            
-            if (etapa === 'login') {{
-                // Na tela de login, procurar campo de crachá
-                inputSelector = 'input[aria-label="Escaneie seu Crachá"]';
-            }} else if (etapa === 'requisicao') {{
-                // Na tela de requisição, procurar campo de código de barras
-                inputSelector = 'input[aria-label="Escaneie o código do item (Apenas números, 12 caracteres)"]';
-            }}
-            
-            if (inputSelector) {{
-                const inputField = window.parent.document.querySelector(inputSelector);
-                if (inputField) {{
-                    console.log("Campo encontrado para etapa " + etapa + ", aplicando foco");
-                    setTimeout(() => inputField.focus(), 100);
-                    return true;
-                }}
-            }}
-            
-            // Fallback: tentar focar em qualquer input de texto visível
-            const visibleInputs = window.parent.document.querySelectorAll('input[type="text"]:not([disabled]):not([readonly])');
-            if (visibleInputs.length > 0) {{
-                console.log("Campo de entrada encontrado (fallback), aplicando foco");
-                setTimeout(() => visibleInputs[0].focus(), 100);
-                return true;
+        if falhas or duplicados:
+            definir_feedback("erro", "\n".join(linhas), TEMPO_MENSAGEM_DUPLICADA)
+        else:
+            definir_feedback("sucesso", "\n".join(linhas))
+    
+    st.session_state["itens_sessao"] = []
+    st.session_state["etapa"] = "login"
+    resetar_input()
+
+def agendar_finalizacao(segundos):
+    """Finaliza a sessão pelo navegador após `segundos` sem novas leituras."""
+    components.html(f"""
+    <script>
+    setTimeout(function() {{
+        const botoes = window.parent.document.querySelectorAll('button');
+        const finalizar = Array.from(botoes).find(b => b.innerText.includes('Finalizar'));
+        if (finalizar) finalizar.click();
+    }}, {int(segundos * 1000)});
+    </script>
+    """, height=0)
+
+def definir_feedback(tipo, mensagem, segundos=TEMPO_MENSAGEM):
+    """Guarda uma mensagem para ser exibida nas próximas execuções do script.
+    
+    A mensagem aparece junto com o campo da próxima leitura, sem bloquear o
+    servidor: a contagem regressiva e o fechamento acontecem no navegador.
+    
+    Args:
+        tipo (str): "sucesso", "aviso" ou "erro".
+        mensagem (str): Texto da mensagem.
+        segundos (int): Tempo de exibição.
+    """
+    st.session_state["feedback"] = {
+        "tipo": tipo,
+        "mensagem": mensagem,
+        "expira": time.time() + segundos,
+    }
+
+def exibir_feedback():
+    """Exibe a mensagem pendente com uma contagem regressiva no navegador."""
+    feedback = st.session_state.get("feedback")
+    if not feedback:
+        return
+    restante = int(feedback["expira"] - time.time() + 0.999)
+    if restante <= 0:
+        del st.session_state["feedback"]
+        return
+    
+    fundo, texto, borda = CORES_FEEDBACK[feedback["tipo"]]
+    mensagem = html.escape(feedback["mensagem"]).replace("\n", "<br>")
+    components.html(f"""
+    <div id="feedback" style="background:{fundo}; color:{texto}; border:1px solid {borda};
+         border-radius:8px; padding:12px 16px; font-family:sans-serif; font-size:18px;">
+        {mensagem}
+        <div style="font-size:13px; margin-top:6px;">Esta mensagem fecha em <span id="restante">{restante}</span> s</div>
+    </div>
+    <script>
+    (function() {{
+        let restante = {restante};
+        const timer = setInterval(function() {{
+            restante -= 1;
+            if (restante <= 0) {{
+                clearInterval(timer);
+                document.getElementById("feedback").style.display = "none";
+                // Recolhe o iframe para não deixar espaço em branco na página
+                if (window.frameElement) window.frameElement.style.height = "0px";
+            }} else {{
+                document.getElementById("restante").textContent = restante;
             }}
-            
-            return false;
-        }}
-        
-        // Tenta aplicar as proteções imediatamente
-        let deployProtected = protectDeployButton();
-        let inputFocused = focusInput();
-        
-        // Se falhar, tentar novamente após um curto delay (DOM pode não estar totalmente carregado)
-        if (!deployProtected || !inputFocused) {{
-            setTimeout(function() {{
-                if (!deployProtected) deployProtected = protectDeployButton();
-                if (!inputFocused) inputFocused = focusInput();
-            }}, 300);
-        }}
+        }}, 1000);
     }})();
     </script>
+    """, height=110)
+
+@fragmento
+def tela_leitura():
+    """Tela de leitura do crachá e dos itens.
+    
+    Roda como fragmento: cada leitura reexecuta apenas esta função, sem o
+    cabeçalho e o restante da página.
     """
+    # Incrementar contador para garantir a execução do JavaScript
+    st.session_state["js_counter"] += 1
     
-    # Injetar o JavaScript via components.html
-    components.html(js_code, height=0)
-
-# Verificar a página atual e carregar o conteúdo correspondente
-if st.session_state["page"] == "admin":
-    import admin
-    admin.app()
-    st.stop()
-else:
-    # Injetar JavaScript de proteção do botão Deploy e foco automático
-    injetar_js_protetor()
+    # CSS e script do terminal (enviados uma vez por sessão) e o estado atual da tela
+    # O crachá vai junto para que a releitura dele, que encerra a sessão, passe pela validação do item
+    aplicar_recursos({
+        "etapa": st.session_state["etapa"],
+        "execucao": st.session_state["js_counter"],
+        "cracha": st.session_state.get("codigo_funcionario") if st.session_state["etapa"] == "requisicao" else None,
+    })
     
-    # Cabeçalho com título e botão administrador
-    header_col1, header_col2 = st.columns([8, 2])
-    with header_col1:
-        st.markdown("<h1 style='margin: 0;'>📋 SISTEMA DE CONTROLE DE REQUISIÇÃO</h1>", unsafe_allow_html=True)
-    with header_col2:
-        if st.button("🔐 Acesso Administrador"):
-            st.session_state["page"] = "admin"
-            st.rerun()
+    # Mensagem da leitura anterior; o campo da próxima leitura já fica disponível
+    exibir_feedback()
 
     # --- Tela de Login (Escanear Crachá) ---
     if st.session_state["etapa"] == "login":
@@ -198,51 +198,80 @@ else:
             nome = autenticar_funcionario(codigo_funcionario)
             if nome:
                 st.success(f"✅ Autenticado com sucesso! Bem-vindo, {nome}!")
-                st.session_state["usuario"] = nome
-                st.session_state["codigo_funcionario"] = codigo_funcionario
-                st.session_state["etapa"] = "requisicao"
-                st.rerun()
+                iniciar_sessao_itens(nome, codigo_funcionario)
+                reexecutar_leitura()
             else:
                 st.error("🚫 Crachá não cadastrado!")
 
     # --- Tela de Requisição (Escanear Código de Barras) ---
     elif st.session_state["etapa"] == "requisicao":
-        st.markdown("<h3 style='text-align: center;'>Faça a leitura do código de barras</h3>", unsafe_allow_html=True)
-        st.info(f"👤 Usuário autenticado: **{st.session_state['usuario']}**")
+        # Sessão ociosa: grava o que foi lido antes de tratar qualquer entrada
+        if time.time() - st.session_state["ultima_leitura"] > TEMPO_SESSAO_OCIOSA:
+            finalizar_sessao_itens()
+            reexecutar_leitura()
+        
+        itens = st.session_state["itens_sessao"]
+        st.markdown("<h3 style='text-align: center;'>Faça a leitura dos códigos de barras</h3>", unsafe_allow_html=True)
+        st.info(f"👤 Usuário autenticado: **{st.session_state['usuario']}** — "
+                "leia todos os itens e, ao terminar, leia o crachá novamente ou clique em Finalizar.")
         codigo_requisicao = st.text_input(
             "Escaneie o código do item (Apenas números, 12 caracteres)", 
             max_chars=12, 
             key=f"codigo_requisicao_{st.session_state['input_key']}"
         )
+        
         if codigo_requisicao:
-            if not codigo_requisicao.isdigit() or len(codigo_requisicao) != 12:
-                st.error("⚠ O código de barras precisa ter exatamente **12 números**!")
-                time.sleep(3)
-                resetar_input()
-                st.rerun()
+            st.session_state["ultima_leitura"] = time.time()
+            resetar_input()
+            if codigo_requisicao == st.session_state["codigo_funcionario"]:
+                # Leitura do próprio crachá encerra a sessão
+                finalizar_sessao_itens()
+            elif not codigo_requisicao.isdigit() or len(codigo_requisicao) != 12:
+                definir_feedback("aviso", "⚠ O código de barras precisa ter exatamente 12 números!")
+            elif not codigo_item_valido(codigo_requisicao):
+                definir_feedback("aviso", "⚠ Código de barras com dígito verificador inválido. Leia o item novamente.")
+            elif codigo_requisicao in itens:
+                definir_feedback("aviso", f"⚠ O item {codigo_requisicao} já foi lido nesta sessão.")
             else:
-                ja_registrado, tempo_passado, data_registro = requisicao_ja_registrada(
-                    st.session_state["codigo_funcionario"], 
-                    codigo_requisicao
-                )
+                ja_registrado, _, data_registro = requisicao_ja_registrada(
+                    st.session_state["codigo_funcionario"], codigo_requisicao)
                 if ja_registrado:
-                    st.error(f"🚫 Você já bipou esse item em {data_registro}.")
-                    exibir_contagem_regressiva()
-                    st.session_state["etapa"] = "login"
-                    resetar_input()
-                    st.rerun()
-                else:
-                    data_hora_atual = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    sucesso = salvar_requisicao(
-                        st.session_state["codigo_funcionario"], 
-                        codigo_requisicao, 
-                        data_hora_atual
+                    definir_feedback(
+                        "erro",
+                        f"🚫 Você já bipou esse item em {data_registro:%Y-%m-%d %H:%M:%S}.",
+                        TEMPO_MENSAGEM_DUPLICADA,
                     )
-                    if sucesso:
-                        st.success(f"✅ Requisição registrada com sucesso!\n🕒 {data_hora_atual}")
-                        time.sleep(3)
-                        resetar_input()
-                        st.session_state["etapa"] = "login"
-                        st.rerun()
-                    else:
-                        st.error("❌ Erro ao registrar requisição. Tente novamente.")
\ No newline at end of file
+                else:
+                    itens.append(codigo_requisicao)
+                    st.session_state.pop("feedback", None)
+            reexecutar_leitura()
+        
+        if itens:
+            st.warning(f"⏳ **{len(itens)} item(ns) pendente(s), ainda não gravado(s).** "
+                       "Leia o crachá ou clique em Finalizar para registrar.")
+            st.markdown("\n".join(f"- {codigo}" for codigo in itens))
+        
+        if st.button("✅ Finalizar", use_container_width=True):
+            finalizar_sessao_itens()
+            reexecutar_leitura()
+        
+        restante = TEMPO_SESSAO_OCIOSA - (time.time() - st.session_state["ultima_leitura"])
+        agendar_finalizacao(max(restante, 0))
+
+# Verificar a página atual e carregar o conteúdo correspondente
+if st.session_state["page"] == "admin":
+    aplicar_recursos()
+    import admin
+    admin.app()
+    st.stop()
+else:
+    # Cabeçalho com título e botão administrador
+    header_col1, header_col2 = st.columns([8, 2])
+    with header_col1:
+        st.markdown("<h1 style='margin: 0;'>📋 SISTEMA DE CONTROLE DE REQUISIÇÃO</h1>", unsafe_allow_html=True)
+    with header_col2:
+        if st.button("🔐 Acesso Administrador"):
+            st.session_state["page"] = "admin"
+            st.rerun()
+
+    tela_leitura()
@@ -0,0 +1,389 @@
+"""
+Módulo de migrações versionadas do banco de dados.
+
+Cada migração tem um número sequencial; a versão aplicada fica registrada em
+PRAGMA user_version, de modo que cada migração roda uma única vez por banco.
+
+Uso pela linha de comando:
+    python migracoes.py              # aplica as migrações pendentes
+    python migracoes.py --status     # mostra a versão atual e as pendentes
+    python migracoes.py --banco outro.db
+    python migracoes.py --reconstruir-resumos   # recalcula os resumos de requisições
+"""
+
+import sqlite3
+
+def _criar_tabelas(conn):
+    """Cria as tabelas base do sistema quando o banco é novo."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS FUNCIONARIOS (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nome TEXT NOT NULL,
+            cpf TEXT UNIQUE NOT NULL,
+            setor TEXT NOT NULL,
+            codigo TEXT UNIQUE NOT NULL
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS REQUISICOES (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            codigo_funcionario TEXT NOT NULL,
+            codigo_requisicao TEXT NOT NULL,
+            data TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            setor TEXT,
+            FOREIGN KEY (codigo_funcionario) REFERENCES FUNCIONARIOS(codigo)
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS ADMINISTRADORES (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            usuario TEXT NOT NULL UNIQUE,
+            senha TEXT NOT NULL
+        )
+    """)
+
+def _criar_indices(conn):
+    """Cria os índices usados na autenticação e nos relatórios."""
+    # Índice para busca rápida de funcionários por código
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_funcionarios_codigo ON FUNCIONARIOS(codigo)")
+
+    # Índice para busca rápida de requisições por código de funcionário
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_requisicoes_codigo ON REQUISICOES(codigo_funcionario)")
+
+    # Índice para busca rápida de requisições por data
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_requisicoes_data ON REQUISICOES(data)")
+
+    # Índice para requisições de um funcionário dentro de um período
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_requisicoes_funcionario_data ON REQUISICOES(codigo_funcionario, data)")
+
+def _requisicoes_unicas(conn):
+    """Remove leituras duplicadas e impede novas por (funcionário, item).
+
+    Mantém a primeira leitura de cada par e cria o índice único usado por
+    database.registrar_requisicao().
+    """
+    conn.execute("""
+        DELETE FROM REQUISICOES
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM REQUISICOES
+            GROUP BY codigo_funcionario, codigo_requisicao
+        )
+    """)
+    conn.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_requisicoes_funcionario_item
+        ON REQUISICOES(codigo_funcionario, codigo_requisicao)
+    """)
+
+def _arquivo_requisicoes(conn):
+    """Cria a tabela de requisições arquivadas na exclusão de funcionários."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS REQUISICOES_ARQUIVO (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            codigo_funcionario TEXT NOT NULL,
+            nome TEXT,
+            setor TEXT,
+            codigo_requisicao TEXT NOT NULL,
+            data TIMESTAMP,
+            data_arquivamento TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+def _data_epoch(conn):
+    """Converte REQUISICOES.data de texto para inteiro (segundos desde a época).
+
+    A tabela é reconstruída com a coluna INTEGER; os textos, gravados em hora
+    local, são convertidos com o modificador 'utc' do SQLite. O índice
+    idx_requisicoes_codigo é descartado por ser prefixo de
+    idx_requisicoes_funcionario_data.
+    """
+    conn.execute("""
+        CREATE TABLE REQUISICOES_NOVA (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            codigo_funcionario TEXT NOT NULL,
+            codigo_requisicao TEXT NOT NULL,
+            data INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+            setor TEXT,
+            FOREIGN KEY (codigo_funcionario) REFERENCES FUNCIONARIOS(codigo)
+        )
+    """)
+    conn.execute("""
+        INSERT INTO REQUISICOES_NOVA (id, codigo_funcionario, codigo_requisicao, data, setor)
+        SELECT id, codigo_funcionario, codigo_requisicao,
+               CASE WHEN typeof(data) = 'text'
+                    THEN CAST(strftime('%s', data, 'utc') AS INTEGER)
+                    ELSE data END,
+               setor
+        FROM REQUISICOES
+    """)
+    conn.execute("DROP TABLE REQUISICOES")
+    conn.execute("ALTER TABLE REQUISICOES_NOVA RENAME TO REQUISICOES")
+    conn.execute("CREATE INDEX idx_requisicoes_data ON REQUISICOES(data)")
+    conn.execute("CREATE INDEX idx_requisicoes_funcionario_data ON REQUISICOES(codigo_funcionario, data)")
+    conn.execute("""
+        CREATE UNIQUE INDEX idx_requisicoes_funcionario_item
+        ON REQUISICOES(codigo_funcionario, codigo_requisicao)
+    """)
+    conn.execute("""
+        UPDATE REQUISICOES_ARQUIVO
+        SET data = CAST(strftime('%s', data, 'utc') AS INTEGER),
+            data_arquivamento = CAST(strftime('%s', data_arquivamento, 'utc') AS INTEGER)
+        WHERE typeof(data) = 'text'
+    """)
+
+def _chaves_inteiras(conn):
+    """Reconstrói REQUISICOES com chaves inteiras, agrupada por funcionário.
+
+    A nova tabela é WITHOUT ROWID com chave primária
+    (funcionario_id, codigo_requisicao): a verificação de duplicidade é uma
+    busca direta na chave e os índices secundários já cobrem todas as
+    colunas. Linhas de funcionários inexistentes ou com código de item não
+    numérico não têm representação inteira e vão para REQUISICOES_ARQUIVO.
+    """
+    conn.execute("""
+        CREATE TABLE REQUISICOES_NOVA (
+            funcionario_id INTEGER NOT NULL REFERENCES FUNCIONARIOS(id),
+            codigo_requisicao INTEGER NOT NULL,
+            data INTEGER NOT NULL,
+            PRIMARY KEY (funcionario_id, codigo_requisicao)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        INSERT INTO REQUISICOES_ARQUIVO
+            (codigo_funcionario, nome, setor, codigo_requisicao, data, data_arquivamento)
+        SELECT r.codigo_funcionario, NULL, NULL, r.codigo_requisicao, r.data,
+               CAST(strftime('%s', 'now') AS INTEGER)
+        FROM REQUISICOES r
+        WHERE r.codigo_requisicao = '' OR r.codigo_requisicao GLOB '*[^0-9]*'
+           OR NOT EXISTS (SELECT 1 FROM FUNCIONARIOS f WHERE f.codigo = r.codigo_funcionario)
+    """)
+    conn.execute("""
+        INSERT OR IGNORE INTO REQUISICOES_NOVA (funcionario_id, codigo_requisicao, data)
+        SELECT f.id, CAST(r.codigo_requisicao AS INTEGER), r.data
+        FROM REQUISICOES r
+        JOIN FUNCIONARIOS f ON f.codigo = r.codigo_funcionario
+        WHERE r.codigo_requisicao <> '' AND r.codigo_requisicao NOT GLOB '*[^0-9]*'
+        ORDER BY r.data
+    """)
+    conn.execute("DROP TABLE REQUISICOES")
+    conn.execute("ALTER TABLE REQUISICOES_NOVA RENAME TO REQUISICOES")
+    conn.execute("CREATE INDEX idx_requisicoes_data ON REQUISICOES(data)")
+    conn.execute("CREATE INDEX idx_requisicoes_funcionario_data ON REQUISICOES(funcionario_id, data)")
+
+def reconstruir_resumos(conn):
+    """Recalcula as tabelas de resumo a partir de REQUISICOES.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com transação aberta.
+    """
+    conn.execute("DELETE FROM REQUISICOES_POR_DIA")
+    conn.execute("DELETE FROM REQUISICOES_POR_HORA")
+    conn.execute("""
+        INSERT INTO REQUISICOES_POR_DIA (dia, funcionario_id, total)
+        SELECT CAST(strftime('%s', date(data, 'unixepoch', 'localtime'), 'utc') AS INTEGER) AS dia,
+               funcionario_id, COUNT(*)
+        FROM REQUISICOES
+        GROUP BY dia, funcionario_id
+    """)
+    conn.execute("""
+        INSERT INTO REQUISICOES_POR_HORA (hora, funcionario_id, total)
+        SELECT data - data % 3600 AS hora, funcionario_id, COUNT(*)
+        FROM REQUISICOES
+        GROUP BY hora, funcionario_id
+    """)
+
+def _tabelas_resumo(conn):
+    """Cria os resumos diário e por hora de requisições por funcionário.
+
+    Os totais são mantidos por gatilhos de inclusão e exclusão em
+    REQUISICOES, de modo que o dashboard e o relatório sintético leem uma
+    linha por funcionário e dia (ou hora) do período, e não o histórico.
+    O dia é a meia-noite local em segundos desde a época, como em
+    database.intervalo_datas(); o setor vem do cadastro atual do
+    funcionário na consulta.
+    """
+    conn.execute("""
+        CREATE TABLE REQUISICOES_POR_DIA (
+            dia INTEGER NOT NULL,
+            funcionario_id INTEGER NOT NULL,
+            total INTEGER NOT NULL,
+            PRIMARY KEY (dia, funcionario_id)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX idx_requisicoes_por_dia_funcionario ON REQUISICOES_POR_DIA(funcionario_id, dia)")
+    conn.execute("""
+        CREATE TABLE REQUISICOES_POR_HORA (
+            hora INTEGER NOT NULL,
+            funcionario_id INTEGER NOT NULL,
+            total INTEGER NOT NULL,
+            PRIMARY KEY (hora, funcionario_id)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE TRIGGER trg_requisicoes_resumo_inclusao AFTER INSERT ON REQUISICOES
+        BEGIN
+            INSERT INTO REQUISICOES_POR_DIA (dia, funcionario_id, total)
+            VALUES (CAST(strftime('%s', date(NEW.data, 'unixepoch', 'localtime'), 'utc') AS INTEGER),
+                    NEW.funcionario_id, 1)
+            ON CONFLICT (dia, funcionario_id) DO UPDATE SET total = total + 1;
+            INSERT INTO REQUISICOES_POR_HORA (hora, funcionario_id, total)
+            VALUES (NEW.data - NEW.data % 3600, NEW.funcionario_id, 1)
+            ON CONFLICT (hora, funcionario_id) DO UPDATE SET total = total + 1;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER trg_requisicoes_resumo_exclusao AFTER DELETE ON REQUISICOES
+        BEGIN
+            UPDATE REQUISICOES_POR_DIA SET total = total - 1
+            WHERE dia = CAST(strftime('%s', date(OLD.data, 'unixepoch', 'localtime'), 'utc') AS INTEGER)
+              AND funcionario_id = OLD.funcionario_id;
+            UPDATE REQUISICOES_POR_HORA SET total = total - 1
+            WHERE hora = OLD.data - OLD.data % 3600 AND funcionario_id = OLD.funcionario_id;
+            DELETE FROM REQUISICOES_POR_DIA WHERE funcionario_id = OLD.funcionario_id AND total <= 0;
+            DELETE FROM REQUISICOES_POR_HORA WHERE hora = OLD.data - OLD.data % 3600
+              AND funcionario_id = OLD.funcionario_id AND total <= 0;
+        END
+    """)
+    reconstruir_resumos(conn)
+
+def _versao_funcionarios(conn):
+    """Cria o contador de alterações de FUNCIONARIOS.
+
+    Gatilhos de inclusão, alteração e exclusão incrementam a versão da
+    tabela em VERSOES_TABELAS; o cache de crachás de database.py compara
+    esse número para saber se outro processo alterou o cadastro, sem
+    reagir às gravações de requisições.
+    """
+    conn.execute("""
+        CREATE TABLE VERSOES_TABELAS (
+            tabela TEXT PRIMARY KEY,
+            versao INTEGER NOT NULL
+        ) WITHOUT ROWID
+    """)
+    conn.execute("INSERT INTO VERSOES_TABELAS (tabela, versao) VALUES ('FUNCIONARIOS', 0)")
+    for evento in ("INSERT", "UPDATE", "DELETE"):
+        conn.execute(f"""
+            CREATE TRIGGER trg_funcionarios_versao_{evento.lower()} AFTER {evento} ON FUNCIONARIOS
+            BEGIN
+                UPDATE VERSOES_TABELAS SET versao = versao + 1 WHERE tabela = 'FUNCIONARIOS';
+            END
+        """)
+
+# Migrações em ordem de aplicação: (versão, descrição, função)
+MIGRACOES = [
+    (1, "Tabelas base", _criar_tabelas),
+    (2, "Índices de funcionários e requisições", _criar_indices),
+    (3, "Requisição única por funcionário e item", _requisicoes_unicas),
+    (4, "Arquivo de requisições", _arquivo_requisicoes),
+    (5, "Datas das requisições em segundos desde a época", _data_epoch),
+    (6, "Chaves inteiras em REQUISICOES", _chaves_inteiras),
+    (7, "Resumos diário e por hora de requisições", _tabelas_resumo),
+    (8, "Contador de alterações de funcionários", _versao_funcionarios),
+]
+
+# Versão do esquema esperada pelo código atual
+VERSAO_ATUAL = MIGRACOES[-1][0]
+
+def versao_banco(conn):
+    """Retorna a versão do esquema registrada no banco.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+
+    Returns:
+        int: Valor de PRAGMA user_version.
+    """
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def migracoes_pendentes(conn):
+    """Lista as migrações ainda não aplicadas.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+
+    Returns:
+        list: Lista de tuplas (versão, descrição, função).
+    """
+    versao = versao_banco(conn)
+    return [migracao for migracao in MIGRACOES if migracao[0] > versao]
+
+def migrar(conn):
+    """Aplica as migrações pendentes, cada uma em sua própria transação.
+
+    Quando o banco já está atualizado, custa apenas a leitura de
+    PRAGMA user_version.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+
+    Returns:
+        tuple: (versão_anterior, versão_atual)
+    """
+    versao_anterior = versao_banco(conn)
+    if versao_anterior >= VERSAO_ATUAL:
+        return versao_anterior, versao_anterior
+
+    for numero, _, funcao in MIGRACOES:
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            # Outro processo pode ter aplicado a migração enquanto esperávamos o lock
+            if versao_banco(conn) >= numero:
+                continue
+            funcao(conn)
+            conn.execute(f"PRAGMA user_version = {numero}")
+
+    return versao_anterior, versao_banco(conn)
+
+def aplicar_migracoes(caminho):
+    """Abre o banco informado e aplica as migrações pendentes.
+
+    Args:
+        caminho (str): Caminho do arquivo do banco de dados.
+
+    Returns:
+        tuple: (versão_anterior, versão_atual)
+    """
+    conn = sqlite3.connect(caminho)
+    try:
+        return migrar(conn)
+    finally:
+        conn.close()
+
+def main(argv=None):
+    """Ponto de entrada da linha de comando."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Migrações do banco de dados do sistema.")
+    parser.add_argument("--banco", default="sistema.db", help="Caminho do banco (padrão: sistema.db)")
+    parser.add_argument("--status", action="store_true", help="Apenas mostra a versão e as migrações pendentes")
+    parser.add_argument("--reconstruir-resumos", action="store_true",
+                        help="Recalcula as tabelas de resumo de requisições após migrar")
+    args = parser.parse_args(argv)
+
+    if args.status:
+        conn = sqlite3.connect(args.banco)
+        try:
+            print(f"Versão do banco: {versao_banco(conn)} (esperada: {VERSAO_ATUAL})")
+            for numero, descricao, _ in migracoes_pendentes(conn):
+                print(f"  pendente {numero}: {descricao}")
+        finally:
+            conn.close()
+        return
+
+    versao_anterior, versao = aplicar_migracoes(args.banco)
+    if versao == versao_anterior:
+        print(f"Banco já está atualizado (versão {versao}).")
+    else:
+        print(f"Banco migrado da versão {versao_anterior} para {versao}.")
+
+    if args.reconstruir_resumos:
+        conn = sqlite3.connect(args.banco)
+        try:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                reconstruir_resumos(conn)
+        finally:
+            conn.close()
+        print("Resumos de requisições reconstruídos.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Módulo de paginação das listagens da interface administrativa.
+Exibe consultas paginadas por chave (keyset), guardando na sessão a chave
+inicial de cada página visitada.
+"""
+
+import streamlit as st
+import pandas as pd
+from database import TAMANHO_PAGINA
+
+def _estado_paginacao(chave, filtros, contar):
+    """Obtém o estado da paginação, reiniciando-o quando os filtros mudam.
+
+    Args:
+        chave (str): Identificador da listagem na sessão.
+        filtros (tuple): Filtros atuais da listagem.
+        contar (callable): Função sem argumentos que retorna o total de
+            registros, ou None para não exibir o total.
+
+    Returns:
+        dict: Estado com as chaves "filtros", "inicios" e "total".
+    """
+    chave_sessao = f"paginacao_{chave}"
+    estado = st.session_state.get(chave_sessao)
+    if estado is None or estado["filtros"] != filtros:
+        # O total é calculado uma vez por combinação de filtros
+        estado = {
+            "filtros": filtros,
+            "inicios": [None],
+            "total": contar() if contar else None,
+        }
+        st.session_state[chave_sessao] = estado
+    return estado
+
+def reiniciar_paginacao(chave):
+    """Volta a listagem para a primeira página e descarta o total guardado.
+
+    Args:
+        chave (str): Identificador da listagem na sessão.
+    """
+    st.session_state.pop(f"paginacao_{chave}", None)
+
+def paginar(chave, buscar_pagina, colunas, filtros=(), contar=None, tamanho_pagina=TAMANHO_PAGINA):
+    """Carrega a página atual de uma listagem e exibe os controles de navegação.
+
+    Args:
+        chave (str): Identificador da listagem na sessão.
+        buscar_pagina (callable): Função (apos, tamanho_pagina) que retorna
+            (linhas, proxima), como database.paginar_requisicoes().
+        colunas (list): Nomes das colunas das linhas retornadas.
+        filtros (tuple, optional): Filtros atuais; ao mudarem, a listagem
+            volta para a primeira página.
+        contar (callable, optional): Função sem argumentos que retorna o total
+            de registros.
+        tamanho_pagina (int, optional): Quantidade de linhas por página.
+
+    Returns:
+        pandas.DataFrame: Linhas da página atual.
+    """
+    estado = _estado_paginacao(chave, filtros, contar)
+    inicios = estado["inicios"]
+    linhas, proxima = buscar_pagina(inicios[-1], tamanho_pagina)
+    pagina = len(inicios)
+
+    col1, col2, col3 = st.columns([1, 3, 1])
+
+    with col1:
+        if st.button("⬅️ Anterior", disabled=pagina <= 1, key=f"{chave}_anterior"):
+            inicios.pop()
+            st.rerun()
+
+    with col2:
+        total = estado["total"]
+        if total is not None:
+            total_paginas = max(1, (total + tamanho_pagina - 1) // tamanho_pagina)
+            st.markdown(f"**Página {pagina} de {total_paginas}** (Total: {total} registros)")
+        else:
+            st.markdown(f"**Página {pagina}**")
+
+    with col3:
+        if st.button("Próxima ➡️", disabled=proxima is None, key=f"{chave}_proxima"):
+            inicios.append(proxima)
+            st.rerun()
+
+    return pd.DataFrame(linhas, columns=colunas)
@@ -0,0 +1,135 @@
+"""
+Módulo de recursos estáticos da interface (CSS e JavaScript).
+
+Os arquivos são lidos uma vez por processo e relidos apenas quando a data de
+modificação muda, verificada no máximo a cada INTERVALO_VERIFICACAO_RECURSOS
+segundos. No navegador, cada recurso é instalado uma única vez por sessão no
+documento principal; as execuções seguintes do script enviam apenas o estado
+da tela.
+"""
+
+import json
+import os
+import threading
+import time
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+# Folha de estilos da aplicação
+ARQUIVO_ESTILO = "style.css"
+
+# Script do terminal de leitura (foco automático e proteção do botão Deploy)
+ARQUIVO_SCRIPT_TERMINAL = "terminal.js"
+
+# Intervalo mínimo (s) entre verificações de alteração dos arquivos
+INTERVALO_VERIFICACAO_RECURSOS = 5.0
+
+class RecursoEstatico:
+    """Conteúdo de um arquivo mantido em memória e relido quando é alterado."""
+
+    def __init__(self, caminho, intervalo=INTERVALO_VERIFICACAO_RECURSOS):
+        self.caminho = caminho
+        self.intervalo = intervalo
+        self._conteudo = ""
+        self._versao = None
+        self._ultima_verificacao = None
+        self._lock = threading.Lock()
+
+    def _carregar(self):
+        try:
+            versao = os.stat(self.caminho).st_mtime_ns
+        except OSError:
+            self._conteudo, self._versao = "", None
+            return
+        if versao != self._versao:
+            with open(self.caminho, encoding="utf-8") as arquivo:
+                self._conteudo = arquivo.read()
+            self._versao = versao
+
+    def ler(self):
+        """Retorna o conteúdo do arquivo e sua versão.
+
+        Returns:
+            tuple: (conteudo, versao); ("", None) se o arquivo não existir.
+        """
+        agora = time.monotonic()
+        if self._ultima_verificacao is None or agora - self._ultima_verificacao >= self.intervalo:
+            with self._lock:
+                self._ultima_verificacao = agora
+                self._carregar()
+        return self._conteudo, self._versao
+
+def _json_script(valor):
+    """Serializa um valor para uso seguro dentro de uma tag <script>."""
+    return json.dumps(valor).replace("</", "<\\/")
+
+_recursos = {}
+_lock = threading.Lock()
+
+def obter_recurso(caminho):
+    """Retorna o RecursoEstatico do arquivo, criando-o no primeiro uso."""
+    recurso = _recursos.get(caminho)
+    if recurso is None:
+        with _lock:
+            recurso = _recursos.setdefault(caminho, RecursoEstatico(caminho))
+    return recurso
+
+def _instalar_estilo(css):
+    return f"""
+    (function() {{
+        const doc = window.parent.document;
+        let estilo = doc.getElementById("sistema-estilo");
+        if (!estilo) {{
+            estilo = doc.createElement("style");
+            estilo.id = "sistema-estilo";
+            doc.head.appendChild(estilo);
+        }}
+        estilo.textContent = {_json_script(css)};
+    }})();
+    """
+
+def _instalar_script(codigo):
+    return f"""
+    (function() {{
+        const doc = window.parent.document;
+        const script = doc.createElement("script");
+        script.textContent = {_json_script(codigo)};
+        doc.head.appendChild(script);
+    }})();
+    """
+
+def aplicar_recursos(estado=None):
+    """Instala o CSS (e o script do terminal) no navegador e envia o estado da tela.
+
+    Os arquivos só trafegam na primeira execução da sessão ou quando mudam no
+    disco; nas demais execuções nada é enviado além do estado.
+
+    Args:
+        estado (dict, optional): Estado repassado a sistemaTerminal.atualizar()
+            no navegador. Se None, o script do terminal não é instalado.
+
+    Returns:
+        bool: True se a folha de estilos existe, False caso contrário.
+    """
+    instalados = st.session_state.setdefault("recursos_instalados", {})
+    trechos = []
+
+    css, versao_css = obter_recurso(ARQUIVO_ESTILO).ler()
+    if versao_css is not None and instalados.get(ARQUIVO_ESTILO) != versao_css:
+        trechos.append(_instalar_estilo(css))
+        instalados[ARQUIVO_ESTILO] = versao_css
+
+    if estado is not None:
+        codigo, versao_js = obter_recurso(ARQUIVO_SCRIPT_TERMINAL).ler()
+        if versao_js is not None and instalados.get(ARQUIVO_SCRIPT_TERMINAL) is None:
+            # O script se instala uma única vez por página; uma nova versão vale após recarregar
+            trechos.append(_instalar_script(codigo))
+            instalados[ARQUIVO_SCRIPT_TERMINAL] = versao_js
+        trechos.append(
+            f"window.parent.sistemaTerminal && window.parent.sistemaTerminal.atualizar({_json_script(estado)});"
+        )
+
+    if trechos:
+        components.html("<script>" + "".join(trechos) + "</script>", height=0)
+    return versao_css is not None
@@ -7,19 +7,20 @@ Agora com exportação para PDF.
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-import sqlite3
 import tempfile
-from fpdf import FPDF
 import base64
+from database import (
+    COLUNAS_RELATORIO,
+    TAMANHO_LOTE,
+    iterar_relatorio,
+    listar_setores,
+    paginar_requisicoes,
+    resumir_requisicoes
+)
+from instrumentacao import instrumentar
+from paginacao import paginar
 
-def conectar_banco():
-    """Conecta ao banco de dados SQLite.
-    
-    Returns:
-        sqlite3.Connection: Conexão com o banco de dados.
-    """
-    return sqlite3.connect("sistema.db")
-
+@instrumentar
 def carregar_requisicoes(data_inicio, data_fim, setor=None, tipo_relatorio="analitico"):
     """Carrega requisições com base nos filtros informados.
     
@@ -32,71 +33,32 @@ def carregar_requisicoes(data_inicio, data_fim, setor=None, tipo_relatorio="anal
     Returns:
         pandas.DataFrame: DataFrame com as requisições encontradas.
     """
-    conn = conectar_banco()
-    
-    if tipo_relatorio == "analitico":
-        # Relatório analítico - mostra todas as requisições detalhadas
-        if setor:
-            query = """
-                SELECT f.nome, f.codigo AS codigo_funcionario, f.setor, 
-                       r.codigo_requisicao, r.data
-                FROM REQUISICOES r
-                JOIN FUNCIONARIOS f ON r.codigo_funcionario = f.codigo
-                WHERE f.setor = ? AND date(r.data) BETWEEN date(?) AND date(?)
-                ORDER BY f.nome, r.data DESC
-            """
-            df = pd.read_sql(query, conn, params=(setor, data_inicio, data_fim))
-        else:
-            query = """
-                SELECT f.nome, f.codigo AS codigo_funcionario, f.setor, 
-                       r.codigo_requisicao, r.data
-                FROM REQUISICOES r
-                JOIN FUNCIONARIOS f ON r.codigo_funcionario = f.codigo
-                WHERE date(r.data) BETWEEN date(?) AND date(?)
-                ORDER BY f.nome, r.data DESC
-            """
-            df = pd.read_sql(query, conn, params=(data_inicio, data_fim))
-    else:
-        # Relatório sintético - agrupa por funcionário e conta requisições
-        if setor:
-            query = """
-                SELECT f.nome, f.codigo AS codigo_funcionario, f.setor, 
-                       COUNT(r.codigo_requisicao) AS total_requisicoes
-                FROM FUNCIONARIOS f
-                LEFT JOIN REQUISICOES r ON f.codigo = r.codigo_funcionario
-                    AND date(r.data) BETWEEN date(?) AND date(?)
-                WHERE f.setor = ?
-                GROUP BY f.nome, f.codigo, f.setor
-                ORDER BY f.nome
-            """
-            df = pd.read_sql(query, conn, params=(data_inicio, data_fim, setor))
-        else:
-            query = """
-                SELECT f.nome, f.codigo AS codigo_funcionario, f.setor, 
-                       COUNT(r.codigo_requisicao) AS total_requisicoes
-                FROM FUNCIONARIOS f
-                LEFT JOIN REQUISICOES r ON f.codigo = r.codigo_funcionario
-                    AND date(r.data) BETWEEN date(?) AND date(?)
-                GROUP BY f.nome, f.codigo, f.setor
-                ORDER BY f.nome
-            """
-            df = pd.read_sql(query, conn, params=(data_inicio, data_fim))
-            
-    conn.close()
-    return df
+    linhas = [linha for lote in iterar_relatorio(data_inicio, data_fim, setor, tipo_relatorio) for linha in lote]
+    return pd.DataFrame(linhas, columns=COLUNAS_RELATORIO[tipo_relatorio])
 
-def obter_setores():
-    """Obtém a lista de setores disponíveis no sistema.
+@instrumentar
+def iterar_requisicoes(data_inicio, data_fim, setor=None, tipo_relatorio="analitico", tamanho_lote=TAMANHO_LOTE):
+    """Percorre o relatório em lotes, mantendo o uso de memória constante.
     
-    Returns:
-        list: Lista de setores cadastrados.
+    Args:
+        data_inicio (str): Data inicial no formato YYYY-MM-DD.
+        data_fim (str): Data final no formato YYYY-MM-DD.
+        setor (str, optional): Setor para filtrar ou None para todos.
+        tipo_relatorio (str, optional): "analitico" ou "sintetico".
+        tamanho_lote (int, optional): Quantidade de linhas por lote.
+        
+    Yields:
+        pandas.DataFrame: Lotes de até `tamanho_lote` linhas.
     """
-    conn = conectar_banco()
-    cursor = conn.cursor()
-    cursor.execute("SELECT DISTINCT setor FROM FUNCIONARIOS ORDER BY setor")
-    setores = [row[0] for row in cursor.fetchall()]
-    conn.close()
-    return setores
+    for lote in iterar_relatorio(data_inicio, data_fim, setor, tipo_relatorio, tamanho_lote):
+        yield pd.DataFrame(lote, columns=COLUNAS_RELATORIO[tipo_relatorio])
+
+def _iterar_linhas(dados):
+    """Percorre as linhas de um DataFrame ou de um iterável de lotes (DataFrames)."""
+    if isinstance(dados, pd.DataFrame):
+        dados = [dados]
+    for lote in dados:
+        yield from lote.itertuples(index=False)
 
 def create_download_link(val, filename):
     """Cria um link para download de um arquivo.
@@ -125,6 +87,8 @@ def gerar_pdf_sintetico(df, data_inicio, data_fim, setor_filtro, total_funcionar
     Returns:
         bytes: Arquivo PDF em bytes
     """
+    from fpdf import FPDF
+
     pdf = FPDF()
     pdf.add_page()
     
@@ -169,11 +133,12 @@ def gerar_pdf_sintetico(df, data_inicio, data_fim, setor_filtro, total_funcionar
     
     return pdf.output(dest="S").encode("latin1")
 
-def gerar_pdf_analitico(df, data_inicio, data_fim, setor_filtro, total_funcionarios, total_requisicoes):
+def gerar_pdf_analitico(dados, data_inicio, data_fim, setor_filtro, total_funcionarios, total_requisicoes):
     """Gera um PDF para o relatório analítico.
     
     Args:
-        df (pandas.DataFrame): DataFrame com os dados
+        dados (pandas.DataFrame | iterable): DataFrame com os dados ou
+            iterável de lotes, como o retornado por iterar_requisicoes()
         data_inicio (str): Data inicial
         data_fim (str): Data final
         setor_filtro (str): Setor selecionado ou None
@@ -183,6 +148,8 @@ def gerar_pdf_analitico(df, data_inicio, data_fim, setor_filtro, total_funcionar
     Returns:
         bytes: Arquivo PDF em bytes
     """
+    from fpdf import FPDF
+
     pdf = FPDF()
     pdf.add_page()
     
@@ -215,13 +182,13 @@ def gerar_pdf_analitico(df, data_inicio, data_fim, setor_filtro, total_funcionar
     
     # Conteúdo da tabela
     pdf.set_font("Arial", "", 8)
-    for _, row in df.iterrows():
+    for row in _iterar_linhas(dados):
         # Quebrar células se necessário para caber no PDF
-        pdf.cell(50, 10, str(row["nome"])[:25], 1, 0, "L")
-        pdf.cell(30, 10, str(row["codigo_funcionario"]), 1, 0, "C")
-        pdf.cell(30, 10, str(row["setor"])[:13], 1, 0, "L")
-        pdf.cell(35, 10, str(row["codigo_requisicao"]), 1, 0, "C")
-        data_formatada = datetime.strptime(str(row["data"]), "%Y-%m-%d %H:%M:%S").strftime("%d/%m/%Y %H:%M")
+        pdf.cell(50, 10, str(row.nome)[:25], 1, 0, "L")
+        pdf.cell(30, 10, str(row.codigo_funcionario), 1, 0, "C")
+        pdf.cell(30, 10, str(row.setor)[:13], 1, 0, "L")
+        pdf.cell(35, 10, str(row.codigo_requisicao), 1, 0, "C")
+        data_formatada = row.data.strftime("%d/%m/%Y %H:%M")
         pdf.cell(45, 10, data_formatada, 1, 1, "C")
         
         # Verificar se precisa adicionar uma nova página
@@ -244,6 +211,11 @@ def gerar_pdf_analitico(df, data_inicio, data_fim, setor_filtro, total_funcionar
     
     return pdf.output(dest="S").encode("latin1")
 
+def exibir_sem_resultados(setor_filtro, setor_selecionado):
+    """Exibe a mensagem de relatório sem requisições no período."""
+    setor_msg = f" no setor {setor_selecionado}" if setor_filtro else ""
+    st.info(f"📌 Nenhuma requisição encontrada{setor_msg} no período selecionado.")
+
 def app():
     """Função principal do módulo de relatórios."""
     st.markdown("<h1 style='text-align:center;'>📑 Relatório de Requisições</h1>", unsafe_allow_html=True)
@@ -256,7 +228,7 @@ def app():
     )
     
     # Seleção do setor
-    setores = obter_setores()
+    setores = listar_setores()
     opcoes_setor = ["Todos os Setores"] + setores
     setor_selecionado = st.selectbox("Selecione o Setor:", opcoes_setor)
     
@@ -277,74 +249,86 @@ def app():
     tipo_consulta = "sintetico" if tipo_relatorio == "Relatório Sintético" else "analitico"
     setor_filtro = None if setor_selecionado == "Todos os Setores" else setor_selecionado
     
-    # Carregar dados
-    df = carregar_requisicoes(data_inicio, data_fim, setor_filtro, tipo_consulta)
-    
     # Exibir resultados
-    if not df.empty:
-        if tipo_consulta == "sintetico":
-            # Mostrar totais para relatório sintético
-            total_funcionarios = len(df)
-            total_requisicoes = df["total_requisicoes"].sum()
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                st.info(f"📊 Total de funcionários: {total_funcionarios}")
-            with col2:
-                st.success(f"✅ Total de requisições no período: {total_requisicoes}")
-                
-            # Renomear colunas para melhor apresentação
-            df_display = df.rename(columns={
-                "nome": "Nome",
-                "codigo_funcionario": "Código do Crachá",
-                "setor": "Setor",
-                "total_requisicoes": "Total de Requisições"
-            })
-            
-            # Botão para gerar PDF do relatório sintético
-            if st.button("🖨️ Gerar Relatório em PDF"):
-                pdf = gerar_pdf_sintetico(df, data_inicio, data_fim, setor_filtro, 
-                                         total_funcionarios, total_requisicoes)
-                
-                # Criação do link para download
-                html = create_download_link(pdf, f"relatorio_sintetico_{data_inicio}_a_{data_fim}.pdf")
-                st.markdown(html, unsafe_allow_html=True)
-            
-        else:  # tipo_consulta == "analitico"
-            # Mostrar totais para relatório analítico
-            total_requisicoes = len(df)
-            total_funcionarios = df["codigo_funcionario"].nunique()
+    if tipo_consulta == "sintetico":
+        # Relatório sintético tem uma linha por funcionário
+        df = carregar_requisicoes(data_inicio, data_fim, setor_filtro, tipo_consulta)
+        if df.empty:
+            exibir_sem_resultados(setor_filtro, setor_selecionado)
+            return
+        
+        # Mostrar totais para relatório sintético
+        total_funcionarios = len(df)
+        total_requisicoes = df["total_requisicoes"].sum()
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.info(f"📊 Total de funcionários: {total_funcionarios}")
+        with col2:
+            st.success(f"✅ Total de requisições no período: {total_requisicoes}")
             
-            col1, col2 = st.columns(2)
-            with col1:
-                st.info(f"👥 Funcionários envolvidos: {total_funcionarios}")
-            with col2:
-                st.success(f"✅ Total de requisições no período: {total_requisicoes}")
-                
-            # Renomear colunas para melhor apresentação
-            df_display = df.rename(columns={
-                "nome": "Nome",
-                "codigo_funcionario": "Código do Crachá",
-                "setor": "Setor",
-                "codigo_requisicao": "Código da Requisição",
-                "data": "Data e Hora"
-            })
+        # Renomear colunas para melhor apresentação
+        df_display = df.rename(columns={
+            "nome": "Nome",
+            "codigo_funcionario": "Código do Crachá",
+            "setor": "Setor",
+            "total_requisicoes": "Total de Requisições"
+        })
+        
+        # Botão para gerar PDF do relatório sintético
+        if st.button("🖨️ Gerar Relatório em PDF"):
+            pdf = gerar_pdf_sintetico(df, data_inicio, data_fim, setor_filtro, 
+                                     total_funcionarios, total_requisicoes)
             
-            # Botão para gerar PDF do relatório analítico
-            if st.button("🖨️ Gerar Relatório em PDF"):
-                pdf = gerar_pdf_analitico(df, data_inicio, data_fim, setor_filtro, 
-                                         total_funcionarios, total_requisicoes)
-                
-                # Criação do link para download
-                html = create_download_link(pdf, f"relatorio_analitico_{data_inicio}_a_{data_fim}.pdf")
-                st.markdown(html, unsafe_allow_html=True)
+            # Criação do link para download
+            html = create_download_link(pdf, f"relatorio_sintetico_{data_inicio}_a_{data_fim}.pdf")
+            st.markdown(html, unsafe_allow_html=True)
         
         # Exibir o dataframe formatado
         st.dataframe(df_display, use_container_width=True)
         
-    else:
-        setor_msg = f" no setor {setor_selecionado}" if setor_filtro else ""
-        st.info(f"📌 Nenhuma requisição encontrada{setor_msg} no período selecionado.")
+    else:  # tipo_consulta == "analitico"
+        # Totais calculados no banco; as linhas são lidas em lotes
+        total_requisicoes, total_funcionarios = resumir_requisicoes(data_inicio, data_fim, setor_filtro)
+        if not total_requisicoes:
+            exibir_sem_resultados(setor_filtro, setor_selecionado)
+            return
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.info(f"👥 Funcionários envolvidos: {total_funcionarios}")
+        with col2:
+            st.success(f"✅ Total de requisições no período: {total_requisicoes}")
+        
+        # Botão para gerar PDF do relatório analítico
+        if st.button("🖨️ Gerar Relatório em PDF"):
+            lotes = iterar_requisicoes(data_inicio, data_fim, setor_filtro, tipo_consulta)
+            pdf = gerar_pdf_analitico(lotes, data_inicio, data_fim, setor_filtro, 
+                                     total_funcionarios, total_requisicoes)
+            
+            # Criação do link para download
+            html = create_download_link(pdf, f"relatorio_analitico_{data_inicio}_a_{data_fim}.pdf")
+            st.markdown(html, unsafe_allow_html=True)
+        
+        # Exibir na tela uma página por vez, da requisição mais recente para a mais antiga
+        df = paginar(
+            "relatorio_analitico",
+            lambda apos, tamanho: paginar_requisicoes(data_inicio, data_fim, setor=setor_filtro,
+                                                      apos=apos, tamanho_pagina=tamanho),
+            COLUNAS_RELATORIO["analitico"],
+            filtros=(data_inicio, data_fim, setor_filtro),
+            contar=lambda: total_requisicoes,
+        )
+        
+        # Renomear colunas para melhor apresentação
+        df_display = df.rename(columns={
+            "nome": "Nome",
+            "codigo_funcionario": "Código do Crachá",
+            "setor": "Setor",
+            "codigo_requisicao": "Código da Requisição",
+            "data": "Data e Hora"
+        })
+        st.dataframe(df_display, use_container_width=True)
 
 # Garantia que o script seja executado corretamente
 if __name__ == "__main__":
@@ -6,6 +6,8 @@ import os
 import sys
 import importlib.util
 import streamlit.web.bootstrap
+import migracoes
+import aquecimento
 
 # Configura o ambiente
 def configurar_ambiente():
@@ -59,15 +61,35 @@ font = "sans serif"
         print(f"Aviso: Arquivo de estilo não encontrado em {arquivo_estilo}")
     
     # Verificar se o banco de dados existe
-    arquivo_db = os.path.join(diretorio_base, "sistema.db")
+    arquivo_db = caminho_banco(diretorio_base)
     if not os.path.exists(arquivo_db):
         print(f"Aviso: Banco de dados não encontrado em {arquivo_db}")
     
     return diretorio_base
 
+def caminho_banco(diretorio_base):
+    """Retorna o arquivo do banco: SISTEMA_DB, se definida, ou sistema.db no diretório base."""
+    return os.environ.get("SISTEMA_DB") or os.path.join(diretorio_base, "sistema.db")
+
+def preparar_banco(diretorio_base):
+    """Aplica as migrações pendentes do banco antes de iniciar a aplicação."""
+    arquivo_db = caminho_banco(diretorio_base)
+    if arquivo_db == ":memory:":
+        return
+    versao_anterior, versao = migracoes.aplicar_migracoes(arquivo_db)
+    if versao != versao_anterior:
+        print(f"Banco de dados migrado da versão {versao_anterior} para {versao}.")
+
 def executar_aplicacao():
     """Executa a aplicação Streamlit."""
     diretorio_base = configurar_ambiente()
+    preparar_banco(diretorio_base)
+    
+    # Aquecer banco e cache de crachás antes de aceitar conexões; a sonda
+    # de prontidão (GET /pronto) acompanha também as etapas em segundo plano
+    aquecimento.iniciar_sonda()
+    aquecimento.aquecer()
+    print(f"Sonda de prontidão em http://127.0.0.1:{aquecimento.PORTA_SONDA}/pronto")
     
     # Definir o script principal
     script_principal = os.path.join(diretorio_base, "main.py")
@@ -0,0 +1,250 @@
+"""
+Serviço HTTP de leitura de crachás e itens, independente do Streamlit.
+
+Recebe as leituras dos terminais (leitores de código de barras ou
+integrações) e aplica a mesma lógica do terminal: autenticação pelo cache
+de crachás e registro com verificação de duplicidade. Cada leitura custa
+uma consulta, sem reexecutar scripts nem trafegar a interface.
+
+Endpoints:
+    POST /cracha        {"codigo": "..."}
+    POST /requisicao    {"codigo_funcionario": "...", "codigo_requisicao": "..."}
+    POST /requisicoes   {"codigo_funcionario": "...", "codigos_requisicao": ["...", ...]}
+    GET  /status        página de status (HTML); /status.json para JSON
+
+As leituras avulsas (/requisicao) são gravadas em lote por padrão
+(database.ativar_gravacao_em_lote): leituras simultâneas de vários terminais
+compartilham um mesmo commit, e cada resposta só é enviada após o commit.
+O gravador não espera o lote encher, então uma leitura isolada é gravada
+tão rápido quanto na gravação imediata.
+
+Uso:
+    python servico_leitura.py --porta 8502
+    python servico_leitura.py --gravacao-imediata   # um commit por leitura
+
+O banco usado é o de database.CAMINHO_BANCO (variável de ambiente SISTEMA_DB).
+"""
+
+import argparse
+import html
+import json
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import instrumentacao
+import migracoes
+from database import (
+    CAMINHO_BANCO,
+    ativar_gravacao_em_lote,
+    autenticar_funcionario,
+    codigo_item_valido,
+    desativar_gravacao_em_lote,
+    obter_cache_crachas,
+    registrar_requisicao,
+    registrar_requisicoes
+)
+
+# Porta padrão do serviço (a interface Streamlit usa a 8501)
+PORTA_PADRAO = 8502
+
+# Tamanho máximo (bytes) aceito no corpo de uma requisição
+TAMANHO_MAXIMO_CORPO = 64 * 1024
+
+def _data_json(valor):
+    """Formata uma data para as respostas JSON."""
+    return f"{valor:%Y-%m-%d %H:%M:%S}" if valor else None
+
+def ler_cracha(dados):
+    """Autentica um crachá.
+
+    Args:
+        dados (dict): Corpo com a chave "codigo".
+
+    Returns:
+        tuple: (status_http, resposta)
+    """
+    codigo = str(dados.get("codigo", "")).strip()
+    nome = autenticar_funcionario(codigo) if codigo else None
+    if not nome:
+        return 404, {"ok": False, "erro": "Crachá não cadastrado"}
+    return 200, {"ok": True, "nome": nome}
+
+def ler_requisicao(dados):
+    """Registra a leitura de um item.
+
+    Args:
+        dados (dict): Corpo com "codigo_funcionario" e "codigo_requisicao".
+
+    Returns:
+        tuple: (status_http, resposta)
+    """
+    codigo_funcionario = str(dados.get("codigo_funcionario", "")).strip()
+    codigo_requisicao = str(dados.get("codigo_requisicao", "")).strip()
+    if not codigo_requisicao.isdigit() or len(codigo_requisicao) != 12:
+        return 400, {"ok": False, "erro": "O código de barras precisa ter exatamente 12 números"}
+    if not codigo_item_valido(codigo_requisicao):
+        return 400, {"ok": False, "erro": "Código de barras com dígito verificador inválido"}
+
+    registrado, data_registro = registrar_requisicao(
+        codigo_funcionario, codigo_requisicao, datetime.now().replace(microsecond=0))
+    if registrado:
+        return 200, {"ok": True, "registrado": True, "data": _data_json(data_registro)}
+    if registrado is None:
+        return 202, {"ok": False, "registrado": None, "pendente": True,
+                     "erro": "Gravação ainda não confirmada; consulte o item antes de lê-lo novamente"}
+    if data_registro:
+        return 409, {"ok": False, "registrado": False, "data": _data_json(data_registro),
+                     "erro": "Item já registrado"}
+    return 422, {"ok": False, "registrado": False, "erro": "Erro ao registrar requisição"}
+
+def ler_requisicoes(dados):
+    """Registra os itens de uma sessão de leitura em uma única transação.
+
+    Args:
+        dados (dict): Corpo com "codigo_funcionario" e "codigos_requisicao".
+
+    Returns:
+        tuple: (status_http, resposta)
+    """
+    codigo_funcionario = str(dados.get("codigo_funcionario", "")).strip()
+    codigos = [str(codigo).strip() for codigo in dados.get("codigos_requisicao", [])]
+    invalidos = [codigo for codigo in codigos if not codigo_item_valido(codigo)]
+    if not codigos or invalidos:
+        return 400, {"ok": False, "erro": "Códigos inválidos", "invalidos": invalidos}
+
+    resultado = registrar_requisicoes(codigo_funcionario, codigos, datetime.now().replace(microsecond=0))
+    itens = {
+        codigo: {"registrado": registrado, "data": _data_json(data_registro)}
+        for codigo, (registrado, data_registro) in resultado.items()
+    }
+    return 200, {"ok": all(item["registrado"] for item in itens.values()), "itens": itens}
+
+# Rotas POST: caminho -> função que recebe o corpo JSON e retorna (status, resposta)
+ROTAS = {
+    "/cracha": ler_cracha,
+    "/requisicao": ler_requisicao,
+    "/requisicoes": ler_requisicoes,
+}
+
+class LeituraHandler(BaseHTTPRequestHandler):
+    """Atende as leituras dos terminais com conexões persistentes (HTTP/1.1)."""
+
+    protocol_version = "HTTP/1.1"
+    # Sem o TCP_NODELAY o cabeçalho e o corpo da resposta esperam o ACK atrasado (~40 ms)
+    disable_nagle_algorithm = True
+    inicio_servico = time.time()
+
+    def log_message(self, formato, *args):
+        # O registro por requisição custaria mais que a própria leitura
+        pass
+
+    def _responder(self, status, corpo, tipo="application/json; charset=utf-8"):
+        conteudo = corpo.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(conteudo)))
+        self.end_headers()
+        self.wfile.write(conteudo)
+
+    def _responder_json(self, status, resposta):
+        self._responder(status, json.dumps(resposta, ensure_ascii=False))
+
+    def do_POST(self):
+        rota = ROTAS.get(self.path)
+        tamanho = int(self.headers.get("Content-Length") or 0)
+        if rota is None:
+            self.rfile.read(tamanho)
+            self._responder_json(404, {"ok": False, "erro": "Rota não encontrada"})
+            return
+        if tamanho > TAMANHO_MAXIMO_CORPO:
+            self.close_connection = True
+            self._responder_json(413, {"ok": False, "erro": "Corpo muito grande"})
+            return
+
+        inicio = time.perf_counter()
+        try:
+            dados = json.loads(self.rfile.read(tamanho) or b"{}")
+            if not isinstance(dados, dict):
+                raise ValueError("O corpo deve ser um objeto JSON")
+            status, resposta = rota(dados)
+        except ValueError as e:
+            status, resposta = 400, {"ok": False, "erro": str(e)}
+        except Exception as e:
+            status, resposta = 500, {"ok": False, "erro": f"Erro interno: {e}"}
+        instrumentacao.registrar_chamada(f"servico_leitura{self.path}", (time.perf_counter() - inicio) * 1000)
+        self._responder_json(status, resposta)
+
+    def do_GET(self):
+        if self.path == "/status.json":
+            self._responder_json(200, self._status())
+        elif self.path in ("/", "/status"):
+            self._responder(200, self._pagina_status(), "text/html; charset=utf-8")
+        else:
+            self._responder_json(404, {"ok": False, "erro": "Rota não encontrada"})
+
+    def _status(self):
+        return {
+            "ok": True,
+            "em_execucao_desde": _data_json(datetime.fromtimestamp(self.inicio_servico).replace(microsecond=0)),
+            "funcoes": instrumentacao.estatisticas(),
+        }
+
+    def _pagina_status(self):
+        status = self._status()
+        colunas = ["funcao", "chamadas", "media_ms", "p95_ms", "maximo_ms"]
+        linhas = "".join(
+            "<tr>" + "".join(f"<td>{html.escape(str(item[coluna]))}</td>" for coluna in colunas) + "</tr>"
+            for item in status["funcoes"]
+        )
+        return f"""<!DOCTYPE html>
+<html lang="pt-br"><head><meta charset="utf-8"><meta http-equiv="refresh" content="5">
+<title>Serviço de Leitura</title>
+<style>body{{font-family:sans-serif;margin:2em}}td,th{{border:1px solid #ccc;padding:4px 8px}}
+table{{border-collapse:collapse}}</style></head>
+<body><h1>📋 Serviço de Leitura</h1>
+<p>Em execução desde {status["em_execucao_desde"]}</p>
+<table><tr>{"".join(f"<th>{coluna}</th>" for coluna in colunas)}</tr>{linhas}</table>
+</body></html>"""
+
+def criar_servidor(host="0.0.0.0", porta=PORTA_PADRAO):
+    """Cria o servidor HTTP do serviço de leitura, com o cache de crachás carregado.
+
+    Args:
+        host (str, optional): Endereço de escuta.
+        porta (int, optional): Porta de escuta.
+
+    Returns:
+        ThreadingHTTPServer: Servidor pronto para serve_forever().
+    """
+    obter_cache_crachas().carregar()
+    servidor = ThreadingHTTPServer((host, porta), LeituraHandler)
+    servidor.daemon_threads = True
+    return servidor
+
+def main(argv=None):
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Serviço HTTP de leitura de crachás e itens.")
+    parser.add_argument("--host", default="0.0.0.0", help="Endereço de escuta (padrão: 0.0.0.0)")
+    parser.add_argument("--porta", type=int, default=PORTA_PADRAO, help=f"Porta (padrão: {PORTA_PADRAO})")
+    parser.add_argument("--gravacao-imediata", action="store_true",
+                        help="Grava cada leitura em sua própria transação, sem a gravação em lote")
+    args = parser.parse_args(argv)
+
+    if CAMINHO_BANCO != ":memory:":
+        migracoes.aplicar_migracoes(CAMINHO_BANCO)
+    servidor = criar_servidor(args.host, args.porta)
+    if not args.gravacao_imediata:
+        ativar_gravacao_em_lote()
+    print(f"Serviço de leitura em http://{args.host}:{args.porta} (status em /status)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        # Grava as leituras que ainda estiverem na fila
+        desativar_gravacao_em_lote()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Medição do tempo de importação do caminho do terminal (python -X importtime).
+
+Importa, em um processo novo, os módulos de que main.py precisa para o
+terminal de leitura e falha se a mediana do tempo ultrapassar o limite ou se
+alguma biblioteca das telas administrativas for carregada. O streamlit é
+importado antes da medição, pois já está carregado quando o servidor executa
+main.py.
+
+Uso:
+    python tempo_importacao.py
+    python tempo_importacao.py --limite 150 --repeticoes 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Módulos importados por main.py no caminho do terminal
+MODULOS_TERMINAL = ("recursos", "database")
+
+# Módulos que o terminal nunca deve carregar
+MODULOS_PESADOS = ("pandas", "fpdf", "PIL", "barcode", "bcrypt", "admin")
+
+# Módulos já carregados pelo servidor antes de executar main.py
+MODULOS_PRE_CARREGADOS = ("streamlit", "streamlit.components.v1")
+
+# Tempo máximo (ms) de importação dos módulos do terminal
+LIMITE_IMPORTACAO_MS = 150
+
+# Marca gravada no stderr entre os módulos pré-carregados e os medidos
+MARCA_MEDICAO = "--- inicio da medicao ---"
+
+def medir_importacao(modulos=MODULOS_TERMINAL, pre_carregados=MODULOS_PRE_CARREGADOS):
+    """Importa os módulos em um processo novo e mede o tempo com -X importtime.
+
+    Args:
+        modulos (tuple): Módulos medidos, na ordem de importação.
+        pre_carregados (tuple): Módulos importados antes da medição; os
+            ausentes são ignorados.
+
+    Returns:
+        tuple: (total_ms, tempos) onde tempos é uma lista de
+            (modulo, acumulado_ms, nivel) de todos os módulos carregados na medição.
+
+    Raises:
+        RuntimeError: Se a importação falhar no processo filho.
+    """
+    codigo = "\n".join([
+        "import importlib, sys",
+        f"for nome in {tuple(pre_carregados)!r}:",
+        "    try:",
+        "        importlib.import_module(nome)",
+        "    except ImportError:",
+        "        pass",
+        f"sys.stderr.write({MARCA_MEDICAO!r} + '\\n')",
+        *(f"import {modulo}" for modulo in modulos),
+    ])
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+    )
+    if processo.returncode != 0:
+        raise RuntimeError(processo.stderr.strip().splitlines()[-1])
+
+    linhas = processo.stderr.split(MARCA_MEDICAO, 1)[1].splitlines()
+    tempos = []
+    for linha in linhas:
+        if not linha.startswith("import time:") or "cumulative" in linha:
+            continue
+        _, acumulado, nome = linha[len("import time:"):].split("|")
+        nivel = (len(nome) - len(nome.lstrip()) - 1) // 2
+        tempos.append((nome.strip(), int(acumulado) / 1000, nivel))
+    total_ms = sum(acumulado for _, acumulado, nivel in tempos if nivel == 0)
+    return total_ms, tempos
+
+def main(argv=None):
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Mede o tempo de importação do caminho do terminal.")
+    parser.add_argument("--limite", type=float, default=LIMITE_IMPORTACAO_MS,
+                        help=f"Tempo máximo em ms (padrão: {LIMITE_IMPORTACAO_MS})")
+    parser.add_argument("--repeticoes", type=int, default=5, help="Quantidade de medições (padrão: 5)")
+    parser.add_argument("--modulos", nargs="+", default=list(MODULOS_TERMINAL),
+                        help=f"Módulos medidos (padrão: {' '.join(MODULOS_TERMINAL)})")
+    args = parser.parse_args(argv)
+
+    try:
+        medicoes = [medir_importacao(args.modulos) for _ in range(args.repeticoes)]
+    except RuntimeError as e:
+        print(f"Erro ao importar os módulos: {e}")
+        return 2
+
+    totais = sorted(total for total, _ in medicoes)
+    mediana = statistics.median(totais)
+    tempos = min(medicoes, key=lambda medicao: medicao[0])[1]
+
+    print(f"Importação de {', '.join(args.modulos)}: mediana {mediana:.1f} ms "
+          f"(mín. {totais[0]:.1f} ms, máx. {totais[-1]:.1f} ms, {args.repeticoes} medições)")
+    print("Módulos mais lentos (acumulado):")
+    for nome, acumulado, nivel in sorted(tempos, key=lambda item: item[1], reverse=True)[:10]:
+        print(f"  {acumulado:8.1f} ms  {'  ' * nivel}{nome}")
+
+    carregados = {nome for _, tempos_medicao in medicoes for nome, _, _ in tempos_medicao}
+    pesados = sorted(nome for nome in carregados if nome.split(".")[0] in MODULOS_PESADOS)
+    falhou = False
+    if pesados:
+        print(f"FALHA: o terminal carregou módulos das telas administrativas: {', '.join(pesados)}")
+        falhou = True
+    if mediana > args.limite:
+        print(f"FALHA: {mediana:.1f} ms acima do limite de {args.limite:.0f} ms")
+        falhou = True
+    if not falhou:
+        print(f"OK: dentro do limite de {args.limite:.0f} ms")
+    return 1 if falhou else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+// Script do terminal de leitura.
+// Instalado uma única vez por sessão no documento principal (recursos.py);
+// a cada execução do Streamlit só o estado da tela é repassado para
+// sistemaTerminal.atualizar().
+//
+// As leituras são validadas no navegador antes de chegarem ao servidor:
+// códigos de item incompletos ou com dígito verificador (UPC-A) inválido e
+// leituras repetidas em sequência são descartadas sem reexecutar o script.
+(function() {
+    if (window.sistemaTerminal) {
+        return;
+    }
+
+    // Campo a ser focado em cada etapa da tela
+    const CAMPOS = {
+        login: 'input[aria-label="Escaneie seu Crachá"]',
+        requisicao: 'input[aria-label="Escaneie o código do item (Apenas números, 12 caracteres)"]'
+    };
+
+    const MAX_DELAY = 100;  // ms entre teclas de uma mesma leitura
+    const JANELA_REPETICAO_MS = 1500;  // leituras iguais dentro da janela são descartadas
+    const TEMPO_AVISO_MS = 3000;  // tempo de exibição do aviso de leitura inválida
+    const DIGITOS_CODIGO_ITEM = 12;
+
+    let etapa = null;
+    let estadoAtual = {};
+    let ultimaLeitura = { codigo: null, momento: 0 };
+    let bloquearEnter = false;
+    let temporizadorAviso = null;
+
+    // Dígito verificador UPC-A: posições ímpares valem 3, pares valem 1
+    function digitoVerificadorValido(codigo) {
+        let soma = 0;
+        for (let i = 0; i < DIGITOS_CODIGO_ITEM - 1; i++) {
+            soma += Number(codigo[i]) * (i % 2 === 0 ? 3 : 1);
+        }
+        return (10 - soma % 10) % 10 === Number(codigo[DIGITOS_CODIGO_ITEM - 1]);
+    }
+
+    // Retorna a mensagem de erro do código do item, ou null se for válido
+    function validarItem(codigo) {
+        if (codigo.length !== DIGITOS_CODIGO_ITEM || !/^\d+$/.test(codigo)) {
+            return "⚠ O código de barras precisa ter exatamente 12 números!";
+        }
+        if (!digitoVerificadorValido(codigo)) {
+            return "⚠ Código de barras com dígito verificador inválido. Leia o item novamente.";
+        }
+        return null;
+    }
+
+    function mostrarAviso(mensagem) {
+        let aviso = document.getElementById("sistema-aviso-leitura");
+        if (!aviso) {
+            aviso = document.createElement("div");
+            aviso.id = "sistema-aviso-leitura";
+            aviso.style.cssText = "position:fixed; top:16px; left:50%; transform:translateX(-50%); z-index:1000;"
+                + "background:#fff3cd; color:#856404; border:1px solid #ffeeba; border-radius:8px;"
+                + "padding:12px 16px; font-family:sans-serif; font-size:18px;";
+            document.body.appendChild(aviso);
+        }
+        aviso.textContent = mensagem;
+        aviso.style.display = "block";
+        clearTimeout(temporizadorAviso);
+        temporizadorAviso = setTimeout(function() { aviso.style.display = "none"; }, TEMPO_AVISO_MS);
+    }
+
+    // Limpa o campo sem enviá-lo: o valor volta a ser igual ao já enviado ("")
+    function limparCampo(campo) {
+        const definirValor = Object.getOwnPropertyDescriptor(window.HTMLInputElement.prototype, "value").set;
+        definirValor.call(campo, "");
+        campo.dispatchEvent(new Event("input", { bubbles: true }));
+    }
+
+    // Decide se a leitura no campo deve ser enviada ao servidor
+    function leituraAceita(campo) {
+        const codigo = campo.value.trim();
+        if (!codigo) {
+            return false;
+        }
+
+        if (campo.matches(CAMPOS.requisicao) && codigo !== estadoAtual.cracha) {
+            const erro = validarItem(codigo);
+            if (erro) {
+                mostrarAviso(erro);
+                return false;
+            }
+        }
+
+        // Leitura dupla acidental do mesmo código
+        const agora = Date.now();
+        if (codigo === ultimaLeitura.codigo && agora - ultimaLeitura.momento < JANELA_REPETICAO_MS) {
+            console.log("Leitura repetida descartada: " + codigo);
+            return false;
+        }
+        ultimaLeitura = { codigo: codigo, momento: agora };
+        return true;
+    }
+
+    // Valida a leitura no Enter, antes de o Streamlit enviar o valor
+    function interceptarEnter(event) {
+        if (event.key !== 'Enter' || event.target.tagName !== 'INPUT') {
+            return;
+        }
+        const campo = event.target;
+        if (!campo.matches(CAMPOS.login) && !campo.matches(CAMPOS.requisicao)) {
+            return;
+        }
+        if (event.type === 'keydown') {
+            bloquearEnter = !leituraAceita(campo);
+            if (bloquearEnter) {
+                limparCampo(campo);
+            }
+        }
+        if (bloquearEnter) {
+            event.preventDefault();
+            event.stopImmediatePropagation();
+        }
+    }
+
+    let barcodeBuffer = '';
+    let lastKeyTime = 0;
+
+    // Encontrar o botão Deploy (primeiro botão do Streamlit na página)
+    function botaoDeploy() {
+        return document.querySelector('button[data-baseweb="button"]');
+    }
+
+    // 1. Proteger o botão Deploy contra cliques que não sejam de um humano
+    function protectDeployButton() {
+        const deployButton = botaoDeploy();
+        if (!deployButton) {
+            return false;
+        }
+        if (!deployButton.dataset.protegido) {
+            deployButton.addEventListener('click', function(event) {
+                if (!event.isTrusted) {
+                    console.log("Bloqueando clique automático no botão Deploy");
+                    event.preventDefault();
+                    event.stopPropagation();
+                    event.stopImmediatePropagation();
+                    return false;
+                }
+            }, true);
+            deployButton.dataset.protegido = "1";
+        }
+        return true;
+    }
+
+    // Monitorar teclas para detectar leitura de código de barras
+    document.addEventListener('keydown', function(event) {
+        const deployButton = botaoDeploy();
+        const currentTime = new Date().getTime();
+
+        // Se é parte de uma leitura rápida (típico de scanner)
+        if (event.key.length === 1 && /[\d]/.test(event.key)) {
+            if (currentTime - lastKeyTime > MAX_DELAY) {
+                // Nova leitura iniciando, desabilitar botão temporariamente
+                if (deployButton) deployButton.style.pointerEvents = 'none';
+                barcodeBuffer = '';
+            }
+            barcodeBuffer += event.key;
+            lastKeyTime = currentTime;
+        }
+        else if (event.key === 'Enter' && barcodeBuffer.length > 0) {
+            // Fim da leitura, restaurar botão após um delay
+            setTimeout(function() {
+                if (deployButton) deployButton.style.pointerEvents = '';
+            }, 500);
+
+            // Se causou problemas com o botão Deploy, parar propagação do Enter
+            if (event.target.tagName === 'INPUT') {
+                event.stopPropagation();
+            }
+        }
+    }, true);
+
+    // Registrado depois do monitor acima para que o botão Deploy seja
+    // restaurado mesmo quando a leitura é descartada
+    document.addEventListener('keydown', interceptarEnter, true);
+    document.addEventListener('keypress', interceptarEnter, true);
+
+    // 2. Focar no campo de entrada apropriado com base na etapa atual
+    function focusInput() {
+        const inputSelector = CAMPOS[etapa];
+        if (inputSelector) {
+            const inputField = document.querySelector(inputSelector);
+            if (inputField) {
+                setTimeout(() => inputField.focus(), 100);
+                return true;
+            }
+        }
+
+        // Fallback: tentar focar em qualquer input de texto visível
+        const visibleInputs = document.querySelectorAll('input[type="text"]:not([disabled]):not([readonly])');
+        if (visibleInputs.length > 0) {
+            setTimeout(() => visibleInputs[0].focus(), 100);
+            return true;
+        }
+        return false;
+    }
+
+    window.sistemaTerminal = {
+        // Chamado a cada execução do script com o estado atual da tela
+        atualizar: function(estado) {
+            estadoAtual = estado;
+            etapa = estado.etapa;
+            let deployProtected = protectDeployButton();
+            let inputFocused = focusInput();
+
+            // Se falhar, tentar novamente após um curto delay (DOM pode não estar totalmente carregado)
+            if (!deployProtected || !inputFocused) {
+                setTimeout(function() {
+                    if (!deployProtected) deployProtected = protectDeployButton();
+                    if (!inputFocused) inputFocused = focusInput();
+                }, 300);
+            }
+        }
+    };
+})();
@@ -0,0 +1,75 @@
+"""
+Testes do armazenamento em memória (database.ArmazenamentoMemoria).
+
+O armazenamento em memória tem uma única conexão de gravação
+(database.PoolExclusivo); uma função que não a devolve ao pool depois de um
+erro bloqueia todas as gravações seguintes. Também verifica o cache de
+crachás (database.CacheCrachas), que só recarrega em alterações externas.
+
+Uso:
+    python -m pytest test_armazenamento_memoria.py
+    python test_armazenamento_memoria.py
+"""
+
+import unittest
+from datetime import datetime
+from unittest import mock
+
+import database
+
+class TestArmazenamentoMemoria(unittest.TestCase):
+
+    def setUp(self):
+        database.configurar_armazenamento(":memory:")
+
+    def tearDown(self):
+        database.configurar_armazenamento(database.CAMINHO_BANCO)
+
+    def test_gravacao_apos_cpf_duplicado(self):
+        self.assertTrue(database.cadastrar_funcionario("Ana", "00000000001", "Almoxarifado", "C1")[0])
+        sucesso, mensagem = database.cadastrar_funcionario("Bruno", "00000000001", "Manutenção", "C2")
+        self.assertFalse(sucesso)
+        self.assertEqual(mensagem, "CPF ou Código já cadastrados!")
+
+        self.assertTrue(database.cadastrar_funcionario("Bruno", "00000000002", "Manutenção", "C2")[0])
+        self.assertTrue(database.registrar_requisicao("C2", "000000000001", datetime(2025, 1, 10, 8, 0))[0])
+
+    def test_gravacao_apos_administrador_duplicado(self):
+        self.assertTrue(database.cadastrar_administrador("admin", "hash"))
+        self.assertFalse(database.cadastrar_administrador("admin", "hash"))
+        self.assertTrue(database.cadastrar_administrador("outro", "hash"))
+
+class TestCacheCrachas(unittest.TestCase):
+
+    def setUp(self):
+        database.configurar_armazenamento(":memory:")
+        database.cadastrar_funcionario("Ana", "00000000001", "Almoxarifado", "C1")
+        self.cache = database.obter_cache_crachas()
+        self.cache.carregar()
+        self.cache.intervalo = 0
+
+    def tearDown(self):
+        database.configurar_armazenamento(database.CAMINHO_BANCO)
+
+    def test_gravacoes_proprias_nao_recarregam(self):
+        with mock.patch.object(self.cache, "carregar", wraps=self.cache.carregar) as carregar:
+            database.cadastrar_funcionario("Bruno", "00000000002", "Manutenção", "C2")
+            database.importar_funcionarios([("Carla", "00000000003", "Compras", "C3")])
+            # Ana é o primeiro funcionário do banco novo
+            database.excluir_funcionarios_em_lote([1])
+            self.assertIsNone(self.cache.buscar("C1"))
+            self.assertEqual(self.cache.buscar("C2"), ("Bruno", "Manutenção"))
+            self.assertEqual(self.cache.buscar("C3"), ("Carla", "Compras"))
+        carregar.assert_not_called()
+
+    def test_alteracao_externa_recarrega(self):
+        conn = database.conectar_banco()
+        try:
+            with conn:
+                conn.execute("UPDATE FUNCIONARIOS SET setor = 'Compras' WHERE codigo = 'C1'")
+        finally:
+            conn.close()
+        self.assertEqual(self.cache.buscar("C1"), ("Ana", "Compras"))
+
+if __name__ == "__main__":
+    unittest.main()
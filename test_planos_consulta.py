@@ -0,0 +1,117 @@
+"""
+Testes dos planos de execução das consultas de relatório e listagem.
+
+Executa as funções de database.py em um banco em memória com o limite de
+consultas lentas zerado, de modo que cada comando é registrado com o seu
+EXPLAIN QUERY PLAN (veja database.CursorInstrumentado), e verifica que as
+tabelas grandes são lidas por busca em índice, e não percorridas inteiras.
+
+Uso:
+    python -m pytest test_planos_consulta.py
+    python test_planos_consulta.py
+"""
+
+import unittest
+from datetime import datetime
+from unittest import mock
+
+import database
+import instrumentacao
+
+# Período usado nas consultas testadas
+DATA_INICIO = "2025-01-01"
+DATA_FIM = "2025-01-31"
+
+def capturar_planos(funcao, *args, **kwargs):
+    """Executa a função e retorna os planos dos comandos que ela executou.
+
+    Args:
+        funcao (callable): Função de database.py a executar.
+
+    Returns:
+        list: Tuplas (sql, plano), com plano como lista de linhas de
+            EXPLAIN QUERY PLAN.
+    """
+    planos = []
+    def registrar(sql, params, duracao_ms, plano):
+        planos.append((" ".join(sql.split()), plano))
+
+    with mock.patch.object(instrumentacao, "LIMITE_CONSULTA_LENTA_MS", 0), \
+            mock.patch.object(instrumentacao, "registrar_consulta_lenta", registrar):
+        resultado = funcao(*args, **kwargs)
+        if hasattr(resultado, "__next__"):
+            list(resultado)
+    return [(sql, plano) for sql, plano in planos if sql.startswith("SELECT")]
+
+class TestPlanosConsulta(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        database.configurar_armazenamento(":memory:")
+        database.cadastrar_funcionario("Ana", "00000000001", "Almoxarifado", "C1")
+        database.cadastrar_funcionario("Bruno", "00000000002", "Manutenção", "C2")
+        for minuto in range(30):
+            database.registrar_requisicao("C1" if minuto % 2 else "C2", f"{minuto:012d}",
+                                          datetime(2025, 1, 10, 8, minuto))
+
+    @classmethod
+    def tearDownClass(cls):
+        database.configurar_armazenamento(database.CAMINHO_BANCO)
+
+    def assertBuscaEmIndice(self, plano, tabela):
+        linhas = [linha for linha in plano if linha.split()[1] == tabela]
+        self.assertTrue(linhas, f"{tabela} não aparece no plano: {plano}")
+        for linha in linhas:
+            self.assertRegex(linha, r"^SEARCH \w+ USING (COVERING )?(INDEX|PRIMARY KEY|INTEGER PRIMARY KEY)",
+                             f"{tabela} não é lida por busca em índice: {plano}")
+
+    def assertPlanoUnico(self, planos):
+        self.assertEqual(len(planos), 1, planos)
+        return planos[0][1]
+
+    def test_relatorio_analitico(self):
+        for setor in (None, "Almoxarifado"):
+            with self.subTest(setor=setor):
+                plano = self.assertPlanoUnico(capturar_planos(
+                    database.iterar_relatorio, DATA_INICIO, DATA_FIM, setor, "analitico"))
+                self.assertBuscaEmIndice(plano, "r")
+                self.assertBuscaEmIndice(plano, "f")
+
+    def test_relatorio_sintetico(self):
+        for setor in (None, "Almoxarifado"):
+            with self.subTest(setor=setor):
+                plano = self.assertPlanoUnico(capturar_planos(
+                    database.iterar_relatorio, DATA_INICIO, DATA_FIM, setor, "sintetico"))
+                # Lista todos os funcionários; o resumo diário é lido por funcionário e período
+                self.assertBuscaEmIndice(plano, "d")
+
+    def test_pagina_requisicoes(self):
+        filtros = (
+            {},
+            {"data_inicio": DATA_INICIO, "data_fim": DATA_FIM},
+            {"data_inicio": DATA_INICIO, "data_fim": DATA_FIM, "setor": "Almoxarifado"},
+            {"codigo_funcionario": "C1"},
+        )
+        for filtro in filtros:
+            with self.subTest(**filtro):
+                plano = self.assertPlanoUnico(capturar_planos(database.paginar_requisicoes, **filtro))
+                # Sem filtro de período a página percorre o índice de datas já na ordem da listagem
+                self.assertTrue(any(linha.split()[1] == "r" and "USING COVERING INDEX" in linha for linha in plano),
+                                plano)
+                self.assertBuscaEmIndice(plano, "f")
+                self.assertFalse(any("TEMP B-TREE" in linha for linha in plano), plano)
+
+    def test_pagina_seguinte_requisicoes(self):
+        _, apos = database.paginar_requisicoes(DATA_INICIO, DATA_FIM, tamanho_pagina=10)
+        self.assertIsNotNone(apos)
+        plano = self.assertPlanoUnico(capturar_planos(
+            database.paginar_requisicoes, DATA_INICIO, DATA_FIM, apos=apos, tamanho_pagina=10))
+        self.assertBuscaEmIndice(plano, "r")
+        self.assertFalse(any("TEMP B-TREE" in linha for linha in plano), plano)
+
+    def test_requisicoes_por_hora(self):
+        plano = self.assertPlanoUnico(capturar_planos(database.contar_requisicoes_por_hora, DATA_INICIO, DATA_FIM))
+        self.assertBuscaEmIndice(plano, "REQUISICOES_POR_HORA")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,14 +3,31 @@ Módulo de utilitários para o sistema de controle.
 Contém funções reutilizáveis para geração e manipulação de crachás.
 """
 
-import os
-import barcode
-from barcode.writer import ImageWriter
 import streamlit as st
 import io
-from PIL import Image, ImageDraw, ImageFont
 import base64
-import bcrypt
+import functools
+from recursos import aplicar_recursos
+
+# barcode, PIL e bcrypt são importados no primeiro uso: só as telas
+# administrativas precisam deles e o terminal não deve pagar o carregamento
+
+@functools.lru_cache(maxsize=1)
+def carregar_fontes_cracha():
+    """
+    Carrega as fontes do crachá uma única vez por processo.
+    
+    Returns:
+        tuple: (fonte_titulo, fonte_dados)
+    """
+    from PIL import ImageFont
+    
+    # Tentar usar uma fonte padrão ou uma que esteja disponível no sistema
+    try:
+        return ImageFont.truetype("Arial", 24), ImageFont.truetype("Arial", 18)
+    except IOError:
+        # Fallback para fonte padrão
+        return ImageFont.load_default(), ImageFont.load_default()
 
 def gerar_cracha(codigo, nome, setor):
     """
@@ -25,6 +42,10 @@ def gerar_cracha(codigo, nome, setor):
         bytes: Imagem do crachá em formato bytes ou None em caso de erro.
     """
     try:
+        import barcode
+        from barcode.writer import ImageWriter
+        from PIL import Image, ImageDraw
+        
         # Obter o tipo de código de barras
         barcode_type = barcode.get_barcode_class("code128")
         
@@ -39,16 +60,7 @@ def gerar_cracha(codigo, nome, setor):
         cracha = Image.new('RGB', (400, 600), color=(255, 255, 255))
         draw = ImageDraw.Draw(cracha)
         
-        # Tentar usar uma fonte padrão ou uma que esteja disponível no sistema
-        try:
-            # Para título
-            titulo_font = ImageFont.truetype("Arial", 24)
-            # Para dados
-            dados_font = ImageFont.truetype("Arial", 18)
-        except IOError:
-            # Fallback para fonte padrão
-            titulo_font = ImageFont.load_default()
-            dados_font = ImageFont.load_default()
+        titulo_font, dados_font = carregar_fontes_cracha()
         
         # Desenhar o cabeçalho do crachá
         draw.rectangle([(0, 0), (400, 60)], fill=(0, 102, 204))
@@ -120,6 +132,7 @@ def hash_senha(senha):
     Returns:
         str: Hash da senha codificado.
     """
+    import bcrypt
     return bcrypt.hashpw(senha.encode(), bcrypt.gensalt()).decode()
 
 def verificar_senha(senha_digitada, senha_armazenada):
@@ -133,6 +146,7 @@ def verificar_senha(senha_digitada, senha_armazenada):
     Returns:
         bool: True se a senha corresponde ao hash, False caso contrário.
     """
+    import bcrypt
     return bcrypt.checkpw(senha_digitada.encode(), senha_armazenada.encode())
 
 def validar_cpf(cpf):
@@ -149,16 +163,15 @@ def validar_cpf(cpf):
 
 def carregar_estilo_css():
     """
-    Carrega o arquivo CSS se existir e aplica ao Streamlit.
+    Aplica o arquivo CSS ao Streamlit, se existir.
+    
+    O conteúdo fica em memória (veja recursos.py) e só é enviado ao navegador
+    uma vez por sessão.
     
     Returns:
         bool: True se o arquivo foi carregado, False caso contrário.
     """
     try:
-        if os.path.exists("style.css"):
-            with open("style.css") as css:
-                st.markdown(f"<style>{css.read()}</style>", unsafe_allow_html=True)
-            return True
-        return False
+        return aplicar_recursos()
     except Exception:
         return False
\ No newline at end of file